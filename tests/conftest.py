@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 from datetime import UTC, datetime
 from decimal import Decimal
+from typing import Any
 
 import pytest
 
+# Pre-import modules shared by most test files so they are loaded once, before
+# pytest walks the individual test modules during collection.
+import whalecli.output  # noqa: F401
 from whalecli.config import (
     AlertConfig,
     APIConfig,
@@ -18,6 +23,7 @@ from whalecli.config import (
 )
 from whalecli.db import Database
 from whalecli.models import Transaction
+from whalecli.scorer import load_exchange_addresses
 
 # ── Config fixtures ───────────────────────────────────────────────────────────
 
@@ -252,3 +258,142 @@ def mock_mempool_response() -> list:
             ],
         }
     ]
+
+
+# ── Exchange address fixtures ─────────────────────────────────────────────────
+
+
+@pytest.fixture(scope="session")
+def eth_exchange_addrs() -> frozenset[str]:
+    """ETH exchange address registry, loaded once per test session."""
+    return load_exchange_addresses("ETH")
+
+
+# ── Output fixtures ───────────────────────────────────────────────────────────
+#
+# Shared payloads for output formatting tests. Each fixture hands out a deep
+# copy, so a test that mutates its payload cannot leak into later tests.
+
+# Scan result dict matching the documented API schema.
+SCAN_RESULT: dict[str, Any] = {
+    "scan_id": "scan_20260222_120000_abcd",
+    "scan_time": "2026-02-22T12:00:00+00:00",
+    "chain": "ETH",
+    "window_hours": 24,
+    "wallets_scanned": 3,
+    "alerts_triggered": 1,
+    "wallets": [
+        {
+            "address": "0xd8da6bf26964af9d7eed9e03e53415d37aa96045",
+            "chain": "ETH",
+            "label": "Binance Cold",
+            "score": 82,
+            "score_breakdown": {
+                "net_flow": 35,
+                "velocity": 22,
+                "correlation": 15,
+                "exchange_flow": 10,
+            },
+            "direction": "accumulating",
+            "net_flow_usd": 5_000_000.0,
+            "inflow_usd": 7_000_000.0,
+            "outflow_usd": 2_000_000.0,
+            "tx_count": 12,
+            "wallet_age_days": 365,
+            "alert_triggered": True,
+            "computed_at": "2026-02-22T12:00:00+00:00",
+        },
+        {
+            "address": "0xabc123456789abc123456789abc123456789abc1",
+            "chain": "ETH",
+            "label": "Whale #2",
+            "score": 45,
+            "score_breakdown": {
+                "net_flow": 20,
+                "velocity": 15,
+                "correlation": 5,
+                "exchange_flow": 5,
+            },
+            "direction": "neutral",
+            "net_flow_usd": 0.0,
+            "inflow_usd": 100_000.0,
+            "outflow_usd": 100_000.0,
+            "tx_count": 2,
+            "wallet_age_days": 100,
+            "alert_triggered": False,
+            "computed_at": "2026-02-22T12:00:00+00:00",
+        },
+    ],
+    "summary": {
+        "total_wallets": 2,
+        "accumulating": 1,
+        "distributing": 0,
+        "neutral": 1,
+        "alerts_triggered": 1,
+        "dominant_signal": "accumulating",
+    },
+}
+
+
+WALLET_LIST: dict[str, Any] = {
+    "count": 2,
+    "wallets": [
+        {
+            "address": "0xaaa",
+            "chain": "ETH",
+            "label": "Whale A",
+            "tags": [],
+            "added_at": "2026-01-01T00:00:00+00:00",
+        },
+        {
+            "address": "bc1qtest",
+            "chain": "BTC",
+            "label": "BTC Whale",
+            "tags": ["exchange"],
+            "added_at": "2026-01-02T00:00:00+00:00",
+        },
+    ],
+}
+
+
+ALERT_LIST: dict[str, Any] = {
+    "rules": [
+        {
+            "id": "rule_001",
+            "type": "score",
+            "value": 70.0,
+            "window": "1h",
+            "chain": "ETH",
+            "active": True,
+        },
+    ],
+    "recent_alerts": [
+        {
+            "id": 1,
+            "address": "0xwallet",
+            "chain": "ETH",
+            "score": 85,
+            "direction": "accumulating",
+            "triggered_at": "2026-02-22T12:00:00+00:00",
+            "webhook_sent": True,
+        },
+    ],
+}
+
+
+@pytest.fixture
+def scan_result() -> dict[str, Any]:
+    """Scan result dict matching the documented API schema."""
+    return copy.deepcopy(SCAN_RESULT)
+
+
+@pytest.fixture
+def wallet_list() -> dict[str, Any]:
+    """Wallet list result with one ETH and one BTC wallet."""
+    return copy.deepcopy(WALLET_LIST)
+
+
+@pytest.fixture
+def alert_list() -> dict[str, Any]:
+    """Alert list result with one rule and one recent alert."""
+    return copy.deepcopy(ALERT_LIST)
@@ -0,0 +1,19 @@
+"""Plain helper functions shared by several test modules (fixtures live in conftest.py)."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+
+async def aiter_rows(items: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    """Yield items as an async iterator, standing in for the Database.iter_* methods."""
+    for item in items:
+        yield item
+
+
+def events_and_types(result: str) -> tuple[list[dict[str, Any]], set[str]]:
+    """Parse JSONL output once, returning the events and the set of event types."""
+    events = [json.loads(line) for line in result.splitlines() if line.strip()]
+    return events, {e.get("type") for e in events}
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 from typing import Any
 
+import orjson
 import pytest
 import pytest_asyncio
 
 from whalecli.alert import (
+    _webhook_body,
     build_webhook_payload,
     compute_scan_summary,
     dispatch_webhook,
@@ -160,6 +162,29 @@ async def test_process_alerts_flow_threshold_triggers(db: Database) -> None:
     assert len(alerts) == 1
 
 
+@pytest.mark.asyncio
+async def test_process_alerts_both_thresholds_single_alert(db: Database) -> None:
+    """A wallet passing both score and flow thresholds yields exactly one alert."""
+    config = make_config(score_threshold=70, flow_threshold_usd=1_000_000.0)
+    wallet = make_wallet(score=95, net_flow_usd=-5_000_000.0)
+    alerts = await process_alerts([wallet], db, config)
+    assert len(alerts) == 1
+    assert len(await db.list_alerts()) == 1
+
+
+@pytest.mark.asyncio
+async def test_process_alerts_severity(db: Database) -> None:
+    """Alerts carry the severity bucket of their score, clamped at the top end."""
+    config = make_config(score_threshold=70, flow_threshold_usd=1e12)
+    wallets = [
+        make_wallet(score=75, address="0xinfo"),
+        make_wallet(score=85, address="0xwarn"),
+        make_wallet(score=120, address="0xcrit"),
+    ]
+    alerts = await process_alerts(wallets, db, config)
+    assert [a["severity"] for a in alerts] == ["info", "warning", "critical"]
+
+
 @pytest.mark.asyncio
 async def test_process_alerts_multiple_wallets(db: Database) -> None:
     """Only wallets meeting score threshold generate alerts (flow threshold set very high)."""
@@ -212,6 +237,17 @@ def test_build_webhook_payload_structure() -> None:
     assert "score_breakdown" in payload
 
 
+def test_webhook_body_matches_payload_encoding() -> None:
+    """The spliced webhook body is byte-identical to encoding the payload dict."""
+    alert = {"id": 3, "address": "0xtest", "chain": "ETH", "score": 91, "label": 'a "b"'}
+    assert _webhook_body(alert) == orjson.dumps(build_webhook_payload(alert))
+    assert list(build_webhook_payload(alert))[:3] == [
+        "schema_version",
+        "event_type",
+        "triggered_at",
+    ]
+
+
 # ── dispatch_webhook ──────────────────────────────────────────────────────────
 
 
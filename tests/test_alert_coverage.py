@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import hashlib
+import hmac
+import json
 from typing import Any
 
 import httpx
@@ -103,6 +106,30 @@ async def test_dispatch_webhook_with_hmac_signature() -> None:
     assert "x-whalecli-signature" in {k.lower(): v for k, v in captured_headers.items()}
 
 
+@pytest.mark.asyncio
+@respx.mock
+async def test_dispatch_webhook_signature_covers_sent_body() -> None:
+    """The HMAC signature is computed over the exact bytes posted."""
+    config = make_config_with_webhook(
+        url="https://hooks.example.com/signed",
+        secret="my_secret",
+    )
+    alert = {"id": 7, "address": "0xtest", "chain": "ETH", "score": 90}
+    captured: dict[str, Any] = {}
+
+    def capture_request(request):
+        captured["body"] = request.content
+        captured["sig"] = request.headers["x-whalecli-signature"]
+        return httpx.Response(200)
+
+    respx.post("https://hooks.example.com/signed").mock(side_effect=capture_request)
+
+    assert await dispatch_webhook(alert, config) == 200
+    expected = hmac.new(b"my_secret", captured["body"], hashlib.sha256).hexdigest()
+    assert captured["sig"] == f"sha256={expected}"
+    assert json.loads(captured["body"])["alert_id"] == "alert_7"
+
+
 # ── HTTPError case ────────────────────────────────────────────────────────────
 
 
@@ -163,3 +190,68 @@ async def test_process_alerts_webhook_failure(db) -> None:
     assert len(alerts) == 1
     assert alerts[0]["webhook_sent"] is False
     assert alerts[0]["webhook_status"] == 500
+
+
+@pytest.mark.asyncio
+async def test_process_alerts_dedups_within_batch(db) -> None:
+    """The same wallet appearing twice in one batch raises a single alert."""
+    config = make_config_with_webhook(url="")
+    wallets = [make_wallet(address="0xtwice"), make_wallet(address="0xtwice")]
+    alerts = await process_alerts(wallets, db, config)
+    assert len(alerts) == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_process_alerts_webhook_exception_isolated(db) -> None:
+    """One webhook raising does not stop the other alerts from being delivered."""
+    config = make_config_with_webhook(url="https://hooks.example.com/batch")
+    wallets = [make_wallet(address=f"0xbatch{i}") for i in range(3)]
+    calls = 0
+
+    def flaky(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("boom")
+        return httpx.Response(200)
+
+    respx.post("https://hooks.example.com/batch").mock(side_effect=flaky)
+
+    alerts = await process_alerts(wallets, db, config)
+    assert len(alerts) == 3
+    assert sorted(a["webhook_sent"] for a in alerts) == [False, True, True]
+    assert all(w["alert_triggered"] for w in wallets)
+
+
+@pytest.mark.asyncio
+async def test_process_alerts_dedup_cache_skips_db_lookup(db, monkeypatch) -> None:
+    """A wallet alerted moments ago is rejected from memory, without a DB dedup query."""
+    config = make_config_with_webhook(url="")
+    assert len(await process_alerts([make_wallet(address="0xcached")], db, config)) == 1
+
+    calls = 0
+    original = db.is_duplicate_alert
+
+    async def counting(*args: Any) -> bool:
+        nonlocal calls
+        calls += 1
+        return await original(*args)
+
+    monkeypatch.setattr(db, "is_duplicate_alert", counting)
+    assert await process_alerts([make_wallet(address="0xcached")], db, config) == []
+    assert calls == 0
+
+
+@pytest.mark.asyncio
+async def test_webhook_client_reused_until_closed() -> None:
+    """The shared webhook client is reused within a loop and recreated after close."""
+    from whalecli.alert import _get_webhook_client, close_webhook_client
+
+    client = _get_webhook_client()
+    assert _get_webhook_client() is client
+    await close_webhook_client()
+    assert client.is_closed
+    fresh = _get_webhook_client()
+    assert fresh is not client
+    await close_webhook_client()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
@@ -320,6 +321,13 @@ def test_report_summary_empty(runner: CliRunner, tmp_path: Path, config_env: Non
     assert "total_wallets" in output
 
 
+def test_report_id_matches_generated_at(runner: CliRunner, config_env: None) -> None:
+    """report_id is stamped from the same instant as generated_at."""
+    output = json.loads(runner.invoke(cli, ["report", "--summary"]).output)
+    generated = datetime.fromisoformat(output["generated_at"])
+    assert output["report_id"] == f"summary_{generated.strftime('%Y%m%d_%H%M%S')}"
+
+
 # ── help text ─────────────────────────────────────────────────────────────────
 
 
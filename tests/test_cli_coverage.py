@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import json
+import sys
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from click.testing import CliRunner
@@ -90,6 +91,29 @@ def test_config_show_json(runner: CliRunner, config_env: str) -> None:
     assert "alert" in output
 
 
+def test_config_show_masks_and_hides_secrets(
+    runner: CliRunner, config_env: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """config show masks API keys and omits the webhook secret and cloud token."""
+    monkeypatch.setenv("WHALECLI_ETHERSCAN_API_KEY", "ABCDEFGH123456")
+    monkeypatch.setenv("WHALECLI_CLOUD_TOKEN", "tok_secret")
+    output = json.loads(runner.invoke(cli, ["config", "show"]).output)
+    assert output["api"]["etherscan_api_key"] != "ABCDEFGH123456"
+    assert output["api"]["max_connections"] == 32
+    assert "webhook_secret" not in output["alert"]
+    assert "api_token" not in output["cloud"]
+    assert "tok_secret" not in json.dumps(output)
+
+
+def test_config_show_table(runner: CliRunner, config_env: str) -> None:
+    """config show --format table goes through the table formatter."""
+    with patch("whalecli.output.format_table", return_value="TABLE") as mock_table:
+        result = runner.invoke(cli, ["config", "show", "--format", "table"])
+    assert result.exit_code == 0
+    assert result.output == "TABLE\n"
+    assert "max_connections" in mock_table.call_args.args[0]["api"]
+
+
 def test_config_init_force_overwrites(runner: CliRunner, tmp_path: Path) -> None:
     """config init --force should reinitialize an existing config."""
     config_path = tmp_path / "config.toml"
@@ -212,6 +236,52 @@ def test_scan_format_table(
     assert result.exit_code == 0
 
 
+@patch("whalecli.cli._fetch_wallet_txns", new_callable=AsyncMock)
+def test_scan_persists_score_snapshot(
+    mock_fetch: AsyncMock,
+    runner: CliRunner,
+    config_env: str,
+) -> None:
+    """scan writes one snapshot row per scored wallet, breakdown columns included."""
+    import sqlite3
+
+    mock_fetch.return_value = []
+    addr = "0xd8da6bf26964af9d7eed9e03e53415d37aa96045"
+    runner.invoke(cli, ["wallet", "add", addr, "--chain", "ETH"])
+
+    result = runner.invoke(cli, ["scan", "--chain", "ETH"])
+    assert result.exit_code == 0
+    with sqlite3.connect(config_env) as conn:
+        rows = conn.execute(
+            "SELECT address, chain, total_score, net_flow, velocity, correlation,"
+            " exchange_flow, direction FROM scores"
+        ).fetchall()
+    assert rows == [(addr, "ETH", 0, 0, 0, 0, 0, "neutral")]
+
+
+@patch("whalecli.cli._fetch_wallet_txns", new_callable=AsyncMock)
+def test_scan_skips_correlation_without_enough_peers(
+    mock_fetch: AsyncMock,
+    runner: CliRunner,
+    config_env: str,
+) -> None:
+    """A chain with too few wallets for correlation never runs the second pass."""
+    mock_fetch.return_value = []
+    addrs = [f"0x{i:040x}" for i in range(1, 4)]
+    for addr in addrs[:2]:
+        runner.invoke(cli, ["wallet", "add", addr, "--chain", "ETH"])
+
+    with patch("whalecli.scorer.apply_correlation") as mock_apply:
+        result = runner.invoke(cli, ["scan", "--chain", "ETH"])
+        assert result.exit_code == 0
+        mock_apply.assert_not_called()
+
+        runner.invoke(cli, ["wallet", "add", addrs[2], "--chain", "ETH"])
+        result = runner.invoke(cli, ["scan", "--chain", "ETH"])
+        assert result.exit_code == 0
+        assert mock_apply.call_count == 3
+
+
 @patch("whalecli.cli._fetch_wallet_txns", new_callable=AsyncMock)
 def test_scan_format_jsonl(
     mock_fetch: AsyncMock,
@@ -234,9 +304,8 @@ def test_scan_format_jsonl(
 
     result = runner.invoke(cli, ["scan", "--chain", "ETH", "--format", "jsonl"])
     assert result.exit_code == 0
-    for line in result.output.strip().split("\n"):
-        if line.strip():
-            json.loads(line)  # each line is valid JSON
+    events = [json.loads(line) for line in result.output.splitlines() if line.strip()]
+    assert [e["type"] for e in events] == ["scan_start", "wallet_result", "scan_end"]
 
 
 @patch("whalecli.cli._fetch_wallet_txns", new_callable=AsyncMock)
@@ -263,6 +332,50 @@ def test_scan_all_flag(
     assert result.exit_code == 0
 
 
+@patch("whalecli.cli._fetch_wallet_txns", new_callable=AsyncMock)
+def test_scan_all_groups_wallets_by_chain(
+    mock_fetch: AsyncMock,
+    runner: CliRunner,
+    config_env: str,
+) -> None:
+    """scan --all scores every wallet once, grouped by chain in first-seen order."""
+    mock_fetch.return_value = []
+    for addr, wchain in [
+        ("0xd8da6bf26964af9d7eed9e03e53415d37aa96045", "ETH"),
+        ("bc1qxy2kgdygjrsqtzq2n0yrf2493p83kkfjhx0wlh", "BTC"),
+        ("0x28c6c06298d514db089934071355e5743bf21d60", "ETH"),
+    ]:
+        runner.invoke(cli, ["wallet", "add", addr, "--chain", wchain])
+
+    result = runner.invoke(cli, ["scan", "--all"])
+    assert result.exit_code == 0
+    chains = [w["chain"] for w in json.loads(result.output)["wallets"]]
+    assert chains == ["ETH", "ETH", "BTC"]
+    assert mock_fetch.await_count == 3
+
+
+@patch("whalecli.cli._fetch_wallet_txns", new_callable=AsyncMock)
+def test_scan_baseline_db_error_exits_with_db_code(
+    mock_fetch: AsyncMock,
+    runner: CliRunner,
+    config_env: str,
+) -> None:
+    """A DB failure while loading baselines alongside the fetches exits with code 6."""
+    from whalecli.exceptions import DatabaseError
+
+    mock_fetch.return_value = []
+    runner.invoke(
+        cli, ["wallet", "add", "0xd8da6bf26964af9d7eed9e03e53415d37aa96045", "--chain", "ETH"]
+    )
+    with patch(
+        "whalecli.db.Database.get_avg_abs_netflow",
+        new_callable=AsyncMock,
+        side_effect=DatabaseError("disk I/O error"),
+    ):
+        result = runner.invoke(cli, ["scan", "--chain", "ETH"])
+    assert result.exit_code == 6
+
+
 def test_wallet_remove_purge(runner: CliRunner, config_env: str) -> None:
     """wallet remove --purge should delete tx history too."""
     addr = "0xd8da6bf26964af9d7eed9e03e53415d37aa96045"
@@ -325,7 +438,12 @@ def test_config_set_invalid_section(runner: CliRunner, config_env: str, tmp_path
             "value",
         ],
     )
-    assert result.exit_code != 0
+    assert result.exit_code == 5
+    assert result.stdout == ""
+    assert json.loads(result.stderr) == {
+        "error": "config_invalid",
+        "message": "Unknown config section: 'nonexistent'",
+    }
 
 
 def test_config_set_invalid_key(runner: CliRunner, config_env: str, tmp_path) -> None:
@@ -381,3 +499,132 @@ def test_wallet_import_csv_dry_run(runner: CliRunner, config_env: str, tmp_path)
     list_result = runner.invoke(cli, ["wallet", "list"])
     list_output = json.loads(list_result.output)
     assert list_output["count"] == 0
+
+
+def test_iter_wallet_csv_maps_header_columns(tmp_path: Path) -> None:
+    """Rows are keyed by header name whatever the column order; blank and short rows are safe."""
+    from whalecli.cli import _iter_wallet_csv
+
+    csv_file = tmp_path / "wallets.csv"
+    csv_file.write_text("label,extra,address,chain\nWhale,x,0xaaa,ETH\n\n,y,0xbbb\n")
+    assert list(_iter_wallet_csv(str(csv_file))) == [
+        {"address": "0xaaa", "chain": "ETH", "label": "Whale"},
+        {"address": "0xbbb", "chain": "", "label": ""},
+    ]
+
+
+def test_iter_wallet_csv_strips_utf8_bom(tmp_path: Path) -> None:
+    """A spreadsheet-exported BOM does not hide the first header column."""
+    from whalecli.cli import _iter_wallet_csv
+
+    csv_file = tmp_path / "wallets.csv"
+    csv_file.write_bytes("address,chain\n0xaaa,ETH\n".encode("utf-8-sig"))
+    assert list(_iter_wallet_csv(str(csv_file))) == [{"address": "0xaaa", "chain": "ETH"}]
+
+
+def test_event_loop_factory_prefers_uvloop(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Commands run on uvloop when the extra is installed, else on the default loop."""
+    from whalecli.cli import _event_loop_factory
+
+    monkeypatch.setitem(sys.modules, "uvloop", None)  # import fails → default loop
+    assert _event_loop_factory() is None
+
+    fake_uvloop = MagicMock()
+    monkeypatch.setitem(sys.modules, "uvloop", fake_uvloop)
+    assert _event_loop_factory() is fake_uvloop.new_event_loop
+
+
+def test_stamp_id_matches_strftime() -> None:
+    """_stamp_id renders the same text as the strftime pattern it replaces."""
+    from datetime import UTC, datetime
+
+    from whalecli.cli import _stamp_id
+
+    now = datetime(2026, 3, 4, 5, 6, 7, tzinfo=UTC)
+    assert _stamp_id("scan", now) == now.strftime("scan_%Y%m%d_%H%M%S") == "scan_20260304_050607"
+
+
+async def test_fetch_wallet_txns_returns_shared_empty_on_error() -> None:
+    """A failing fetch yields the shared empty sentinel rather than a fresh list."""
+    from whalecli.cli import _EMPTY_TXNS, _fetch_wallet_txns
+
+    fetcher = MagicMock()
+    fetcher.get_transactions = AsyncMock(side_effect=RuntimeError("boom"))
+    result = await _fetch_wallet_txns({"address": "0xabc"}, 24, fetcher)
+    assert result is _EMPTY_TXNS
+
+
+def test_config_converters_cover_every_field_type() -> None:
+    """config set can coerce every declared config field type."""
+    from whalecli.cli import _CONFIG_CONVERTERS
+    from whalecli.config import SECTION_FIELD_TYPES
+
+    for section_name, field_types in SECTION_FIELD_TYPES.items():
+        for name, type_name in field_types.items():
+            assert type_name in _CONFIG_CONVERTERS, f"{section_name}.{name}: {type_name}"
+
+
+def test_config_set_coerces_by_declared_type(runner: CliRunner, tmp_path: Path) -> None:
+    """Values are converted using the field's declared type."""
+    config_path = str(tmp_path / "cfg.toml")
+    result = runner.invoke(
+        cli, ["--config", config_path, "config", "set", "alert.flow_threshold_usd", "2500"]
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.output)["value"] == 2500.0
+
+    result = runner.invoke(cli, ["--config", config_path, "config", "set", "output.color", "no"])
+    assert json.loads(result.output)["value"] is False
+
+
+def test_config_set_bool_rejects_unknown_spelling(runner: CliRunner, tmp_path: Path) -> None:
+    """Boolean fields accept on/off style tokens and reject anything else."""
+    config_path = str(tmp_path / "cfg.toml")
+    result = runner.invoke(cli, ["--config", config_path, "config", "set", "cloud.enabled", "on"])
+    assert json.loads(result.output)["value"] is True
+
+    result = runner.invoke(
+        cli, ["--config", config_path, "config", "set", "cloud.enabled", "maybe"]
+    )
+    assert result.exit_code == 5
+    assert json.loads(result.stderr)["error"] == "config_invalid"
+
+
+@pytest.mark.parametrize(
+    "key", ["cloud.api_token", "alert.webhook_secret", "api.hyperliquid_api_key"]
+)
+def test_config_set_masks_secret_values(runner: CliRunner, tmp_path: Path, key: str) -> None:
+    """config set never echoes a credential back in full."""
+    config_path = str(tmp_path / "cfg.toml")
+    result = runner.invoke(cli, ["--config", config_path, "config", "set", key, "supersecret123"])
+    assert result.exit_code == 0
+    assert "supersecret123" not in result.output
+
+
+@pytest.mark.parametrize("key", ["nodot", "alert."])
+def test_config_set_rejects_malformed_key(runner: CliRunner, tmp_path: Path, key: str) -> None:
+    """Keys without both a section and a field are a usage error."""
+    config_path = str(tmp_path / "cfg.toml")
+    result = runner.invoke(cli, ["--config", config_path, "config", "set", key, "1"])
+    assert result.exit_code == 1
+    assert json.loads(result.stderr)["error"] == "cli_error"
+
+
+def test_click_choices_match_config_constants() -> None:
+    """The ordered --chain/--format choices cover exactly the config's valid sets."""
+    from whalecli import cli as cli_mod
+    from whalecli.config import VALID_CHAINS, VALID_FORMATS
+
+    assert frozenset(cli_mod.SUPPORTED_CHAINS) == VALID_CHAINS
+    assert frozenset(cli_mod._FORMATS_ALL) == VALID_FORMATS
+    for choices in (cli_mod._FORMATS_EXPORT, cli_mod._FORMATS_VIEW, cli_mod._FORMATS_STREAM):
+        assert VALID_FORMATS.issuperset(choices)
+
+
+def test_json_output_keeps_pretty_layout(runner: CliRunner, config_env: str) -> None:
+    """Byte-written JSON results match format_json's layout plus one newline."""
+    from whalecli.output import format_json
+
+    result = runner.invoke(cli, ["wallet", "list", "--format", "json"])
+    assert result.exit_code == 0
+    assert result.output == format_json(json.loads(result.output)) + "\n"
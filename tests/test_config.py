@@ -50,6 +50,17 @@ default_format = "table"
     assert config.output.default_format == "table"
 
 
+def test_load_config_coerces_by_declared_type(tmp_path: Path) -> None:
+    """TOML values are coerced to each field's declared type; absent keys keep defaults."""
+    config_file = tmp_path / "config.toml"
+    config_file.write_text("[api]\nmax_connections = 8.0\n[output]\ncolor = 0\n")
+    config = load_config(str(config_file))
+    assert config.api.max_connections == 8 and isinstance(config.api.max_connections, int)
+    assert config.output.color is False
+    assert config.output.timezone == "UTC"
+    assert config.alert == WhalecliConfig().alert
+
+
 def test_load_config_invalid_toml(tmp_path: Path) -> None:
     """load_config should raise ConfigInvalidError on bad TOML syntax."""
     config_file = tmp_path / "config.toml"
@@ -91,6 +102,17 @@ flow_threshold_usd = -1000
         load_config(str(config_file))
 
 
+def test_load_config_stream_max_concurrency(tmp_path: Path) -> None:
+    """load_config reads [stream] max_concurrency and rejects values below 1."""
+    config_file = tmp_path / "config.toml"
+    config_file.write_text("[stream]\nmax_concurrency = 4\n")
+    assert load_config(str(config_file)).stream.max_concurrency == 4
+
+    config_file.write_text("[stream]\nmax_concurrency = 0\n")
+    with pytest.raises(ConfigInvalidError):
+        load_config(str(config_file))
+
+
 # ── Environment variable overrides ───────────────────────────────────────────
 
 
@@ -134,6 +156,37 @@ def test_env_override_webhook_url(monkeypatch: pytest.MonkeyPatch, tmp_path: Pat
     assert config.alert.webhook_url == "https://hooks.example.com/test"
 
 
+def test_env_overrides_all_resolve_to_config_fields() -> None:
+    """Every pre-split env override names an existing section attribute."""
+    from whalecli.config import _ENV_OVERRIDES, _ENV_OVERRIDES_RESOLVED
+
+    config = WhalecliConfig()
+    assert len(_ENV_OVERRIDES_RESOLVED) == len(_ENV_OVERRIDES)
+    for _env_var, section, key, _converter in _ENV_OVERRIDES_RESOLVED:
+        assert hasattr(getattr(config, section), key)
+
+
+def test_section_field_types_mirror_dataclasses() -> None:
+    """SECTION_FIELD_TYPES lists every section and field with its declared type."""
+    import dataclasses
+
+    from whalecli.config import SECTION_FIELD_TYPES
+
+    assert SECTION_FIELD_TYPES.keys() == dataclasses.asdict(WhalecliConfig()).keys()
+    assert SECTION_FIELD_TYPES["api"]["max_connections"] == "int"
+    assert SECTION_FIELD_TYPES["database"]["wal"] == "bool"
+    assert SECTION_FIELD_TYPES["alert"]["flow_threshold_usd"] == "float"
+
+
+def test_config_dataclasses_are_slotted() -> None:
+    """Config objects use __slots__, so a typo'd attribute cannot be set silently."""
+    config = WhalecliConfig()
+    assert not hasattr(config, "__dict__")
+    assert not hasattr(config.api, "__dict__")
+    with pytest.raises(AttributeError):
+        config.alert.score_treshold = 5  # type: ignore[attr-defined]
+
+
 def test_env_no_color(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     """WHALECLI_NO_COLOR env var disables color."""
     config_file = tmp_path / "config.toml"
@@ -154,6 +207,27 @@ def test_env_cloud_enabled(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> N
     assert config.cloud.enabled is True
 
 
+def test_load_config_reuses_parse_until_file_changes(tmp_path: Path) -> None:
+    """The TOML parse is cached per (path, mtime, size); each call gets a fresh config."""
+    import os
+
+    from whalecli.config import _read_toml
+
+    config_file = tmp_path / "config.toml"
+    config_file.write_text("[alert]\nscore_threshold = 75\n")
+    _read_toml.cache_clear()
+
+    first = load_config(str(config_file))
+    second = load_config(str(config_file))
+    assert first is not second
+    assert _read_toml.cache_info().hits == 1
+
+    config_file.write_text("[alert]\nscore_threshold = 85\n")
+    st = config_file.stat()
+    os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert load_config(str(config_file)).alert.score_threshold == 85
+
+
 # ── save_config ───────────────────────────────────────────────────────────────
 
 
@@ -169,6 +243,35 @@ def test_save_config_roundtrip(tmp_path: Path) -> None:
     loaded = load_config(str(config_path))
     assert loaded.api.etherscan_api_key == "saved_key"
     assert loaded.alert.score_threshold == 75
+    assert loaded.database.wal is True
+
+
+def test_save_config_is_atomic(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A save that fails before the swap leaves the old file and no temp file behind."""
+    import os
+
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("[alert]\nscore_threshold = 75\n")
+
+    def _fail(src: str, dst: str) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", _fail)
+    with pytest.raises(OSError):
+        save_config(WhalecliConfig(), str(config_path))
+
+    assert config_path.read_text() == "[alert]\nscore_threshold = 75\n"
+    assert list(tmp_path.iterdir()) == [config_path]
+
+
+def test_load_config_database_wal(tmp_path: Path) -> None:
+    """[database] wal = false is read and survives a save round-trip."""
+    config_file = tmp_path / "config.toml"
+    config_file.write_text("[database]\nwal = false\n")
+    config = load_config(str(config_file))
+    assert config.database.wal is False
+    save_config(config, str(config_file))
+    assert load_config(str(config_file)).database.wal is False
 
 
 def test_save_config_creates_dir(tmp_path: Path) -> None:
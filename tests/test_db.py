@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import UTC, datetime
 
 import pytest
 import pytest_asyncio
 
 from whalecli.db import Database
-from whalecli.exceptions import WalletExistsError, WalletNotFoundError
+from whalecli.exceptions import DatabaseError, WalletExistsError, WalletNotFoundError
 
 
 @pytest_asyncio.fixture
@@ -39,6 +41,43 @@ async def test_context_manager(tmp_path) -> None:
         assert wallets == []
 
 
+@pytest.mark.asyncio
+async def test_connect_sizes_statement_cache(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The connection is opened with a statement cache big enough for the hot SQL."""
+    import aiosqlite
+
+    from whalecli import db as db_mod
+
+    seen: dict[str, object] = {}
+    real_connect = aiosqlite.connect
+
+    def _connect(*args: object, **kwargs: object) -> aiosqlite.Connection:
+        seen.update(kwargs)
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(db_mod.aiosqlite, "connect", _connect)
+    async with Database(str(tmp_path / "stmt.db")):
+        pass
+    assert seen["cached_statements"] == db_mod._STATEMENT_CACHE_SIZE
+
+
+@pytest.mark.asyncio
+async def test_connect_journal_mode_follows_wal_flag(tmp_path) -> None:
+    """File databases use WAL + synchronous=NORMAL unless wal=False."""
+
+    async def pragma(db: Database, name: str) -> object:
+        async with db._conn.execute(f"PRAGMA {name}") as cursor:
+            return (await cursor.fetchone())[0]
+
+    async with Database(str(tmp_path / "wal.db")) as db:
+        assert await pragma(db, "journal_mode") == "wal"
+        assert await pragma(db, "synchronous") == 1  # NORMAL
+        assert await pragma(db, "page_size") == 8192
+        assert await pragma(db, "busy_timeout") == 5000
+    async with Database(str(tmp_path / "rollback.db"), wal=False) as db:
+        assert await pragma(db, "journal_mode") == "delete"
+
+
 # ── Wallet CRUD ───────────────────────────────────────────────────────────────
 
 
@@ -61,6 +100,17 @@ async def test_add_wallet_with_tags(db: Database) -> None:
     assert result["tags"] == ["exchange", "binance"]
 
 
+@pytest.mark.asyncio
+async def test_list_wallets_reads_stdlib_json_tags(db: Database) -> None:
+    """Tags written by the old stdlib encoder (spaced separators) still decode."""
+    await db.add_wallet("0xdef789", "ETH", "Legacy")
+    await db._conn.execute(
+        "UPDATE wallets SET tags = ? WHERE address = ?", ('["a", "b"]', "0xdef789")
+    )
+    wallets = await db.list_wallets()
+    assert wallets[0]["tags"] == ["a", "b"]
+
+
 @pytest.mark.asyncio
 async def test_add_wallet_duplicate_raises(db: Database) -> None:
     """Adding the same address+chain twice raises WalletExistsError."""
@@ -106,6 +156,77 @@ async def test_list_wallets_filter_chain(db: Database) -> None:
     assert eth_wallets[0]["chain"] == "ETH"
 
 
+@pytest.mark.asyncio
+async def test_list_wallets_filter_tags(db: Database) -> None:
+    """Tag filters match any of the given tags, via wallet_tags, for added and imported rows."""
+    await db.add_wallet("0xtag_a", "ETH", "A", ["exchange", "binance"])
+    await db.add_wallet("0xtag_b", "ETH", "B", ["fund"])
+    await db.add_wallet("0xtag_c", "ETH", "C")
+    await db.import_wallets([{"address": "0xtag_d", "chain": "BTC", "tags": "fund, otc"}])
+
+    found = await db.list_wallets(tags=["binance", "otc"])
+    assert sorted(w["address"] for w in found) == ["0xtag_a", "0xtag_d"]
+    assert await db.list_wallets(tags=["missing"]) == []
+
+    await db.remove_wallet("0xtag_b", "ETH", purge=True)
+    async with db._conn.execute("SELECT COUNT(*) FROM wallet_tags WHERE tag = 'fund'") as cur:
+        assert (await cur.fetchone())[0] == 1  # purge cascades to the wallet's tags
+
+
+@pytest.mark.asyncio
+async def test_connect_backfills_wallet_tags_from_v1(tmp_path) -> None:
+    """Opening a v1 database fills wallet_tags from the JSON tags column."""
+    path = str(tmp_path / "v1.db")
+    async with Database(path) as db:
+        await db.add_wallet("0xold", "ETH", "Old")
+        await db._conn.execute("UPDATE wallets SET tags = '[\"legacy\"]'")
+        await db._conn.execute("DELETE FROM wallet_tags")
+        await db._conn.execute("UPDATE schema_version SET version = 1")
+        await db._conn.commit()
+
+    async with Database(path) as db:
+        assert [w["address"] for w in await db.list_wallets(tags=["legacy"])] == ["0xold"]
+
+
+@pytest.mark.asyncio
+async def test_iterators_match_list_methods(db: Database) -> None:
+    """iter_* yield the rows their list_* wrappers return, and can stop early."""
+    for i in range(3):
+        await db.add_wallet(f"0xiter_{i}", "ETH", f"W{i}", ["t"])
+        await db.save_alert({"address": f"0xiter_{i}", "chain": "ETH", "score": 80 + i})
+
+    assert [w async for w in db.iter_wallets(tags=["t"])] == await db.list_wallets(tags=["t"])
+    assert [a async for a in db.iter_alerts(limit=5)] == await db.list_alerts(limit=5)
+    from contextlib import aclosing
+
+    async with aclosing(db.iter_alerts()) as alerts:
+        newest = await anext(alerts)  # stop after the first row
+    assert newest["webhook_sent"] is False
+
+
+@pytest.mark.asyncio
+async def test_row_columns_cover_schema_minus_internal(db: Database) -> None:
+    """Explicit SELECT lists return every table column except internal epoch columns."""
+
+    async def table_columns(table: str) -> set[str]:
+        async with db._conn.execute(f"PRAGMA table_info({table})") as cursor:
+            return {row["name"] async for row in cursor} - {"triggered_at_epoch"}
+
+    now = datetime.now(tz=UTC).isoformat()
+    await db.add_wallet("0xcols", "ETH", "Cols")
+    await db.save_score({"address": "0xcols", "chain": "ETH", "computed_at": now})
+    await db.save_alert({"address": "0xcols", "chain": "ETH", "score": 80})
+    await db.save_alert_rule({"id": None, "type": "score", "value": 70.0})
+
+    assert set(await db.get_wallet("0xcols")) == await table_columns("wallets")
+    [history] = await db.get_score_history("0xcols", "ETH")
+    assert set(history) == await table_columns("scores")
+    [alert] = await db.list_alerts()
+    assert set(alert) == await table_columns("alerts")
+    [rule] = await db.list_alert_rules()
+    assert set(rule) == await table_columns("alert_rules")
+
+
 @pytest.mark.asyncio
 async def test_get_wallet_found(db: Database) -> None:
     """get_wallet returns matching wallet dict."""
@@ -152,6 +273,51 @@ async def test_import_wallets(db: Database) -> None:
     assert result["skipped"] == 0
 
 
+@pytest.mark.asyncio
+async def test_import_wallets_streams_in_chunks(db: Database, monkeypatch) -> None:
+    """import_wallets consumes a generator, commits per chunk, and skips duplicates."""
+    from whalecli import db as db_module
+
+    monkeypatch.setattr(db_module, "_IMPORT_CHUNK", 2)
+    await db.add_wallet("0xexisting", "ETH")
+    rows = (
+        {"address": addr, "chain": "eth", "tags": "a, b"}
+        for addr in ("0x1", "0x2", "0xexisting", "0x1", "0x3")
+    )
+    result = await db.import_wallets(rows)
+    assert (result["imported"], result["skipped"]) == (3, 2)
+    assert result["wallets"][0]["tags"] == ["a", "b"]
+    assert len(await db.list_wallets()) == 4
+
+
+@pytest.mark.asyncio
+async def test_import_wallets_reports_failed_chunk_and_continues(db: Database, monkeypatch) -> None:
+    """A chunk the database rejects is rolled back alone; the summary covers the rest."""
+    from whalecli import db as db_module
+
+    monkeypatch.setattr(db_module, "_IMPORT_CHUNK", 2)
+    await db._conn.execute(
+        "CREATE TRIGGER reject_bad BEFORE INSERT ON wallets WHEN NEW.address = '0xbad'"
+        " BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+    )
+    # A stray implicit transaction is discarded before the import takes the lock
+    await db._conn.execute("UPDATE wallets SET label = 'stale'")
+
+    def rows(*addrs: str) -> list[dict[str, str]]:
+        return [{"address": a, "chain": "ETH"} for a in addrs]
+
+    dry = await db.import_wallets(rows("0x1", "0x2", "0xbad", "0x3", "0x1"), dry_run=True)
+    assert (dry["would_import"], dry["would_skip"]) == (2, 1)
+    assert len(dry["validation_errors"]) == 1
+    assert not db._conn.in_transaction
+
+    result = await db.import_wallets(rows("0x1", "0x2", "0xbad", "0x3", "0x4"))
+    assert (result["imported"], result["skipped"]) == (3, 0)
+    assert [w["address"] for w in result["wallets"]] == ["0x1", "0x2", "0x4"]
+    assert result["errors"][0].startswith("Failed to import 2 wallets (0xbad .. 0x3)")
+    assert sorted(w["address"] for w in await db.list_wallets()) == ["0x1", "0x2", "0x4"]
+
+
 @pytest.mark.asyncio
 async def test_import_wallets_dry_run(db: Database) -> None:
     """import_wallets dry_run should not persist anything."""
@@ -163,6 +329,34 @@ async def test_import_wallets_dry_run(db: Database) -> None:
     assert len(wallets) == 0  # nothing actually added
 
 
+@pytest.mark.asyncio
+async def test_import_wallets_dry_run_counts_duplicates(db: Database) -> None:
+    """A dry run validates uniqueness against the table and within the input."""
+    await db.add_wallet("0xknown", "ETH")
+    rows = [
+        {"address": "0xknown", "chain": "ETH"},
+        {"address": "0xnew", "chain": "ETH"},
+        {"address": "0xnew", "chain": "eth"},
+        {"address": "0xsol", "chain": "SOL"},
+    ]
+    result = await db.import_wallets(rows, dry_run=True)
+    assert (result["would_import"], result["would_skip"]) == (1, 2)
+    assert result["validation_errors"] == [f"Unsupported chain 'SOL': {rows[3]}"]
+    assert [w["address"] for w in await db.list_wallets()] == ["0xknown"]
+
+
+@pytest.mark.asyncio
+async def test_import_wallets_returns_stored_ids(db: Database) -> None:
+    """Wallets reported as imported carry the ids they were stored under."""
+    await db.add_wallet("0xfirst", "BTC")
+    result = await db.import_wallets(
+        [{"address": a, "chain": "ETH", "label": a.upper()} for a in ("0xi1", "0xi2")]
+    )
+    for w in result["wallets"]:
+        stored = await db.get_wallet(w["address"], "ETH")
+        assert (stored["id"], stored["label"]) == (w["id"], w["label"])
+
+
 # ── Transactions cache ────────────────────────────────────────────────────────
 
 
@@ -214,6 +408,93 @@ async def test_upsert_transactions_dedup(db: Database) -> None:
     assert count == 1
 
 
+@pytest.mark.asyncio
+async def test_upsert_transactions_file_db_runs_batch_in_one_thread_hop(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """File databases write a whole batch in one to_thread call, atomically."""
+    hops = []
+    real_to_thread = asyncio.to_thread
+
+    async def counting_to_thread(fn, *args):  # type: ignore[no-untyped-def]
+        hops.append(fn.__name__)
+        return await real_to_thread(fn, *args)
+
+    monkeypatch.setattr(asyncio, "to_thread", counting_to_thread)
+    base = {
+        "chain": "ETH",
+        "timestamp": "2026-02-22T11:00:00+00:00",
+        "from_addr": "0xa",
+        "to_addr": "0xb",
+        "value_native": "1.0",
+    }
+    async with Database(str(tmp_path / "bulk.db")) as db:
+        txns = [{**base, "tx_hash": f"0xbulk{i}"} for i in range(50)]
+        assert await db.upsert_transactions(txns) == 50
+        assert hops == ["_bulk_upsert_sync"]
+        # Committed rows are visible to the async connection
+        async with db._conn.execute("SELECT COUNT(*) FROM transactions") as cur:
+            assert (await cur.fetchone())[0] == 50
+
+        # A row that cannot be bound rolls the whole batch back
+        bad = [{**base, "tx_hash": "0xnew"}, {**base, "tx_hash": {"not": "bindable"}}]
+        with pytest.raises(DatabaseError):
+            await db.upsert_transactions(bad)
+        async with db._conn.execute("SELECT COUNT(*) FROM transactions") as cur:
+            assert (await cur.fetchone())[0] == 50
+        assert await db.upsert_transactions([{**base, "tx_hash": "0xafter"}]) == 1
+    assert db._sync_conn is None
+
+
+@pytest.mark.asyncio
+async def test_upsert_transactions_file_db_after_failed_writes(tmp_path) -> None:
+    """Failed async writes roll back, so the blocking upsert connection is never locked out."""
+    tx = {
+        "chain": "ETH",
+        "timestamp": "2026-02-22T11:00:00+00:00",
+        "from_addr": "0xa",
+        "to_addr": "0xb",
+        "value_native": "1.0",
+    }
+    async with Database(str(tmp_path / "locked.db")) as db:
+        await db.add_wallet("0xdup", "ETH")
+        with pytest.raises(WalletExistsError):
+            await db.add_wallet("0xdup", "ETH")
+        assert not db._conn.in_transaction
+        with pytest.raises(DatabaseError):
+            await db.save_alert_rule({"id": None, "type": "bogus", "value": 1.0})
+        assert not db._conn.in_transaction
+        # Well under the 5s busy timeout a held write lock would cost
+        assert await asyncio.wait_for(db.upsert_transactions([{**tx, "tx_hash": "0x1"}]), 2) == 1
+
+        # A stray implicit transaction is discarded rather than waited on
+        await db._conn.execute("UPDATE wallets SET label = 'stale'")
+        assert db._conn.in_transaction
+        assert await asyncio.wait_for(db.upsert_transactions([{**tx, "tx_hash": "0x2"}]), 2) == 1
+        assert (await db.get_wallet("0xdup", "ETH"))["label"] == ""
+
+
+@pytest.mark.asyncio
+async def test_upsert_transactions_skips_rows_missing_required_fields(db: Database) -> None:
+    """Rows with a NULL required column are dropped; the rest land in one batch."""
+    base = {
+        "chain": "ETH",
+        "timestamp": "2026-02-22T11:00:00+00:00",
+        "from_addr": "0xa",
+        "to_addr": "0xb",
+        "value_native": "1.0",
+    }
+    txns = [
+        {**base, "tx_hash": "0xok1"},
+        {**base, "tx_hash": None},
+        {**base, "tx_hash": "0xok2", "to_addr": None},
+        {**base, "tx_hash": "0xok3"},
+    ]
+    assert await db.upsert_transactions(txns) == 2
+    async with db._conn.execute("SELECT tx_hash FROM transactions ORDER BY tx_hash") as cur:
+        assert [r[0] for r in await cur.fetchall()] == ["0xok1", "0xok3"]
+
+
 # ── Scores ───────────────────────────────────────────────────────────────────
 
 
@@ -241,6 +522,161 @@ async def test_save_and_get_score_history(db: Database) -> None:
     assert history[0]["total_score"] == 82
 
 
+@pytest.mark.asyncio
+async def test_save_scores_batch(db: Database) -> None:
+    """save_scores_batch writes all snapshots; an empty batch is a no-op."""
+    now = datetime.now(tz=UTC).isoformat()
+    await db.save_scores_batch([])
+    await db.save_scores_batch(
+        [
+            {"address": "0xbatch_score", "chain": "ETH", "computed_at": now, "total": t}
+            for t in (40, 60)
+        ]
+    )
+    history = await db.get_score_history("0xbatch_score", "ETH", days=7)
+    assert sorted(h["total_score"] for h in history) == [40, 60]
+
+
+@pytest.mark.asyncio
+async def test_save_scores_batch_is_atomic(db: Database) -> None:
+    """A rejected row rolls back the whole batch and surfaces as DatabaseError."""
+    now = datetime.now(tz=UTC).isoformat()
+    rows = [
+        {"address": "0xatomic", "chain": "ETH", "computed_at": now, "total": 50},
+        {"address": "0xatomic", "chain": "ETH", "computed_at": now, "direction": "sideways"},
+    ]
+    with pytest.raises(DatabaseError):
+        await db.save_scores_batch(rows)
+    assert await db.get_score_history("0xatomic", "ETH", days=7) == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batches_do_not_interleave(db: Database) -> None:
+    """Concurrent writers queue on the write lock instead of nesting transactions."""
+    import asyncio
+
+    now = datetime.now(tz=UTC).isoformat()
+    await asyncio.gather(
+        *(
+            db.save_scores_batch(
+                [{"address": f"0xlock_{i}", "chain": "ETH", "computed_at": now, "total": i}] * 3
+            )
+            for i in range(5)
+        ),
+        db.cache_set("k", "v", 60),
+    )
+    for i in range(5):
+        assert len(await db.get_score_history(f"0xlock_{i}", "ETH", days=7)) == 3
+    assert await db.cache_get("k") == "v"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_single_writes_share_one_commit(
+    db: Database, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Writes queued together are group-committed in one transaction."""
+    import asyncio
+
+    commits = 0
+    real_commit = db._conn.commit
+
+    async def counting_commit() -> None:
+        nonlocal commits
+        commits += 1
+        await real_commit()
+
+    monkeypatch.setattr(db._conn, "commit", counting_commit)
+    await asyncio.gather(*(db.cache_set(f"k{i}", str(i), 60) for i in range(10)))
+    assert commits == 1
+    assert [await db.cache_get(f"k{i}") for i in range(10)] == [str(i) for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_in_flight_group_commit(tmp_path) -> None:
+    """close() while queued writes are being flushed lets them commit first."""
+    import asyncio
+
+    path = str(tmp_path / "close.db")
+    db = Database(path)
+    await db.connect()
+    writes = [asyncio.create_task(db.cache_set(f"k{i}", str(i), 60)) for i in range(5)]
+    await asyncio.sleep(0)  # writers queue and start the flush task
+    await asyncio.sleep(0)  # flush takes the lock and its batch
+    await db.close()
+    await asyncio.gather(*writes)
+
+    async with Database(path) as reopened:
+        assert [await reopened.cache_get(f"k{i}") for i in range(5)] == [str(i) for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_group_commit_failure_only_fails_its_caller(db: Database) -> None:
+    """A rejected statement in a group commit raises for its caller alone."""
+    import asyncio
+
+    now = datetime.now(tz=UTC).isoformat()
+    good = {"address": "0xgroup", "chain": "ETH", "computed_at": now, "total": 10}
+    bad = {**good, "direction": "sideways"}
+    results = await asyncio.gather(
+        db.save_score(good), db.save_score(bad), db.save_score(good), return_exceptions=True
+    )
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], Exception)
+    assert len(await db.get_score_history("0xgroup", "ETH", days=7)) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_avg_abs_netflow(db: Database) -> None:
+    """Per-address mean |net flow| over the window, filtered by chain."""
+    now = datetime.now(tz=UTC).isoformat()
+    await db.save_scores_batch(
+        [
+            {"address": "0xavg_a", "chain": "ETH", "computed_at": now, "net_flow_usd": 100.0},
+            {"address": "0xavg_a", "chain": "ETH", "computed_at": now, "net_flow_usd": -300.0},
+            {"address": "0xavg_b", "chain": "ETH", "computed_at": now, "net_flow_usd": 50.0},
+            {"address": "0xavg_b", "chain": "BTC", "computed_at": now, "net_flow_usd": 9e9},
+        ]
+    )
+    result = await db.get_avg_abs_netflow("eth", ["0xavg_a", "0xavg_b", "0xavg_none"])
+    assert result == {"0xavg_a": 200.0, "0xavg_b": 50.0}
+    assert await db.get_avg_abs_netflow("ETH", []) == {}
+
+
+@pytest.mark.asyncio
+async def test_get_summary_aggregates(db: Database) -> None:
+    """Net flow, peak score and alert count are reduced per (address, chain)."""
+    now = datetime.now(tz=UTC).isoformat()
+    await db.save_scores_batch(
+        [
+            {
+                "address": "0xsum",
+                "chain": "ETH",
+                "computed_at": now,
+                "total": 40,
+                "net_flow_usd": 100.0,
+            },
+            {
+                "address": "0xsum",
+                "chain": "ETH",
+                "computed_at": now,
+                "total": 90,
+                "net_flow_usd": -300.0,
+                "alert_triggered": True,
+            },
+            {"address": "0xsum", "chain": "BTC", "computed_at": now, "total": 10},
+        ]
+    )
+    result = {(r["address"], r["chain"]): r for r in await db.get_summary_aggregates(days=7)}
+    assert result[("0xsum", "ETH")] == {
+        "address": "0xsum",
+        "chain": "ETH",
+        "net_flow_usd": -200.0,
+        "peak_score": 90,
+        "alert_count": 1,
+    }
+    assert result[("0xsum", "BTC")]["alert_count"] == 0
+
+
 # ── Alerts ────────────────────────────────────────────────────────────────────
 
 
@@ -262,6 +698,35 @@ async def test_save_alert(db: Database) -> None:
     assert saved["score"] == 85
 
 
+@pytest.mark.asyncio
+async def test_save_alerts_batch_returns_ids_in_order(db: Database) -> None:
+    """save_alerts_batch persists every alert and returns their ids in input order."""
+    alerts = [
+        {"address": f"0xbatch_{i}", "chain": "ETH", "score": 80 + i, "rule_id": "auto"}
+        for i in range(3)
+    ]
+    ids = await db.save_alerts_batch(alerts)
+    assert len(ids) == 3 and ids == sorted(ids)
+    assert await db.save_alerts_batch([]) == []
+
+    stored = {a["id"]: a["address"] for a in await db.list_alerts()}
+    assert [stored[i] for i in ids] == ["0xbatch_0", "0xbatch_1", "0xbatch_2"]
+
+
+@pytest.mark.asyncio
+async def test_save_alerts_batch_is_atomic(db: Database) -> None:
+    """A row rejected partway through rolls back the batch; a later commit cannot publish it."""
+    alerts = [
+        {"address": "0xatomic_alert", "chain": "ETH", "score": 80},
+        {"address": "0xatomic_alert", "chain": "ETH", "score": None},  # NOT NULL violation
+        {"address": "0xatomic_alert", "chain": "ETH", "score": 90},
+    ]
+    with pytest.raises(DatabaseError):
+        await db.save_alerts_batch(alerts)
+    await db.cache_set("unrelated", "write", 60)  # commits anything left pending
+    assert await db.list_alerts() == []
+
+
 @pytest.mark.asyncio
 async def test_list_alerts(db: Database) -> None:
     """list_alerts returns persisted alerts."""
@@ -318,6 +783,49 @@ async def test_is_not_duplicate_outside_window(db: Database) -> None:
     assert is_dup is False
 
 
+@pytest.mark.asyncio
+async def test_is_duplicate_alert_compares_instants_not_strings(db: Database) -> None:
+    """Window checks use epoch seconds, so a non-UTC offset timestamp still counts."""
+    from datetime import timedelta, timezone
+
+    local = datetime.now(tz=timezone(timedelta(hours=-5)))
+    await db.save_alert({"address": "0xoffset", "chain": "ETH", "triggered_at": local.isoformat()})
+    assert await db.is_duplicate_alert("0xoffset", "ETH", window_seconds=60) is True
+
+
+@pytest.mark.asyncio
+async def test_connect_migrates_v2_timestamps_to_epoch(tmp_path) -> None:
+    """A v2 database gains the epoch columns, backfilled from the ISO timestamps."""
+    path = str(tmp_path / "v2.db")
+    now = datetime.now(tz=UTC).isoformat()
+    async with Database(path) as db:
+        await db.save_alert({"address": "0xv2", "chain": "ETH", "triggered_at": now})
+        await db.upsert_transactions(
+            [
+                {
+                    "chain": "ETH",
+                    "tx_hash": "0xv2tx",
+                    "timestamp": now,
+                    "from_addr": "0xv2",
+                    "to_addr": "0xother",
+                    "value_native": "1",
+                }
+            ]
+        )
+        # Rewind to the v2 layout: no epoch columns
+        await db._conn.execute("DROP INDEX idx_alerts_addr_epoch")
+        await db._conn.execute("ALTER TABLE alerts DROP COLUMN triggered_at_epoch")
+        await db._conn.execute("ALTER TABLE transactions DROP COLUMN fetched_at_epoch")
+        await db._conn.execute("UPDATE schema_version SET version = 2")
+        await db._conn.commit()
+
+    async with Database(path) as db:
+        assert await db.is_duplicate_alert("0xv2", "ETH") is True
+        assert await db.get_cached_transactions("0xv2", "ETH", "2000-01-01", now) is not None
+        [alert] = await db.list_alerts(since_hours=1)
+        assert "triggered_at_epoch" not in alert
+
+
 # ── Alert Rules ───────────────────────────────────────────────────────────────
 
 
@@ -347,6 +855,36 @@ async def test_get_next_rule_id(db: Database) -> None:
     assert id1 == "rule_001"
 
 
+@pytest.mark.asyncio
+async def test_get_next_rule_id_follows_highest_number(db: Database) -> None:
+    """Ids continue after the highest rule_NNN, so gaps never lead to a reused id."""
+    for rule_id in ("rule_002", "rule_005", "custom"):
+        await db.save_alert_rule({"id": rule_id, "type": "score", "value": 70.0})
+    assert await db.get_next_rule_id() == "rule_006"
+
+
+@pytest.mark.asyncio
+async def test_save_alert_rule_assigns_unique_ids_concurrently(db: Database) -> None:
+    """Rules saved without an id each claim a distinct rule_NNN, even concurrently."""
+    import asyncio
+
+    rules = await asyncio.gather(
+        *(db.save_alert_rule({"id": None, "type": "score", "value": 70.0}) for _ in range(5))
+    )
+    assert sorted(r["id"] for r in rules) == [f"rule_{n:03d}" for n in range(1, 6)]
+    assert len(await db.list_alert_rules()) == 5
+
+
+@pytest.mark.asyncio
+async def test_save_alert_rule_failure_rolls_back(db: Database) -> None:
+    """A rejected new rule raises DatabaseError and leaves no transaction open."""
+    with pytest.raises(DatabaseError):
+        await db.save_alert_rule({"id": None, "type": "bogus", "value": 70.0})
+    assert not db._conn.in_transaction
+    rule = await db.save_alert_rule({"id": None, "type": "score", "value": 70.0})
+    assert rule["id"] == "rule_001"
+
+
 # ── API Cache ────────────────────────────────────────────────────────────────
 
 
@@ -388,3 +926,52 @@ async def test_cache_prune(db: Database) -> None:
     deleted = await db.cache_prune()
     assert deleted >= 1
     assert await db.cache_get("fresh_key") == "data"
+    assert "stale_key" not in db._mem_cache
+
+
+@pytest.mark.asyncio
+async def test_cache_get_serves_repeat_hits_from_memory(db: Database) -> None:
+    """After a set or a first read, fresh entries come from memory, not SQLite."""
+    await db.cache_set("mem_key", "v1", ttl_seconds=3600)
+    await db._conn.execute("DELETE FROM api_cache")
+    await db._conn.commit()
+    assert await db.cache_get("mem_key") == "v1"
+
+
+@pytest.mark.asyncio
+async def test_cache_get_coalesces_concurrent_misses(
+    db: Database, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Concurrent cache_get calls for one key share a single SQLite read."""
+    import asyncio
+
+    await db._conn.execute(
+        "INSERT INTO api_cache VALUES ('shared', 'body', ?, 3600)", (time.time(),)
+    )
+    await db._conn.commit()
+    reads = 0
+    real_execute = db._conn.execute
+
+    def counting_execute(sql: str, *args: object):  # type: ignore[no-untyped-def]
+        nonlocal reads
+        reads += "api_cache" in sql
+        return real_execute(sql, *args)
+
+    monkeypatch.setattr(db._conn, "execute", counting_execute)
+    assert await asyncio.gather(*(db.cache_get("shared") for _ in range(5))) == ["body"] * 5
+    assert await db.cache_get("shared") == "body"
+    assert reads == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_memory_is_lru_bounded(db: Database, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The in-memory layer evicts the least recently used key past its size cap."""
+    from whalecli import db as db_mod
+
+    monkeypatch.setattr(db_mod, "_MEM_CACHE_SIZE", 2)
+    await db.cache_set("a", "1", 3600)
+    await db.cache_set("b", "2", 3600)
+    await db.cache_get("a")  # a becomes most recently used
+    await db.cache_set("c", "3", 3600)
+    assert list(db._mem_cache) == ["a", "c"]
+    assert await db.cache_get("b") == "2"  # still served from SQLite
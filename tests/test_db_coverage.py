@@ -57,6 +57,75 @@ async def test_get_cached_transactions_with_fresh_cache(db: Database) -> None:
     assert isinstance(result, list)
 
 
+@pytest.mark.asyncio
+async def test_get_cached_transactions_both_sides_newest_first(db: Database) -> None:
+    """Rows from either side come back once each, newest first; self-transfers are not doubled."""
+    address = "0xboth_sides"
+    now = datetime.now(tz=UTC)
+
+    def tx(tx_hash: str, hours_ago: int, from_addr: str, to_addr: str) -> dict:
+        return {
+            "chain": "ETH",
+            "tx_hash": tx_hash,
+            "timestamp": (now - timedelta(hours=hours_ago)).isoformat(),
+            "from_addr": from_addr,
+            "to_addr": to_addr,
+            "value_native": "1.0",
+        }
+
+    await db.upsert_transactions(
+        [
+            tx("0xout", 3, address, "0xother"),
+            tx("0xin", 1, "0xother", address),
+            tx("0xself", 2, address, address),
+            tx("0xold", 48, address, "0xother"),
+        ]
+    )
+    result = await db.get_cached_transactions(
+        address.upper(), "eth", (now - timedelta(hours=24)).isoformat(), now.isoformat()
+    )
+    assert [r["tx_hash"] for r in result] == ["0xin", "0xself", "0xout"]
+
+
+@pytest.mark.asyncio
+async def test_get_cached_transactions_single_round_trip(
+    db: Database, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Freshness and rows come from one statement; fresh-but-empty is [], stale is None."""
+    now = datetime.now(tz=UTC)
+    await db.upsert_transactions(
+        [
+            {
+                "chain": "ETH",
+                "tx_hash": "0xrt",
+                "timestamp": (now - timedelta(days=3)).isoformat(),
+                "from_addr": "0xround",
+                "to_addr": "0xother",
+                "value_native": "1",
+            }
+        ]
+    )
+    calls = 0
+    real_execute = db._conn.execute
+
+    def counting_execute(*args: object):  # type: ignore[no-untyped-def]
+        nonlocal calls
+        calls += 1
+        return real_execute(*args)
+
+    monkeypatch.setattr(db._conn, "execute", counting_execute)
+    recent = ((now - timedelta(hours=1)).isoformat(), now.isoformat())
+    assert await db.get_cached_transactions("0xround", "ETH", *recent) == []
+    assert calls == 1
+
+    wide = ((now - timedelta(days=7)).isoformat(), now.isoformat())
+    [row] = await db.get_cached_transactions("0xround", "ETH", *wide)
+    assert row["tx_hash"] == "0xrt" and "fresh" not in row
+
+    await db._conn.execute("UPDATE transactions SET fetched_at_epoch = 0")
+    assert await db.get_cached_transactions("0xround", "ETH", *wide) is None
+
+
 @pytest.mark.asyncio
 async def test_remove_wallet_with_purge(db: Database) -> None:
     """remove_wallet with purge=True deletes transactions."""
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import httpx
 import pytest
 
 from whalecli.config import WhalecliConfig
-from whalecli.fetchers import get_fetcher
+from whalecli.fetchers import get_fetcher, validate_address
 from whalecli.fetchers.btc import BTCFetcher
 from whalecli.fetchers.eth import EtherscanClient
 from whalecli.fetchers.hl import HyperliquidClient
@@ -53,3 +54,41 @@ def test_get_fetcher_returns_protocol_compliant_object(config: WhalecliConfig) -
         assert hasattr(fetcher, "get_transactions")
         assert hasattr(fetcher, "get_wallet_age")
         assert hasattr(fetcher, "validate_address")
+
+
+@pytest.mark.asyncio
+async def test_get_fetcher_shares_client_without_closing_it(config: WhalecliConfig) -> None:
+    """A caller-supplied client is used by every fetcher and left open by close()."""
+    async with httpx.AsyncClient() as client:
+        fetchers = [get_fetcher(chain, config, client=client) for chain in ("ETH", "BTC", "HL")]
+        for fetcher in fetchers:
+            assert fetcher._client is client
+            await fetcher.close()
+        assert not client.is_closed
+
+
+@pytest.mark.parametrize(
+    ("chain", "address"),
+    [
+        ("ETH", "0xd8da6bf26964af9d7eed9e03e53415d37aa96045"),
+        ("hl", "0xd8da6bf26964af9d7eed9e03e53415d37aa96045"),
+        ("BTC", "bc1qxy2kgdygjrsqtzq2n0yrf2493p83kkfjhx0wlh"),
+        ("BTC", "not-an-address"),
+        ("ETH", "0x123"),
+    ],
+)
+async def test_validate_address_matches_fetcher(
+    config: WhalecliConfig, chain: str, address: str
+) -> None:
+    """validate_address agrees with the fetcher's own check, without building one."""
+    fetcher = get_fetcher(chain, config)
+    try:
+        assert validate_address(chain, address) is await fetcher.validate_address(address)
+    finally:
+        await fetcher.close()
+
+
+def test_validate_address_unknown_chain() -> None:
+    """validate_address rejects unsupported chains like get_fetcher does."""
+    with pytest.raises(ValueError):
+        validate_address("SOL", "abc")
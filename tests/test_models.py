@@ -144,6 +144,22 @@ def test_alert_event_to_dict_no_breakdown() -> None:
     assert "score_breakdown" not in d
 
 
+def test_alert_event_is_slotted() -> None:
+    """AlertEvent has no per-instance __dict__ but keeps webhook fields mutable."""
+    ae = AlertEvent(
+        id="alert_003",
+        rule_id="auto",
+        address="0xtest",
+        chain="ETH",
+        label="",
+        score=90,
+        triggered_at="2026-02-22T12:00:00+00:00",
+    )
+    assert not hasattr(ae, "__dict__")
+    ae.webhook_sent = True
+    assert ae.to_dict()["webhook_sent"] is True
+
+
 def test_alert_event_to_dict_with_breakdown() -> None:
     """AlertEvent.to_dict() with score_breakdown includes it."""
     sb = ScoreBreakdown(
@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 import csv
-import io
 import json
 from decimal import Decimal
 from typing import Any
 
 import pytest
+from helpers import events_and_types
 
 from whalecli.output import (
     format_csv,
@@ -16,122 +16,10 @@ from whalecli.output import (
     format_jsonl,
     format_output,
     format_table,
+    iter_jsonl,
     mask_api_key,
 )
 
-# ── Fixtures ──────────────────────────────────────────────────────────────────
-
-
-def make_scan_result() -> dict[str, Any]:
-    """Scan result dict matching the documented API schema."""
-    return {
-        "scan_id": "scan_20260222_120000_abcd",
-        "scan_time": "2026-02-22T12:00:00+00:00",
-        "chain": "ETH",
-        "window_hours": 24,
-        "wallets_scanned": 3,
-        "alerts_triggered": 1,
-        "wallets": [
-            {
-                "address": "0xd8da6bf26964af9d7eed9e03e53415d37aa96045",
-                "chain": "ETH",
-                "label": "Binance Cold",
-                "score": 82,
-                "score_breakdown": {
-                    "net_flow": 35,
-                    "velocity": 22,
-                    "correlation": 15,
-                    "exchange_flow": 10,
-                },
-                "direction": "accumulating",
-                "net_flow_usd": 5_000_000.0,
-                "inflow_usd": 7_000_000.0,
-                "outflow_usd": 2_000_000.0,
-                "tx_count": 12,
-                "wallet_age_days": 365,
-                "alert_triggered": True,
-                "computed_at": "2026-02-22T12:00:00+00:00",
-            },
-            {
-                "address": "0xabc123456789abc123456789abc123456789abc1",
-                "chain": "ETH",
-                "label": "Whale #2",
-                "score": 45,
-                "score_breakdown": {
-                    "net_flow": 20,
-                    "velocity": 15,
-                    "correlation": 5,
-                    "exchange_flow": 5,
-                },
-                "direction": "neutral",
-                "net_flow_usd": 0.0,
-                "inflow_usd": 100_000.0,
-                "outflow_usd": 100_000.0,
-                "tx_count": 2,
-                "wallet_age_days": 100,
-                "alert_triggered": False,
-                "computed_at": "2026-02-22T12:00:00+00:00",
-            },
-        ],
-        "summary": {
-            "total_wallets": 2,
-            "accumulating": 1,
-            "distributing": 0,
-            "neutral": 1,
-            "alerts_triggered": 1,
-            "dominant_signal": "accumulating",
-        },
-    }
-
-
-def make_wallet_list() -> dict[str, Any]:
-    return {
-        "count": 2,
-        "wallets": [
-            {
-                "address": "0xaaa",
-                "chain": "ETH",
-                "label": "Whale A",
-                "tags": [],
-                "added_at": "2026-01-01T00:00:00+00:00",
-            },
-            {
-                "address": "bc1qtest",
-                "chain": "BTC",
-                "label": "BTC Whale",
-                "tags": ["exchange"],
-                "added_at": "2026-01-02T00:00:00+00:00",
-            },
-        ],
-    }
-
-
-def make_alert_list() -> dict[str, Any]:
-    return {
-        "rules": [
-            {
-                "id": "rule_001",
-                "type": "score",
-                "value": 70.0,
-                "window": "1h",
-                "chain": "ETH",
-                "active": True,
-            },
-        ],
-        "recent_alerts": [
-            {
-                "id": 1,
-                "address": "0xwallet",
-                "chain": "ETH",
-                "score": 85,
-                "direction": "accumulating",
-                "triggered_at": "2026-02-22T12:00:00+00:00",
-                "webhook_sent": True,
-            },
-        ],
-    }
-
-
 # ── format_json ───────────────────────────────────────────────────────────────
 
 
@@ -155,9 +43,9 @@ def test_format_json_handles_decimal() -> None:
     assert isinstance(parsed["amount"], float)
 
 
-def test_format_json_handles_nested() -> None:
+def test_format_json_handles_nested(scan_result: dict[str, Any]) -> None:
     """format_json handles nested dicts."""
-    data = make_scan_result()
+    data = scan_result
     result = format_json(data)
     parsed = json.loads(result)
     assert parsed["wallets"][0]["score"] == 82
@@ -166,43 +54,37 @@ def test_format_json_handles_nested() -> None:
 # ── format_jsonl ──────────────────────────────────────────────────────────────
 
 
-def test_format_jsonl_scan_result_emits_events() -> None:
+def test_format_jsonl_scan_result_emits_events(scan_result: dict[str, Any]) -> None:
     """format_jsonl for scan result emits scan_start, wallet_result, scan_end."""
-    data = make_scan_result()
-    result = format_jsonl(data)
-    lines = [l for l in result.strip().split("\n") if l.strip()]
-    assert len(lines) >= 3
-
-    events = [json.loads(line) for line in lines]
-    event_types = [e["type"] for e in events]
+    data = scan_result
+    events, event_types = events_and_types(format_jsonl(data))
+    assert len(events) >= 3
     assert "scan_start" in event_types
     assert "wallet_result" in event_types
     assert "scan_end" in event_types
 
 
-def test_format_jsonl_each_line_is_valid_json() -> None:
+def test_format_jsonl_each_line_is_valid_json(scan_result: dict[str, Any]) -> None:
     """Each line in JSONL output must be valid JSON."""
-    data = make_scan_result()
+    data = scan_result
     result = format_jsonl(data)
     for line in result.strip().split("\n"):
         if line.strip():
             json.loads(line)  # Should not raise
 
 
-def test_format_jsonl_wallet_count_matches() -> None:
+def test_format_jsonl_wallet_count_matches(scan_result: dict[str, Any]) -> None:
     """Number of wallet_result events should match wallet count."""
-    data = make_scan_result()
-    result = format_jsonl(data)
-    events = [json.loads(l) for l in result.strip().split("\n") if l.strip()]
+    data = scan_result
+    events, _ = events_and_types(format_jsonl(data))
     wallet_events = [e for e in events if e["type"] == "wallet_result"]
     assert len(wallet_events) == len(data["wallets"])
 
 
-def test_format_jsonl_scan_end_has_counts() -> None:
+def test_format_jsonl_scan_end_has_counts(scan_result: dict[str, Any]) -> None:
     """scan_end event should have wallets_scanned and alerts_triggered."""
-    data = make_scan_result()
-    result = format_jsonl(data)
-    events = [json.loads(l) for l in result.strip().split("\n") if l.strip()]
+    data = scan_result
+    events, _ = events_and_types(format_jsonl(data))
     end_event = next(e for e in events if e["type"] == "scan_end")
     assert "wallets_scanned" in end_event
     assert "alerts_triggered" in end_event
@@ -216,26 +98,34 @@ def test_format_jsonl_list_input() -> None:
     assert len(lines) == 3
 
 
+def test_iter_jsonl_yields_format_jsonl_lines(scan_result: dict[str, Any]) -> None:
+    """iter_jsonl yields newline-terminated lines that join to format_jsonl's output."""
+    lines = list(iter_jsonl(scan_result))
+    assert all(line.endswith(b"\n") for line in lines)
+    assert len(lines) == len(scan_result["wallets"]) + 2
+    assert b"".join(lines).decode() == format_jsonl(scan_result) + "\n"
+
+
 # ── format_table ──────────────────────────────────────────────────────────────
 
 
-def test_format_table_scan_result_contains_address() -> None:
+def test_format_table_scan_result_contains_address(scan_result: dict[str, Any]) -> None:
     """format_table for scan result should contain wallet address."""
-    data = make_scan_result()
+    data = scan_result
     result = format_table(data)
     assert "Binance Cold" in result or "0xd8da" in result
 
 
-def test_format_table_wallet_list_contains_chain() -> None:
+def test_format_table_wallet_list_contains_chain(wallet_list: dict[str, Any]) -> None:
     """format_table for wallet list should contain chain names."""
-    data = make_wallet_list()
+    data = wallet_list
     result = format_table(data)
     assert "ETH" in result or "BTC" in result
 
 
-def test_format_table_alert_list_contains_rule_id() -> None:
+def test_format_table_alert_list_contains_rule_id(alert_list: dict[str, Any]) -> None:
     """format_table for alert list should contain rule ID."""
-    data = make_alert_list()
+    data = alert_list
     result = format_table(data)
     assert "rule_001" in result
 
@@ -249,25 +139,25 @@ def test_format_table_returns_string() -> None:
 # ── format_csv ────────────────────────────────────────────────────────────────
 
 
-def test_format_csv_scan_result_has_header() -> None:
+def test_format_csv_scan_result_has_header(scan_result: dict[str, Any]) -> None:
     """format_csv for scan result should include a header row."""
-    data = make_scan_result()
+    data = scan_result
     result = format_csv(data)
-    rows = list(csv.reader(io.StringIO(result)))
+    rows = list(csv.reader(result.splitlines()))
     assert len(rows) >= 2  # header + at least 1 data row
 
 
-def test_format_csv_wallet_list_header() -> None:
+def test_format_csv_wallet_list_header(wallet_list: dict[str, Any]) -> None:
     """format_csv for wallet list should have address in header."""
-    data = make_wallet_list()
+    data = wallet_list
     result = format_csv(data)
-    first_line = result.strip().split("\n")[0]
-    assert "address" in first_line.lower()
+    header_cols = frozenset(c.strip().lower() for c in next(csv.reader(result.splitlines())))
+    assert "address" in header_cols
 
 
-def test_format_csv_values_present() -> None:
+def test_format_csv_values_present(wallet_list: dict[str, Any]) -> None:
     """CSV rows should contain expected values."""
-    data = make_wallet_list()
+    data = wallet_list
     result = format_csv(data)
     assert "0xaaa" in result or "ETH" in result
 
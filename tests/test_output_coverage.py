@@ -3,16 +3,17 @@
 from __future__ import annotations
 
 import csv
-import io
 import json
 from decimal import Decimal
 
 import pytest
+from helpers import events_and_types
 
 from whalecli.output import (
     _flatten_dict,
     format_csv,
     format_json,
+    format_json_bytes,
     format_jsonl,
     format_table,
 )
@@ -77,7 +78,7 @@ def test_format_csv_with_list_input() -> None:
     """format_csv handles plain list input."""
     data = [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
     result = format_csv(data)
-    rows = list(csv.reader(io.StringIO(result)))
+    rows = list(csv.reader(result.splitlines()))
     assert rows[0] == ["a", "b"]
     assert len(rows) == 3  # header + 2 data rows
 
@@ -139,6 +140,19 @@ def test_format_json_none_value() -> None:
     assert json.loads(result)["key"] is None
 
 
+def test_format_json_matches_stdlib_layout() -> None:
+    """The orjson-backed format_json keeps the stdlib 2-space layout and non-ASCII text."""
+    data = {"label": "Walé", "scores": [1, 2], "nested": {"k": None}, "amount": Decimal("2.5")}
+    expected = json.dumps({**data, "amount": 2.5}, indent=2, ensure_ascii=False)
+    assert format_json(data) == expected
+
+
+def test_format_json_bytes_matches_format_json() -> None:
+    """format_json_bytes is format_json's text, encoded and newline-terminated."""
+    data = {"label": "Walé", "amount": Decimal("2.5"), "nested": {"k": [1, 2]}}
+    assert format_json_bytes(data) == (format_json(data) + "\n").encode()
+
+
 def test_format_json_empty_dict() -> None:
     """format_json handles empty dict."""
     result = format_json({})
@@ -156,12 +170,8 @@ def test_format_jsonl_empty_scan_result() -> None:
         "alerts_triggered": 0,
         "wallets": [],
     }
-    result = format_jsonl(data)
-    lines = [l for l in result.strip().split("\n") if l.strip()]
-    assert len(lines) == 2  # scan_start + scan_end (no wallet_result events)
-
-    events = [json.loads(l) for l in lines]
-    types = [e["type"] for e in events]
+    events, types = events_and_types(format_jsonl(data))
+    assert len(events) == 2  # scan_start + scan_end (no wallet_result events)
     assert "scan_start" in types
     assert "scan_end" in types
 
@@ -182,3 +192,87 @@ def test_format_table_wallet_list_no_wallets() -> None:
     result = format_table(data)
     assert isinstance(result, str)
     # Should contain "0" total count or just show empty table
+
+
+def test_format_jsonl_handles_decimal() -> None:
+    """format_jsonl serialises Decimal values as floats."""
+    result = format_jsonl([{"amount": Decimal("1.5")}])
+    assert json.loads(result) == {"amount": 1.5}
+
+
+def test_format_jsonl_rejects_unserialisable() -> None:
+    """format_jsonl raises TypeError for values JSON cannot represent."""
+    with pytest.raises(TypeError):
+        format_jsonl([{"obj": object()}])
+
+
+def test_format_csv_large_export_uses_stdlib_dialect() -> None:
+    """Exports of any size share one dialect: CRLF rows, minimal quoting, Python bool/float text."""
+    rows = [{"address": "0xa", "score": 1.0, "active": True}] * 20_000
+    out = format_csv(rows)
+    assert out.startswith("address,score,active\r\n0xa,1.0,True\r\n")
+    assert out.count("\r\n") == 20_001
+
+
+def test_flatten_dict_preserves_key_order() -> None:
+    """Nested keys are emitted in place, so CSV column order matches the input."""
+    d = {"a": 1, "nested": {"x": 1, "deep": {"y": 2}, "z": 3}, "b": 2}
+    assert list(_flatten_dict(d)) == ["a", "nested.x", "nested.deep.y", "nested.z", "b"]
+
+
+def test_format_jsonl_scan_frames_match_dict_encoding() -> None:
+    """Templated scan_start/scan_end frames equal the dict encoding, key order included."""
+    data = {
+        "scan_id": 'scan_"quoted"',
+        "scan_time": "2026-02-22T12:00:00+00:00",
+        "chain": "ETH",
+        "window_hours": 24,
+        "wallets_scanned": 5,
+        "alerts_triggered": 1,
+        "wallets": [],
+    }
+    start, end = format_jsonl(data).splitlines()
+    assert start == json.dumps(
+        {
+            "type": "scan_start",
+            "scan_id": data["scan_id"],
+            "timestamp": data["scan_time"],
+            "chain": "ETH",
+            "window_hours": 24,
+        },
+        separators=(",", ":"),
+    )
+    assert end == json.dumps(
+        {
+            "type": "scan_end",
+            "scan_id": data["scan_id"],
+            "wallets_scanned": 5,
+            "alerts_triggered": 1,
+            "timestamp": data["scan_time"],
+        },
+        separators=(",", ":"),
+    )
+
+
+def test_cli_import_defers_rich() -> None:
+    """Importing the CLI (e.g. for --help) does not load rich."""
+    import subprocess
+    import sys
+
+    code = "import sys, whalecli.cli; " "print('rich' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_cli_import_defers_db_and_output() -> None:
+    """Importing the CLI leaves the database and output modules for the commands."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, whalecli.cli; "
+        "print(sorted(m for m in ('whalecli.db', 'whalecli.output', 'aiosqlite')"
+        " if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
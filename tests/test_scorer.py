@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import UTC, datetime
 from decimal import Decimal
 
+import pytest
+
 from whalecli.models import Transaction
 from whalecli.scorer import (
+    apply_correlation,
     compute_correlation_score,
     compute_exchange_flow_score,
     compute_net_flow_score,
@@ -18,6 +22,9 @@ from whalecli.scorer import (
 
 ETH_ADDR = "0xabcdef1234567890abcdef1234567890abcdef12"
 TS = datetime(2026, 2, 22, 12, 0, 0, tzinfo=UTC).isoformat()
+_DEC_1 = Decimal("1.0")
+_DEC_100 = Decimal("100.0")
+_DEC_1000 = Decimal("1000.0")
 
 
 def make_tx(
@@ -33,7 +40,7 @@ def make_tx(
         from_addr=from_addr,
         to_addr=to_addr,
         timestamp=TS,
-        value_native=Decimal("1.0"),
+        value_native=_DEC_1,
         block_num=100,
         value_usd=value_usd,
         gas_usd=5.0,
@@ -58,7 +65,8 @@ def test_net_flow_score_zero_transactions() -> None:
 
 def test_net_flow_score_pure_inflow() -> None:
     """Large inflow should score > 0 and direction = accumulating."""
-    txns = [make_tx(to_addr=ETH_ADDR, value_usd=2_000_000.0, tx_hash=f"0x{i}") for i in range(5)]
+    tmpl = make_tx(to_addr=ETH_ADDR, value_usd=2_000_000.0)
+    txns = [replace(tmpl, tx_hash=f"0x{i}") for i in range(5)]
     score, direction, net, inflow, _outflow = compute_net_flow_score(txns, ETH_ADDR, 365)
     assert score > 0
     assert direction == "accumulating"
@@ -68,10 +76,8 @@ def test_net_flow_score_pure_inflow() -> None:
 
 def test_net_flow_score_pure_outflow() -> None:
     """Large outflow should direction = distributing."""
-    txns = [
-        make_tx(from_addr=ETH_ADDR, to_addr="0xrecip", value_usd=1_500_000.0, tx_hash=f"0x{i}")
-        for i in range(3)
-    ]
+    tmpl = make_tx(from_addr=ETH_ADDR, to_addr="0xrecip", value_usd=1_500_000.0)
+    txns = [replace(tmpl, tx_hash=f"0x{i}") for i in range(3)]
     _score, direction, net, _inflow, outflow = compute_net_flow_score(txns, ETH_ADDR, 365)
     assert direction == "distributing"
     assert net < 0
@@ -104,17 +110,17 @@ def test_net_flow_score_clamped_to_40() -> None:
 # ── compute_velocity_score ───────────────────────────────────────────────────
 
 
-def test_velocity_score_no_transactions() -> None:
-    """No transactions → velocity score 0."""
-    score = compute_velocity_score([], avg_30d_daily_flow_usd=50_000.0, scan_hours=24)
-    assert score == 0
-
-
-def test_velocity_score_below_average() -> None:
-    """Activity below 30d average → velocity score 0."""
-    txns = [make_tx(value_usd=100.0)]
-    score = compute_velocity_score(txns, avg_30d_daily_flow_usd=500_000.0, scan_hours=24)
-    assert score == 0
+@pytest.mark.parametrize(
+    ("txns", "avg_30d"),
+    [
+        ([], 50_000.0),  # no transactions
+        ([make_tx(value_usd=100.0)], 500_000.0),  # activity below 30d average
+    ],
+    ids=["no_transactions", "below_average"],
+)
+def test_velocity_score_zero(txns: list[Transaction], avg_30d: float) -> None:
+    """No activity, or activity below the 30d average → velocity score 0."""
+    assert compute_velocity_score(txns, avg_30d_daily_flow_usd=avg_30d, scan_hours=24) == 0
 
 
 def test_velocity_score_10x_above_average() -> None:
@@ -125,75 +131,64 @@ def test_velocity_score_10x_above_average() -> None:
     assert score > 20
 
 
-def test_velocity_score_dormant_then_active() -> None:
-    """Wallet with near-zero 30d average suddenly active → score near max."""
-    txns = [make_tx(value_usd=1_000_000.0)]
-    # Avg baseline is very low
-    score = compute_velocity_score(txns, avg_30d_daily_flow_usd=1.0, scan_hours=24)
-    assert score == 25  # Should be capped at 25
-
-
-def test_velocity_score_clamped_to_25() -> None:
-    """Velocity score should never exceed 25."""
-    txns = [make_tx(value_usd=1e9) for _ in range(100)]
-    score = compute_velocity_score(txns, avg_30d_daily_flow_usd=1.0, scan_hours=24)
-    assert score <= 25
+@pytest.mark.parametrize(
+    ("value_usd", "n_txns"),
+    [
+        (1_000_000.0, 1),  # dormant wallet suddenly active
+        (1e9, 100),  # extreme volume
+    ],
+    ids=["dormant_then_active", "extreme_volume"],
+)
+def test_velocity_score_capped_at_25(value_usd: float, n_txns: int) -> None:
+    """Activity far above a near-zero baseline → velocity score capped at 25."""
+    tmpl = make_tx(value_usd=value_usd)
+    txns = [replace(tmpl, tx_hash=f"0x{i}", block_num=100 + i) for i in range(n_txns)]
+    assert compute_velocity_score(txns, avg_30d_daily_flow_usd=1.0, scan_hours=24) == 25
 
 
 # ── compute_correlation_score ────────────────────────────────────────────────
 
-
-def test_correlation_score_neutral_wallet() -> None:
-    """Neutral wallet direction → correlation score 0."""
-    score = compute_correlation_score("neutral", {"0xother": "accumulating"})
-    assert score == 0
-
-
-def test_correlation_score_all_same_direction() -> None:
-    """All active wallets in same direction → correlation score = 20."""
-    other = {
-        "0xaaa": "accumulating",
-        "0xbbb": "accumulating",
-        "0xccc": "accumulating",
-    }
-    score = compute_correlation_score("accumulating", other)
-    assert score == 20
-
-
-def test_correlation_score_zero_correlation() -> None:
-    """No other wallets in same direction → score 0."""
-    other = {
-        "0xaaa": "distributing",
-        "0xbbb": "distributing",
-    }
-    score = compute_correlation_score("accumulating", other)
-    assert score == 0
-
-
-def test_correlation_score_50_percent() -> None:
-    """50% correlation → score = 10."""
-    other = {
-        "0xaaa": "accumulating",
-        "0xbbb": "distributing",
-        "0xccc": "accumulating",
-        "0xddd": "distributing",
-    }
-    score = compute_correlation_score("accumulating", other)
-    assert score == 10
-
-
-def test_correlation_score_fewer_than_min_peers() -> None:
-    """Fewer than 2 active peers → score 0."""
-    other = {"0xaaa": "accumulating"}
-    score = compute_correlation_score("accumulating", other)
-    assert score == 0
+_BIG_CORR_PEERS = {f"0x{i:040x}": "accumulating" for i in range(100)}
+
+
+@pytest.mark.parametrize(
+    ("direction", "peers", "expected"),
+    [
+        ("neutral", {"0xother": "accumulating"}, 0),
+        (
+            "accumulating",
+            {"0xaaa": "accumulating", "0xbbb": "accumulating", "0xccc": "accumulating"},
+            20,
+        ),
+        ("accumulating", {"0xaaa": "distributing", "0xbbb": "distributing"}, 0),
+        (
+            "accumulating",
+            {
+                "0xaaa": "accumulating",
+                "0xbbb": "distributing",
+                "0xccc": "accumulating",
+                "0xddd": "distributing",
+            },
+            10,
+        ),
+        ("accumulating", {"0xaaa": "accumulating"}, 0),
+    ],
+    ids=[
+        "neutral_wallet",
+        "all_same_direction",
+        "zero_correlation",
+        "50_percent",
+        "fewer_than_min_peers",
+    ],
+)
+def test_correlation_score(direction: str, peers: dict[str, str], expected: int) -> None:
+    """Correlation score is the same-direction share of active peers, scaled to 20."""
+    assert compute_correlation_score(direction, peers) == expected
 
 
 def test_correlation_score_clamped_to_20() -> None:
     """Correlation score should never exceed 20."""
-    other = {f"0x{i:040x}": "accumulating" for i in range(100)}
-    score = compute_correlation_score("accumulating", other)
-    assert score <= 20
+    assert compute_correlation_score("accumulating", _BIG_CORR_PEERS) <= 20
 
 
 # ── compute_exchange_flow_score ──────────────────────────────────────────────
@@ -220,7 +215,7 @@ def test_exchange_flow_score_large_exchange_inflow() -> None:
             from_addr=EXCH_ADDR,
             to_addr=ETH_ADDR,
             timestamp=TS,
-            value_native=Decimal("100.0"),
+            value_native=_DEC_100,
             block_num=100 + i,
             value_usd=300_000.0,
             gas_usd=5.0,
@@ -235,6 +230,14 @@ def test_exchange_flow_score_large_exchange_inflow() -> None:
     assert fraction > 0.5
 
 
+def test_exchange_flow_score_outflow_to_exchange() -> None:
+    """Wallet sending to an exchange (mixed-case addresses) counts as exchange flow."""
+    txns = [make_tx(from_addr=ETH_ADDR.upper(), to_addr=EXCH_ADDR.upper(), value_usd=500_000.0)]
+    score, fraction = compute_exchange_flow_score(txns, ETH_ADDR, {EXCH_ADDR}, -500_000.0)
+    assert score > 0
+    assert fraction == 1.0
+
+
 def test_exchange_flow_fraction_bounded() -> None:
     """Exchange flow fraction should never exceed 1.0."""
     txns = [make_tx(from_addr=EXCH_ADDR, to_addr=ETH_ADDR, value_usd=1_000_000.0)]
@@ -244,23 +247,11 @@ def test_exchange_flow_fraction_bounded() -> None:
 
 def test_exchange_flow_score_clamped_to_15() -> None:
     """Exchange flow score should never exceed 15."""
-    txns = [
-        Transaction(
-            tx_hash=f"0xex{i}",
-            chain="ETH",
-            from_addr=EXCH_ADDR,
-            to_addr=ETH_ADDR,
-            timestamp=TS,
-            value_native=Decimal("1000.0"),
-            block_num=100 + i,
-            value_usd=1e9,
-            gas_usd=5.0,
-            token_symbol=None,
-            token_addr=None,
-            fetched_at="",
-        )
-        for i in range(10)
-    ]
+    tmpl = replace(
+        make_tx(from_addr=EXCH_ADDR, to_addr=ETH_ADDR, value_usd=1e9),
+        value_native=_DEC_1000,
+    )
+    txns = [replace(tmpl, tx_hash=f"0xex{i}", block_num=100 + i) for i in range(10)]
     score, _ = compute_exchange_flow_score(txns, ETH_ADDR, {EXCH_ADDR}, 1e10)
     assert score <= 15
 
@@ -349,23 +340,11 @@ def test_score_wallet_breakdown_sums_to_total() -> None:
 def test_score_wallet_high_accumulation() -> None:
     """Wallet with large, fast inflow from exchanges should score >= 70."""
     exchange_addrs = {"0xexchange_whale"}
-    txns = [
-        Transaction(
-            tx_hash=f"0x{i:040x}",
-            chain="ETH",
-            from_addr="0xexchange_whale",
-            to_addr=ETH_ADDR,
-            timestamp=TS,
-            value_native=Decimal("1000.0"),
-            block_num=18_000_000 + i,
-            value_usd=3_000_000.0,
-            gas_usd=5.0,
-            token_symbol=None,
-            token_addr=None,
-            fetched_at="",
-        )
-        for i in range(4)
-    ]
+    tmpl = replace(
+        make_tx(from_addr="0xexchange_whale", to_addr=ETH_ADDR, value_usd=3_000_000.0),
+        value_native=_DEC_1000,
+    )
+    txns = [replace(tmpl, tx_hash=f"0x{i:040x}", block_num=18_000_000 + i) for i in range(4)]
     result = score_wallet(
         address=ETH_ADDR,
         chain="ETH",
@@ -383,40 +362,35 @@ def test_score_wallet_high_accumulation() -> None:
 # ── score_to_severity ─────────────────────────────────────────────────────────
 
 
-def test_severity_critical() -> None:
-    assert score_to_severity(90) == "critical"
-    assert score_to_severity(100) == "critical"
-
-
-def test_severity_warning() -> None:
-    assert score_to_severity(80) == "warning"
-    assert score_to_severity(89) == "warning"
-
-
-def test_severity_info() -> None:
-    assert score_to_severity(70) == "info"
-    assert score_to_severity(79) == "info"
-
-
-def test_severity_none_below_70() -> None:
-    assert score_to_severity(69) is None
-    assert score_to_severity(0) is None
+@pytest.mark.parametrize(
+    ("score", "expected"),
+    [
+        (90, "critical"),
+        (100, "critical"),
+        (80, "warning"),
+        (89, "warning"),
+        (70, "info"),
+        (79, "info"),
+        (69, None),
+        (0, None),
+    ],
+)
+def test_severity(score: int, expected: str | None) -> None:
+    assert score_to_severity(score) == expected
 
 
 # ── load_exchange_addresses ───────────────────────────────────────────────────
 
 
-def test_load_exchange_addresses_eth() -> None:
-    """Should return a non-empty set for ETH."""
-    addrs = load_exchange_addresses("ETH")
-    assert isinstance(addrs, set)
-    assert len(addrs) > 0
+def test_load_exchange_addresses_eth(eth_exchange_addrs: frozenset[str]) -> None:
+    """Should return a non-empty frozenset for ETH."""
+    assert isinstance(eth_exchange_addrs, frozenset)
+    assert len(eth_exchange_addrs) > 0
 
 
-def test_load_exchange_addresses_all_lowercase() -> None:
+def test_load_exchange_addresses_all_lowercase(eth_exchange_addrs: frozenset[str]) -> None:
     """All addresses should be lowercase."""
-    addrs = load_exchange_addresses("ETH")
-    for addr in addrs:
+    for addr in eth_exchange_addrs:
         assert addr == addr.lower()
 
 
@@ -424,3 +398,72 @@ def test_load_exchange_addresses_unknown_chain() -> None:
     """Unknown chain should return empty set (not raise)."""
     addrs = load_exchange_addresses("UNKNOWN")
     assert addrs == set()
+
+
+def test_load_exchange_addresses_cached() -> None:
+    """Repeated loads (any case) return the same cached object."""
+    assert load_exchange_addresses("eth") is load_exchange_addresses("ETH")
+
+
+def test_load_exchange_addresses_parses_registry_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Loading several chains reads and parses the registry file a single time."""
+    import json
+
+    from whalecli import scorer
+
+    scorer._load_exchange_addresses.cache_clear()
+    scorer._load_exchange_registry.cache_clear()
+    calls = 0
+    real_load = json.load
+
+    def counting_load(f):
+        nonlocal calls
+        calls += 1
+        return real_load(f)
+
+    monkeypatch.setattr(scorer.json, "load", counting_load)
+    try:
+        for chain in ("ETH", "BTC", "HL", "ETH"):
+            load_exchange_addresses(chain)
+        assert calls == 1
+    finally:
+        scorer._load_exchange_addresses.cache_clear()
+        scorer._load_exchange_registry.cache_clear()
+
+
+def test_apply_correlation_matches_full_rescore() -> None:
+    """Adding correlation to a peer-less score equals scoring with the peers up front."""
+    txns = [make_tx(value_usd=5_000_000.0)]
+    peers = {"0xp1": "accumulating", "0xp2": "accumulating", "0xp3": "distributing"}
+    kwargs: dict = {
+        "address": ETH_ADDR,
+        "chain": "ETH",
+        "transactions": txns,
+        "wallet_age_days": 10,
+        "avg_30d_daily_flow_usd": 10_000.0,
+        "exchange_addresses": set(),
+    }
+    full = score_wallet(**kwargs, all_wallet_directions=peers)
+    staged = apply_correlation(score_wallet(**kwargs, all_wallet_directions={}), peers)
+    assert staged["score_breakdown"] == full["score_breakdown"]
+    assert staged["score"] == full["score"]
+    assert full["score_breakdown"]["correlation"] > 0
+
+
+def test_correlation_exclude_matches_filtered_map() -> None:
+    """Excluding an address equals passing a copy of the map without it."""
+    directions = {
+        ETH_ADDR: "accumulating",
+        "0xp1": "accumulating",
+        "0xp2": "distributing",
+        "0xp3": "neutral",
+    }
+    peers = {a: d for a, d in directions.items() if a != ETH_ADDR}
+    for direction in ("accumulating", "distributing", "neutral"):
+        assert compute_correlation_score(
+            direction, directions, exclude=ETH_ADDR
+        ) == compute_correlation_score(direction, peers)
+    # Without the exclusion the wallet would count itself as an agreeing peer
+    assert compute_correlation_score("accumulating", directions) > compute_correlation_score(
+        "accumulating", directions, exclude=ETH_ADDR
+    )
@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
+from helpers import aiter_rows
 
 from whalecli.config import WhalecliConfig
 from whalecli.db import Database
@@ -29,7 +30,7 @@ def test_emit_event_writes_jsonl(capsys) -> None:
     emit_event({"type": "test", "value": 42})
     captured = capsys.readouterr()
     assert captured.out.strip() != ""
-    parsed = json.loads(captured.out.strip())
+    parsed = orjson.loads(captured.out.strip())
     assert parsed["type"] == "test"
     assert parsed["value"] == 42
 
@@ -38,7 +39,7 @@ def test_emit_event_handles_decimal(capsys) -> None:
     """emit_event handles Decimal values."""
     emit_event({"amount": Decimal("1.5")})
     captured = capsys.readouterr()
-    parsed = json.loads(captured.out.strip())
+    parsed = orjson.loads(captured.out.strip())
     assert parsed["amount"] == 1.5
 
 
@@ -56,111 +57,85 @@ def test_emit_event_newline_terminated(capsys) -> None:
     assert captured.out.endswith("\n")
 
 
+def test_emit_event_writes_compact_bytes_to_fd(capfdbinary) -> None:
+    """emit_event writes one compact, pre-encoded line to the stdout file descriptor."""
+    emit_event({"x": 1, "amount": Decimal("2.5"), "label": "é"})
+    assert capfdbinary.readouterr().out == '{"x":1,"amount":2.5,"label":"é"}\n'.encode()
+
+
 # ── run_stream ────────────────────────────────────────────────────────────────
 
 
-@pytest.mark.asyncio
-async def test_run_stream_emits_stream_start(capsys) -> None:
-    """run_stream should emit stream_start as first event."""
+async def _stream_events(
+    capfd,
+    until: set[str],
+    poll_result: list[dict] | None = None,
+    interval_seconds: int = 1000,
+) -> list[dict]:
+    """
+    Run the stream until every event type in ``until`` has been emitted, then cancel it.
+
+    Waits on the captured output rather than a fixed sleep, so each test takes only
+    as long as the events it needs. Returns every event emitted, stream_end included.
+    """
     config = WhalecliConfig()
     config.database.path = ":memory:"
+    out = ""
+
+    async def _seen() -> None:
+        nonlocal out
+        while True:
+            out += capfd.readouterr().out
+            if until <= {orjson.loads(line)["type"] for line in out.splitlines()}:
+                return
+            await asyncio.sleep(0.005)
 
-    with patch("whalecli.stream._poll_cycle", new=AsyncMock(return_value=[])):
+    with patch("whalecli.stream._poll_cycle", new=AsyncMock(return_value=poll_result or [])):
         task = asyncio.create_task(
             run_stream(
                 chains=["ETH"],
-                interval_seconds=1000,  # Long interval so it stops after one heartbeat
+                interval_seconds=interval_seconds,
                 threshold=70,
                 config=config,
                 db=_make_mock_db(),
                 hours=1,
             )
         )
-        # Give the stream time to emit stream_start and first heartbeat
-        await asyncio.sleep(0.1)
-        task.cancel()
         try:
-            await task
-        except (asyncio.CancelledError, Exception):
-            pass
-
-    captured = capsys.readouterr()
-    lines = [l for l in captured.out.strip().split("\n") if l.strip()]
-    assert len(lines) >= 1
+            await asyncio.wait_for(_seen(), timeout=1.0)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
 
-    first_event = json.loads(lines[0])
-    assert first_event["type"] == "stream_start"
+    out += capfd.readouterr().out
+    return [orjson.loads(line) for line in out.splitlines()]
 
 
 @pytest.mark.asyncio
-async def test_run_stream_emits_heartbeat(capsys) -> None:
-    """run_stream should emit heartbeat after each poll cycle."""
-    config = WhalecliConfig()
-    config.database.path = ":memory:"
+async def test_run_stream_emits_stream_start(capfd) -> None:
+    """run_stream should emit stream_start as first event."""
+    events = await _stream_events(capfd, {"stream_start"})
+    assert events[0]["type"] == "stream_start"
 
-    with patch("whalecli.stream._poll_cycle", new=AsyncMock(return_value=[])):
-        task = asyncio.create_task(
-            run_stream(
-                chains=["ETH"],
-                interval_seconds=0,  # No sleep between cycles
-                threshold=70,
-                config=config,
-                db=_make_mock_db(),
-                hours=1,
-            )
-        )
-        await asyncio.sleep(0.1)
-        task.cancel()
-        try:
-            await task
-        except (asyncio.CancelledError, Exception):
-            pass
 
-    captured = capsys.readouterr()
-    lines = [l for l in captured.out.strip().split("\n") if l.strip()]
-    events = [json.loads(l) for l in lines]
-    event_types = [e["type"] for e in events]
-    assert "heartbeat" in event_types
+@pytest.mark.asyncio
+async def test_run_stream_emits_heartbeat(capfd) -> None:
+    """run_stream should emit heartbeat after each poll cycle."""
+    events = await _stream_events(capfd, {"heartbeat"}, interval_seconds=0)
+    assert "heartbeat" in [e["type"] for e in events]
 
 
 @pytest.mark.asyncio
-async def test_run_stream_emits_stream_end(capsys) -> None:
+async def test_run_stream_emits_stream_end(capfd) -> None:
     """run_stream should emit stream_end when cancelled."""
-    config = WhalecliConfig()
-    config.database.path = ":memory:"
-
-    with patch("whalecli.stream._poll_cycle", new=AsyncMock(return_value=[])):
-        task = asyncio.create_task(
-            run_stream(
-                chains=["ETH"],
-                interval_seconds=1000,
-                threshold=70,
-                config=config,
-                db=_make_mock_db(),
-                hours=1,
-            )
-        )
-        await asyncio.sleep(0.05)
-        task.cancel()
-        try:
-            await task
-        except (asyncio.CancelledError, Exception):
-            pass
-
-    captured = capsys.readouterr()
-    lines = [l for l in captured.out.strip().split("\n") if l.strip()]
-    events = [json.loads(l) for l in lines]
-    event_types = [e["type"] for e in events]
+    events = await _stream_events(capfd, {"heartbeat"})
     # stream_end is emitted on cancellation
-    assert "stream_end" in event_types
+    assert events[-1]["type"] == "stream_end"
 
 
 @pytest.mark.asyncio
-async def test_run_stream_emits_whale_alert_above_threshold(capsys) -> None:
+async def test_run_stream_emits_whale_alert_above_threshold(capfd) -> None:
     """Wallet above threshold should produce whale_alert event."""
-    config = WhalecliConfig()
-    config.database.path = ":memory:"
-
     high_score_wallet = {
         "address": "0xtest_whale",
         "chain": "ETH",
@@ -180,39 +155,15 @@ async def test_run_stream_emits_whale_alert_above_threshold(capsys) -> None:
         "outflow_usd": 0.0,
     }
 
-    with patch("whalecli.stream._poll_cycle", new=AsyncMock(return_value=[high_score_wallet])):
-        with patch("whalecli.alert.process_alerts", new=AsyncMock(return_value=[])):
-            task = asyncio.create_task(
-                run_stream(
-                    chains=["ETH"],
-                    interval_seconds=1000,
-                    threshold=70,
-                    config=config,
-                    db=_make_mock_db(),
-                    hours=1,
-                )
-            )
-            await asyncio.sleep(0.1)
-            task.cancel()
-            try:
-                await task
-            except (asyncio.CancelledError, Exception):
-                pass
-
-    captured = capsys.readouterr()
-    lines = [l for l in captured.out.strip().split("\n") if l.strip()]
-    events = [json.loads(l) for l in lines]
+    events = await _stream_events(capfd, {"whale_alert"}, poll_result=[high_score_wallet])
     alert_events = [e for e in events if e["type"] == "whale_alert"]
     assert len(alert_events) >= 1
     assert alert_events[0]["score"] == 90
 
 
 @pytest.mark.asyncio
-async def test_run_stream_emits_whale_activity_below_threshold(capsys) -> None:
+async def test_run_stream_emits_whale_activity_below_threshold(capfd) -> None:
     """Wallet below threshold should produce whale_activity event, not whale_alert."""
-    config = WhalecliConfig()
-    config.database.path = ":memory:"
-
     low_score_wallet = {
         "address": "0xtest_wallet",
         "chain": "ETH",
@@ -232,39 +183,21 @@ async def test_run_stream_emits_whale_activity_below_threshold(capsys) -> None:
         "outflow_usd": 0.0,
     }
 
-    with patch("whalecli.stream._poll_cycle", new=AsyncMock(return_value=[low_score_wallet])):
-        task = asyncio.create_task(
-            run_stream(
-                chains=["ETH"],
-                interval_seconds=1000,
-                threshold=70,
-                config=config,
-                db=_make_mock_db(),
-                hours=1,
-            )
-        )
-        await asyncio.sleep(0.1)
-        task.cancel()
-        try:
-            await task
-        except (asyncio.CancelledError, Exception):
-            pass
-
-    captured = capsys.readouterr()
-    lines = [l for l in captured.out.strip().split("\n") if l.strip()]
-    events = [json.loads(l) for l in lines]
+    events = await _stream_events(capfd, {"whale_activity"}, poll_result=[low_score_wallet])
     activity_events = [e for e in events if e["type"] == "whale_activity"]
     assert len(activity_events) >= 1
     assert activity_events[0]["score"] == 50
+    assert "whale_alert" not in {e["type"] for e in events}
 
 
 def _make_mock_db() -> MagicMock:
     """Create a mock database with async methods."""
     db = MagicMock(spec=Database)
     db.list_wallets = AsyncMock(return_value=[])
-    db.get_score_history = AsyncMock(return_value=[])
+    db.iter_score_history = MagicMock(side_effect=lambda *a, **k: aiter_rows([]))
     db.save_score = AsyncMock()
     db.save_alert = AsyncMock(return_value={"id": 1})
+    db.save_alerts_batch = AsyncMock(side_effect=lambda rows: [1] * len(rows))
     db.is_duplicate_alert = AsyncMock(return_value=False)
     db.update_alert_webhook = AsyncMock()
     return db
@@ -2,25 +2,36 @@
 
 from __future__ import annotations
 
+import asyncio
+import signal
 from datetime import UTC, datetime
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
+from helpers import aiter_rows
 
 from whalecli.config import WhalecliConfig
 from whalecli.db import Database
 from whalecli.models import Transaction
-from whalecli.stream import _fetch_and_score, _get_30d_avg, _poll_cycle
+from whalecli.stream import (
+    _fetch_and_score,
+    _get_30d_avg,
+    _install_stop_handlers,
+    _poll_cycle,
+    run_stream,
+)
 
 
 def _make_mock_db(wallets=None, score_history=None) -> MagicMock:
     db = MagicMock(spec=Database)
     db.list_wallets = AsyncMock(return_value=wallets or [])
-    db.get_score_history = AsyncMock(return_value=score_history or [])
+    db.iter_score_history = MagicMock(side_effect=lambda *a, **k: aiter_rows(score_history or []))
     db.save_score = AsyncMock()
     db.is_duplicate_alert = AsyncMock(return_value=False)
     db.save_alert = AsyncMock(return_value={"id": 1})
+    db.save_alerts_batch = AsyncMock(side_effect=lambda rows: [1] * len(rows))
     db.update_alert_webhook = AsyncMock()
     return db
 
@@ -199,3 +210,80 @@ async def test_poll_cycle_handles_fetch_errors() -> None:
     # Should still return a scored wallet (with empty transactions)
     assert len(result) == 1
     assert result[0]["score"] == 0
+
+
+@pytest.mark.asyncio
+async def test_run_stream_stops_on_sigterm(capsys) -> None:
+    """The stop handler wakes the inter-cycle wait and ends the stream with stream_end."""
+    stop_events: list[asyncio.Event] = []
+
+    def capture_stop(loop: asyncio.AbstractEventLoop, stop_event: asyncio.Event) -> list:
+        stop_events.append(stop_event)
+        return []
+
+    with (
+        patch("whalecli.stream._poll_cycle", new=AsyncMock(return_value=[])),
+        patch("whalecli.stream._install_stop_handlers", side_effect=capture_stop),
+    ):
+        task = asyncio.create_task(
+            run_stream(
+                chains=["ETH"],
+                interval_seconds=1000,
+                threshold=70,
+                config=_make_config(),
+                db=_make_mock_db(),
+                hours=1,
+            )
+        )
+        await asyncio.sleep(0.05)
+        # What the SIGTERM handler does, without signalling the test process
+        [stop_event] = stop_events
+        asyncio.get_running_loop().call_soon(stop_event.set)
+        await asyncio.wait_for(task, timeout=2)
+
+    events = [orjson.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert events[-1]["type"] == "stream_end"
+    assert events[-1]["cycles_completed"] == 1
+
+
+def test_install_stop_handlers_routes_sigint_and_sigterm() -> None:
+    """Both stop signals are wired to stop_event.set on the loop."""
+    loop = MagicMock()
+    stop_event = asyncio.Event()
+    assert _install_stop_handlers(loop, stop_event) == [signal.SIGINT, signal.SIGTERM]
+    loop.add_signal_handler.assert_any_call(signal.SIGTERM, stop_event.set)
+
+    loop.add_signal_handler.side_effect = NotImplementedError
+    assert _install_stop_handlers(loop, stop_event) == []
+
+
+@pytest.mark.asyncio
+async def test_poll_cycle_bounds_concurrent_fetches() -> None:
+    """_poll_cycle never has more than stream.max_concurrency fetches in flight."""
+    config = _make_config()
+    config.stream.max_concurrency = 2
+    wallets = [
+        {"address": f"0xw{i}", "chain": "ETH", "label": "", "tags": [], "active": True}
+        for i in range(6)
+    ]
+    in_flight = peak = 0
+
+    async def slow_fetch(address: str, hours: int) -> list:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return []
+
+    with patch("whalecli.stream.get_fetcher") as mock_get_fetcher:
+        mock_fetcher = MagicMock()
+        mock_fetcher.get_transactions = slow_fetch
+        mock_get_fetcher.return_value = mock_fetcher
+
+        result = await _poll_cycle(
+            chains=["ETH"], hours=1, config=config, db=_make_mock_db(wallets)
+        )
+
+    assert len(result) == 6
+    assert peak == 2
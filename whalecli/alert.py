@@ -7,13 +7,17 @@ Dispatches webhook payloads for critical events.
 
 from __future__ import annotations
 
-import hashlib
+import asyncio
 import hmac
-import json
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime
+from functools import lru_cache
 from typing import Any
+from weakref import WeakKeyDictionary
 
 import httpx
+import orjson
 
 from whalecli.config import WhalecliConfig
 from whalecli.db import Database
@@ -22,8 +26,33 @@ from whalecli.scorer import score_to_severity
 # Default dedup window in seconds (1 hour)
 _DEFAULT_DEDUP_WINDOW_SECS = 3600
 
+# In-process record of recently raised alerts, (address, CHAIN) → epoch seconds,
+# kept per Database so a hit never leaks across databases. Lets repeat alerts be
+# rejected without a DB round-trip; the DB stays authoritative on a miss.
+_DEDUP_CACHE_MAX = 10_000
+_DEDUP_CACHES: WeakKeyDictionary[Database, OrderedDict[tuple[str, str], float]] = (
+    WeakKeyDictionary()
+)
+
 WEBHOOK_SCHEMA_VERSION = "1"
 
+# score_to_severity precomputed for every score 0–100 (thresholds are integers,
+# so truncating fractional scores keeps the same bucket).
+_SEVERITY_TABLE: tuple[str | None, ...] = tuple(score_to_severity(s) for s in range(101))
+
+# Leading fields that are identical on every webhook. dispatch_webhook splices
+# their pre-serialised bytes in front of the encoded per-alert fields.
+_WEBHOOK_PAYLOAD_HEADER: dict[str, Any] = {
+    "schema_version": WEBHOOK_SCHEMA_VERSION,
+    "event_type": "whale_alert",
+}
+_WEBHOOK_BODY_PREFIX = orjson.dumps(_WEBHOOK_PAYLOAD_HEADER)[:-1] + b","
+
+# Shared webhook client so repeated alerts reuse keep-alive connections instead
+# of paying a TCP/TLS handshake per POST. Bound to the loop that created it.
+_WEBHOOK_CLIENT: httpx.AsyncClient | None = None
+_WEBHOOK_CLIENT_LOOP: asyncio.AbstractEventLoop | None = None
+
 
 def score_passes_threshold(score: int, config: WhalecliConfig) -> bool:
     """Return True if the score meets the configured alert threshold."""
@@ -57,67 +86,134 @@ async def process_alerts(
     if dedup_window <= 0:
         dedup_window = _DEFAULT_DEDUP_WINDOW_SECS
 
+    # Pass 1: threshold filter, then run the dedup lookups concurrently.
+    # Thresholds are hoisted to locals; same checks as score/flow_passes_threshold.
+    score_thr = config.alert.score_threshold
+    flow_thr = config.alert.flow_threshold_usd
+    candidates: list[dict[str, Any]] = [
+        w
+        for w in scored_wallets
+        if w.get("score", 0) >= score_thr or abs(w.get("net_flow_usd", 0.0)) >= flow_thr
+    ]
+    if not candidates:
+        return []
+
+    cache = _DEDUP_CACHES.setdefault(db, OrderedDict())
+    now = time.time()
+    uncached: list[dict[str, Any]] = []
+    for w in candidates:
+        last = cache.get((w.get("address", ""), w.get("chain", "ETH").upper()))
+        if last is None or now - last >= dedup_window:
+            uncached.append(w)
+
+    dup_flags = await asyncio.gather(
+        *[
+            db.is_duplicate_alert(w.get("address", ""), w.get("chain", "ETH"), dedup_window)
+            for w in uncached
+        ]
+    )
+
+    # One timestamp for the whole batch — it represents a single scan cycle.
+    triggered_at = datetime.now(tz=UTC).isoformat()
+    triggered: list[dict[str, Any]] = []
     new_alerts: list[dict[str, Any]] = []
-
-    for wallet in scored_wallets:
-        score = wallet.get("score", 0)
-        net_flow_usd = wallet.get("net_flow_usd", 0.0)
+    seen: set[tuple[str, str]] = set()
+    for wallet, is_dup in zip(uncached, dup_flags, strict=True):
         address = wallet.get("address", "")
         chain = wallet.get("chain", "ETH")
+        # The DB check can't see alerts raised earlier in this same batch
+        key = (address, chain.upper())
+        if is_dup or key in seen:
+            continue
+        seen.add(key)
 
-        # Check if score OR flow threshold met
-        score_triggered = score_passes_threshold(score, config)
-        flow_triggered = flow_passes_threshold(net_flow_usd, config)
+        score = wallet.get("score", 0)
+        new_alerts.append(
+            {
+                "address": address,
+                "chain": chain,
+                "label": wallet.get("label", ""),
+                "score": score,
+                "direction": wallet.get("direction", "neutral"),
+                "net_flow_usd": wallet.get("net_flow_usd", 0.0),
+                "triggered_at": triggered_at,
+                "rule_id": "auto",
+                "score_breakdown": wallet.get("score_breakdown", {}),
+                "severity": _SEVERITY_TABLE[max(0, min(100, int(score)))],
+                "tx_count": wallet.get("tx_count", 0),
+                "wallet_age_days": wallet.get("wallet_age_days", 0),
+            }
+        )
+        triggered.append(wallet)
+
+    # Pass 2: persist in one transaction, then dispatch webhooks concurrently.
+    saved_ids = await db.save_alerts_batch(new_alerts)
+    for alert_data, alert_id in zip(new_alerts, saved_ids, strict=True):
+        alert_data["id"] = alert_id
+        alert_data["webhook_sent"] = False
+        alert_data["webhook_status"] = None
+
+    for key in seen:
+        cache[key] = now
+        cache.move_to_end(key)
+    while len(cache) > _DEDUP_CACHE_MAX:
+        cache.popitem(last=False)
+
+    if config.alert.webhook_url and new_alerts:
+        # return_exceptions keeps one failing webhook from cancelling its siblings
+        statuses = await asyncio.gather(
+            *[dispatch_webhook(a, config) for a in new_alerts], return_exceptions=True
+        )
+        updates = []
+        for alert_data, status in zip(new_alerts, statuses, strict=True):
+            webhook_status = status if isinstance(status, int) else None
+            webhook_sent = webhook_status is not None and 200 <= webhook_status < 300
+            alert_data["webhook_sent"] = webhook_sent
+            alert_data["webhook_status"] = webhook_status
+            if alert_data.get("id"):
+                updates.append(
+                    db.update_alert_webhook(alert_data["id"], webhook_sent, webhook_status)
+                )
+        await asyncio.gather(*updates)
 
-        if not score_triggered and not flow_triggered:
-            continue
+    # Mark the original wallet results as alert-triggered
+    for wallet in triggered:
+        wallet["alert_triggered"] = True
 
-        # Dedup check
-        is_dup = await db.is_duplicate_alert(address, chain, dedup_window)
-        if is_dup:
-            continue
+    return new_alerts
 
-        severity = score_to_severity(score)
-        triggered_at = datetime.now(tz=UTC).isoformat()
-
-        alert_data = {
-            "address": address,
-            "chain": chain,
-            "label": wallet.get("label", ""),
-            "score": score,
-            "direction": wallet.get("direction", "neutral"),
-            "net_flow_usd": net_flow_usd,
-            "triggered_at": triggered_at,
-            "rule_id": "auto",
-            "score_breakdown": wallet.get("score_breakdown", {}),
-            "severity": severity,
-            "tx_count": wallet.get("tx_count", 0),
-            "wallet_age_days": wallet.get("wallet_age_days", 0),
-        }
-
-        # Persist alert to DB
-        saved = await db.save_alert(alert_data)
-        alert_data["id"] = saved.get("id")
-
-        # Dispatch webhook if configured
-        webhook_sent = False
-        webhook_status: int | None = None
-        if config.alert.webhook_url:
-            status = await dispatch_webhook(alert_data, config)
-            webhook_sent = status is not None and 200 <= status < 300
-            webhook_status = status
-            if alert_data.get("id"):
-                await db.update_alert_webhook(alert_data["id"], webhook_sent, webhook_status)
 
-        alert_data["webhook_sent"] = webhook_sent
-        alert_data["webhook_status"] = webhook_status
+def _get_webhook_client() -> httpx.AsyncClient:
+    """
+    Return the shared webhook client, creating it on first use.
 
-        # Mark the original wallet result as alert-triggered
-        wallet["alert_triggered"] = True
+    A client is tied to the event loop its connections were opened on, so a new
+    one is created when called from a different loop (each CLI command runs its
+    own ``asyncio.run``). Creation does not await, so no lock is needed.
+    """
+    global _WEBHOOK_CLIENT, _WEBHOOK_CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _WEBHOOK_CLIENT is None or _WEBHOOK_CLIENT.is_closed or _WEBHOOK_CLIENT_LOOP is not loop:
+        _WEBHOOK_CLIENT = httpx.AsyncClient(
+            timeout=15.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+        _WEBHOOK_CLIENT_LOOP = loop
+    return _WEBHOOK_CLIENT
 
-        new_alerts.append(alert_data)
 
-    return new_alerts
+async def close_webhook_client() -> None:
+    """Close the shared webhook client, if one is open."""
+    global _WEBHOOK_CLIENT, _WEBHOOK_CLIENT_LOOP
+    client, _WEBHOOK_CLIENT, _WEBHOOK_CLIENT_LOOP = _WEBHOOK_CLIENT, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+@lru_cache(maxsize=4)
+def _secret_bytes(secret: str) -> bytes:
+    """Encode a webhook secret once; it is reused for every alert signature."""
+    return secret.encode()
 
 
 async def dispatch_webhook(
@@ -132,28 +228,22 @@ async def dispatch_webhook(
     if not config.alert.webhook_url:
         return None
 
-    payload = build_webhook_payload(alert_data)
-    body = json.dumps(payload).encode()
+    body = _webhook_body(alert_data)
 
     headers: dict[str, str] = {"Content-Type": "application/json"}
 
     # HMAC signature if secret configured
     if config.alert.webhook_secret:
-        sig = hmac.new(
-            config.alert.webhook_secret.encode(),
-            body,
-            hashlib.sha256,
-        ).hexdigest()
+        sig = hmac.digest(_secret_bytes(config.alert.webhook_secret), body, "sha256").hex()
         headers["X-Whalecli-Signature"] = f"sha256={sig}"
 
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                config.alert.webhook_url,
-                content=body,
-                headers=headers,
-            )
-            return resp.status_code
+        resp = await _get_webhook_client().post(
+            config.alert.webhook_url,
+            content=body,
+            headers=headers,
+        )
+        return resp.status_code
     except httpx.TimeoutException:
         return None
     except httpx.HTTPError:
@@ -166,28 +256,36 @@ def build_webhook_payload(alert_data: dict[str, Any]) -> dict[str, Any]:
 
     Schema from docs/API.md — Webhook Payload Schema.
     """
+    return {**_WEBHOOK_PAYLOAD_HEADER, **_webhook_payload_fields(alert_data)}
+
+
+def _webhook_payload_fields(alert_data: dict[str, Any]) -> dict[str, Any]:
+    """Per-alert webhook payload fields, in schema order after the static header."""
+    # dispatch_webhook is public and may get partial dicts, so keep the defaults,
+    # but bind the lookup once and read the score a single time.
+    get = alert_data.get
+    score = get("score", 0)
     return {
-        "schema_version": WEBHOOK_SCHEMA_VERSION,
-        "event_type": "whale_alert",
-        "triggered_at": alert_data.get("triggered_at", ""),
-        "rule": {
-            "id": alert_data.get("rule_id", "auto"),
-            "type": "score",
-            "value": alert_data.get("score", 0),
-        },
+        "triggered_at": get("triggered_at", ""),
+        "rule": {"id": get("rule_id", "auto"), "type": "score", "value": score},
         "wallet": {
-            "address": alert_data.get("address", ""),
-            "chain": alert_data.get("chain", ""),
-            "label": alert_data.get("label", ""),
+            "address": get("address", ""),
+            "chain": get("chain", ""),
+            "label": get("label", ""),
         },
-        "score": alert_data.get("score", 0),
-        "score_breakdown": alert_data.get("score_breakdown", {}),
-        "direction": alert_data.get("direction", "neutral"),
-        "net_flow_usd": alert_data.get("net_flow_usd", 0.0),
-        "alert_id": f"alert_{alert_data.get('id', 'unknown')}",
+        "score": score,
+        "score_breakdown": get("score_breakdown", {}),
+        "direction": get("direction", "neutral"),
+        "net_flow_usd": get("net_flow_usd", 0.0),
+        "alert_id": f"alert_{get('id', 'unknown')}",
     }
 
 
+def _webhook_body(alert_data: dict[str, Any]) -> bytes:
+    """Encode the webhook payload; byte-identical to orjson-dumping build_webhook_payload."""
+    return _WEBHOOK_BODY_PREFIX + orjson.dumps(_webhook_payload_fields(alert_data))[1:]
+
+
 def compute_scan_summary(
     scored_wallets: list[dict[str, Any]],
     alerts: list[dict[str, Any]],
@@ -198,8 +296,13 @@ def compute_scan_summary(
     Returns:
         Summary dict with dominant_signal, totals, etc.
     """
-    accumulating = sum(1 for w in scored_wallets if w.get("direction") == "accumulating")
-    distributing = sum(1 for w in scored_wallets if w.get("direction") == "distributing")
+    accumulating = distributing = 0
+    for w in scored_wallets:
+        direction = w.get("direction")
+        if direction == "accumulating":
+            accumulating += 1
+        elif direction == "distributing":
+            distributing += 1
 
     total = len(scored_wallets)
     if total == 0:
@@ -16,48 +16,141 @@ Exit codes:
 from __future__ import annotations
 
 import asyncio
-import csv
-import json
+import dataclasses
+import os
 import sys
-import uuid
+from collections.abc import Callable, Coroutine, Iterator, Sequence
 from datetime import UTC, datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, NoReturn, TypeVar
 
 import click
+import orjson
 
 from whalecli import __version__
-from whalecli.config import WhalecliConfig, get_default_config_path, load_config, save_config
-from whalecli.db import Database
+from whalecli.config import (
+    FALSY_VALUES,
+    SECTION_FIELD_TYPES,
+    TRUTHY_VALUES,
+    WhalecliConfig,
+    get_default_config_path,
+    load_config,
+    save_config,
+)
 from whalecli.exceptions import WhalecliError
-from whalecli.output import format_output, mask_api_key
 
-SUPPORTED_CHAINS = ["ETH", "BTC", "HL"]
-SUPPORTED_CHAINS_ALL = [*SUPPORTED_CHAINS, "ALL"]
+# Command-specific modules (db, output, fetchers, scorer, ...) are imported inside
+# the commands that use them so `whalecli --help` only pays for click and config.
+if TYPE_CHECKING:
+    import httpx
+
+    from whalecli.db import Database
+
+# Ordered for --help; the same values as config.VALID_CHAINS / VALID_FORMATS
+SUPPORTED_CHAINS = ("ETH", "BTC", "HL")
+SUPPORTED_CHAINS_ALL = (*SUPPORTED_CHAINS, "ALL")
+
+# --format choices, by what each command can render
+_FORMATS_ALL = ("json", "jsonl", "table", "csv")
+_FORMATS_EXPORT = ("json", "table", "csv")
+_FORMATS_VIEW = ("json", "table")
+_FORMATS_STREAM = ("jsonl",)
+
+_T = TypeVar("_T")
+
+# Fields of a scored wallet copied into its score snapshot row, fetched in one call
+_SNAPSHOT_FIELDS = itemgetter(
+    "address", "chain", "computed_at", "score", "net_flow_usd", "direction"
+)
+
+
+# ── Event loop ────────────────────────────────────────────────────────────────
+
+
+def _event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """uvloop's loop factory when the `uvloop` extra is installed, else None (default loop)."""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    factory: Callable[[], asyncio.AbstractEventLoop] = uvloop.new_event_loop
+    return factory
+
+
+def _run_async(coro: Coroutine[Any, Any, _T]) -> _T:
+    """Run a command's coroutine to completion on a fresh loop (uvloop when available)."""
+    with asyncio.Runner(loop_factory=_event_loop_factory()) as runner:
+        return runner.run(coro)
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+
+def _stamp_id(prefix: str, now: datetime) -> str:
+    """``<prefix>_YYYYmmdd_HHMMSS`` — same text as strftime, without its locale machinery."""
+    return (
+        f"{prefix}_{now.year:04d}{now.month:02d}{now.day:02d}"
+        f"_{now.hour:02d}{now.minute:02d}{now.second:02d}"
+    )
+
+
+# ── Output helpers ────────────────────────────────────────────────────────────
+
+
+def _echo_result(result: Any, fmt: str) -> None:
+    """
+    Write a command result to stdout in the requested format.
+
+    JSON and JSONL go out as the bytes orjson produced (JSONL one record at a
+    time), which click.echo writes straight to the binary stream without its
+    text/colour handling; only table and csv take the str path.
+    """
+    from whalecli.output import format_json_bytes, format_output, iter_jsonl
+
+    if fmt == "json":
+        click.echo(format_json_bytes(result), nl=False)
+    elif fmt == "jsonl":
+        for line in iter_jsonl(result):
+            click.echo(line, nl=False)
+    else:
+        click.echo(format_output(result, fmt))
+
+
+def _echo_status(obj: dict[str, Any]) -> None:
+    """Write a compact one-line JSON status object to stdout as bytes."""
+    click.echo(orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE), nl=False)
 
 
 # ── Error handler ─────────────────────────────────────────────────────────────
 
 
-def _output_error(err: WhalecliError | Exception) -> None:
+def _write_error(payload: dict[str, Any], exit_code: int) -> NoReturn:
+    """Write one error line to stderr in a single write, then exit."""
+    click.echo(orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE), err=True, nl=False)
+    sys.exit(exit_code)
+
+
+def _emit_error(code: str, message: str, exit_code: int) -> NoReturn:
+    """Write a ``{"error", "message"}`` JSON line to stderr and exit."""
+    _write_error({"error": code, "message": message}, exit_code)
+
+
+def _output_error(err: WhalecliError | Exception) -> NoReturn:
     """Write error JSON to stderr."""
     if isinstance(err, WhalecliError):
-        payload = err.to_dict()
-        exit_code = err.exit_code
-    else:
-        payload = {"error": "unknown_error", "message": str(err), "details": {}}
-        exit_code = 1
-    sys.stderr.write(json.dumps(payload) + "\n")
-    sys.stderr.flush()
-    sys.exit(exit_code)
+        _write_error(err.to_dict(), err.exit_code)
+    _write_error({"error": "unknown_error", "message": str(err), "details": {}}, 1)
 
 
 def _db_from_config(config: WhalecliConfig) -> Database:
     """Create a Database instance from config."""
+    from whalecli.db import Database
+
     db_path = config.database.path
     if db_path and db_path != ":memory:":
         db_path = str(Path(db_path).expanduser())
-    return Database(db_path)
+    return Database(db_path, wal=config.database.wal)
 
 
 # ── Root group ────────────────────────────────────────────────────────────────
@@ -75,7 +168,7 @@ def _db_from_config(config: WhalecliConfig) -> Database:
 @click.option(
     "--format",
     "output_format",
-    type=click.Choice(["json", "jsonl", "table", "csv"]),
+    type=click.Choice(_FORMATS_ALL),
     default=None,
     help="Output format (overrides config default)",
 )
@@ -87,8 +180,6 @@ def cli(ctx: click.Context, config_path: str | None, output_format: str | None)
         config = load_config(config_path)
     except WhalecliError:
         # On config errors, use defaults (so config init still works)
-        from whalecli.config import WhalecliConfig
-
         config = WhalecliConfig()
 
     ctx.obj["config"] = config
@@ -112,7 +203,7 @@ def wallet() -> None:
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["json", "table"]),
+    type=click.Choice(_FORMATS_VIEW),
     default=None,
 )
 @click.pass_context
@@ -125,14 +216,15 @@ def wallet_add(
     fmt: str | None,
 ) -> None:
     """Add a whale wallet to the tracking fleet."""
+    from whalecli.fetchers import validate_address
+
     config: WhalecliConfig = ctx.obj["config"]
     fmt = fmt or ctx.obj.get("format", "json")
 
     async def _run() -> None:
         async with _db_from_config(config) as db:
-            # Validate address
-            fetcher = _get_fetcher_safe(chain, config)
-            if fetcher and not await fetcher.validate_address(address):
+            # Format check is local — no need to build a fetcher and its HTTP client
+            if not validate_address(chain, address):
                 from whalecli.exceptions import InvalidAddressError
 
                 raise InvalidAddressError(
@@ -153,10 +245,10 @@ def wallet_add(
                     "active": True,
                 },
             }
-            click.echo(format_output(result, "json"))
+            _echo_result(result, "json")
 
     try:
-        asyncio.run(_run())
+        _run_async(_run())
     except WhalecliError as e:
         _output_error(e)
 
@@ -167,7 +259,7 @@ def wallet_add(
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["json", "table", "csv"]),
+    type=click.Choice(_FORMATS_EXPORT),
     default=None,
 )
 @click.pass_context
@@ -188,10 +280,10 @@ def wallet_list(
                 "count": len(wallets),
                 "wallets": wallets,
             }
-            click.echo(format_output(result, fmt))
+            _echo_result(result, fmt)
 
     try:
-        asyncio.run(_run())
+        _run_async(_run())
     except WhalecliError as e:
         _output_error(e)
 
@@ -208,10 +300,10 @@ def wallet_remove(ctx: click.Context, address: str, chain: str, purge: bool) ->
     async def _run() -> None:
         async with _db_from_config(config) as db:
             result = await db.remove_wallet(address, chain, purge=purge)
-            click.echo(format_output(result, "json"))
+            _echo_result(result, "json")
 
     try:
-        asyncio.run(_run())
+        _run_async(_run())
     except WhalecliError as e:
         _output_error(e)
 
@@ -225,32 +317,40 @@ def wallet_import_cmd(ctx: click.Context, file_path: str, dry_run: bool) -> None
     config: WhalecliConfig = ctx.obj["config"]
 
     async def _run() -> None:
-        rows = _parse_wallet_csv(file_path)
+        rows = _iter_wallet_csv(file_path)
         async with _db_from_config(config) as db:
             result = await db.import_wallets(rows, dry_run=dry_run)
-        click.echo(format_output(result, "json"))
+        _echo_result(result, "json")
 
     try:
-        asyncio.run(_run())
+        _run_async(_run())
     except (WhalecliError, ValueError) as e:
-        (
+        if isinstance(e, WhalecliError):
             _output_error(e)
-            if isinstance(e, WhalecliError)
-            else (
-                sys.stderr.write(json.dumps({"error": "cli_error", "message": str(e)}) + "\n")
-                or sys.exit(1)
-            )
-        )
+        _emit_error("cli_error", str(e), 1)
+
+
+_WALLET_CSV_FIELDS = ("address", "chain", "label", "tags")
+_WALLET_CSV_BUFFER = 1 << 20  # 1 MiB reads instead of the 8 KiB default
+
+
+def _iter_wallet_csv(file_path: str) -> Iterator[dict[str, str]]:
+    """
+    Stream wallet rows from a CSV file.
 
+    Header positions are resolved once; each row yields only the known columns
+    that the header declares, so memory stays flat however large the file is.
+    """
+    import csv
 
-def _parse_wallet_csv(file_path: str) -> list[dict[str, Any]]:
-    """Parse wallet CSV file. Returns list of row dicts."""
-    rows = []
-    with open(file_path, newline="") as f:
-        reader = csv.DictReader(f)
+    with open(file_path, newline="", buffering=_WALLET_CSV_BUFFER, encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        columns = [(name, header.index(name)) for name in _WALLET_CSV_FIELDS if name in header]
         for row in reader:
-            rows.append(dict(row))
-    return rows
+            if not row:
+                continue
+            yield {name: row[i] if i < len(row) else "" for name, i in columns}
 
 
 # ── Scan command ──────────────────────────────────────────────────────────────
@@ -265,7 +365,7 @@ def _parse_wallet_csv(file_path: str) -> list[dict[str, Any]]:
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["json", "jsonl", "table", "csv"]),
+    type=click.Choice(_FORMATS_ALL),
     default=None,
 )
 @click.option("--no-cache", is_flag=True)
@@ -285,21 +385,17 @@ def scan_command(
     fmt = fmt or ctx.obj.get("format", "json")
 
     if not chain and not wallet_addr and not include_all:
-        sys.stderr.write(
-            json.dumps(
-                {
-                    "error": "cli_error",
-                    "message": "Provide --chain, --wallet, or --all",
-                }
-            )
-            + "\n"
-        )
-        sys.exit(1)
+        _emit_error("cli_error", "Provide --chain, --wallet, or --all", 1)
 
     async def _run() -> dict[str, Any]:
-        from whalecli.alert import compute_scan_summary, process_alerts
+        from whalecli.alert import close_webhook_client, compute_scan_summary, process_alerts
         from whalecli.fetchers import get_fetcher
-        from whalecli.scorer import load_exchange_addresses, score_wallet
+        from whalecli.scorer import (
+            CORRELATION_MIN_PEERS,
+            apply_correlation,
+            load_exchange_addresses,
+            score_wallet,
+        )
 
         async with _db_from_config(config) as db:
             # Determine wallets to scan
@@ -332,45 +428,80 @@ def scan_command(
                     details={"chain": chain},
                 )
 
-            scan_time = datetime.now(tz=UTC).isoformat()
-            ts = datetime.now(tz=UTC).strftime("%Y%m%d_%H%M%S")
-            scan_id = f"scan_{ts}_{uuid.uuid4().hex[:4]}"
+            now = datetime.now(tz=UTC)
+            scan_time = now.isoformat()
+            scan_id = f"{_stamp_id('scan', now)}_{os.urandom(2).hex()}"
 
             # Score each wallet
             scored_wallets: list[dict[str, Any]] = []
+            score_rows: list[dict[str, Any]] = []
+
+            # Bucket wallets by chain in one pass (first-seen chain order)
+            by_chain: dict[str, list[dict[str, Any]]] = {}
+            for w in wallets:
+                by_chain.setdefault(w["chain"], []).append(w)
+
+            # One fetcher per chain, all sharing a single pooled HTTP client
+            wallet_txns: dict[tuple[str, str], Sequence[Any]] = {}
+            fetchers: dict[str, Any] = {}
+            exchange_by_chain: dict[str, frozenset[str]] = {}
+
+            http_client = _make_shared_client(config)
+            try:
+                for wchain in by_chain:
+                    try:
+                        fetchers[wchain] = get_fetcher(wchain, config, client=http_client)
+                        exchange_by_chain[wchain] = load_exchange_addresses(wchain)
+                    except ValueError:
+                        continue
+
+                async def _load_baselines() -> dict[str, dict[str, float]]:
+                    # 30d velocity baselines, one grouped query per chain
+                    return {
+                        wchain: await db.get_avg_abs_netflow(
+                            wchain, [w["address"] for w in by_chain[wchain]], days=30
+                        )
+                        for wchain in fetchers
+                    }
 
-            # Group by chain for efficient fetcher reuse
-            chains_present = list({w["chain"] for w in wallets})
-            wallet_txns: dict[str, list] = {}
+                fetchable = [w for w in wallets if w["chain"] in fetchers]
 
-            for wchain in chains_present:
-                chain_wallets = [w for w in wallets if w["chain"] == wchain]
+                async def _fetch_all() -> list[Any]:
+                    # One wide gather across every chain, bounded by the client's pool
+                    return await asyncio.gather(
+                        *[_fetch_wallet_txns(w, hours, fetchers[w["chain"]]) for w in fetchable],
+                        return_exceptions=True,
+                    )
+
+                # Baseline reads run on the DB thread while the requests are in flight
                 try:
-                    fetcher = get_fetcher(wchain, config)
-                    exchange_addrs = load_exchange_addresses(wchain)
-                except ValueError:
-                    continue
-
-                tasks = [_fetch_wallet_txns(w, hours, fetcher) for w in chain_wallets]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                for w, txn_result in zip(chain_wallets, results, strict=False):
-                    txns: list[Any]
-                    if isinstance(txn_result, (Exception, BaseException)):
-                        txns = []
-                    else:
-                        txns = txn_result or []
-                    wallet_txns[f"{w['address']}:{wchain}"] = txns
-
-                # First pass: compute raw scores (without correlation)
+                    async with asyncio.TaskGroup() as tg:
+                        baselines_task = tg.create_task(_load_baselines())
+                        fetch_task = tg.create_task(_fetch_all())
+                except ExceptionGroup as eg:
+                    # Fetch errors are collected per wallet, so this is a DB failure;
+                    # surface it bare so the usual WhalecliError handling applies
+                    raise eg.exceptions[0] from None
+                results = fetch_task.result()
+                baselines = baselines_task.result()
+            finally:
+                await http_client.aclose()
+
+            for w, txn_result in zip(fetchable, results, strict=True):
+                # Anything but a list (failure, None) scores as no activity
+                wallet_txns[(w["address"], w["chain"])] = (
+                    txn_result if isinstance(txn_result, list) else _EMPTY_TXNS
+                )
+
+            for wchain, exchange_addrs in exchange_by_chain.items():
+                chain_wallets = by_chain[wchain]
+                avg_flow_by_addr = baselines[wchain]
+
+                # First pass: every component except correlation, which needs all directions
                 raw_scores: dict[str, dict] = {}
                 for w in chain_wallets:
-                    key = f"{w['address']}:{wchain}"
-                    txns = wallet_txns.get(key, [])
-                    hist = await db.get_score_history(w["address"], wchain, days=30)
-                    avg_flow = sum(abs(h.get("net_flow_usd") or 0.0) for h in hist) / max(
-                        len(hist), 1
-                    )
+                    txns = wallet_txns.get((w["address"], wchain), _EMPTY_TXNS)
+                    avg_flow = avg_flow_by_addr.get(w["address"], 0.0)
                     scored = score_wallet(
                         address=w["address"],
                         chain=wchain,
@@ -384,63 +515,49 @@ def scan_command(
                     )
                     raw_scores[w["address"]] = scored
 
-                # Build directions map for correlation pass
-                directions_map = {
-                    addr: s.get("direction", "neutral") for addr, s in raw_scores.items()
-                }
-
-                # Second pass: rescore with correlation
-                for w in chain_wallets:
-                    key = f"{w['address']}:{wchain}"
-                    txns = wallet_txns.get(key, [])
-                    hist = await db.get_score_history(w["address"], wchain, days=30)
-                    avg_flow = sum(abs(h.get("net_flow_usd") or 0.0) for h in hist) / max(
-                        len(hist), 1
-                    )
-
-                    # Peer directions = all other wallets in same chain
-                    peer_directions = {
-                        addr: d for addr, d in directions_map.items() if addr != w["address"]
+                # Correlation is always 0 with fewer peers than the scorer requires
+                # (e.g. scan --wallet), so the first-pass scores are already final
+                if len(chain_wallets) > CORRELATION_MIN_PEERS:
+                    directions_map = {
+                        addr: s.get("direction", "neutral") for addr, s in raw_scores.items()
                     }
+                    # Second pass: peers = all other wallets in same chain (map skips self)
+                    for addr, s in raw_scores.items():
+                        apply_correlation(s, directions_map, exclude=addr)
 
-                    scored = score_wallet(
-                        address=w["address"],
-                        chain=wchain,
-                        transactions=txns,
-                        wallet_age_days=0,
-                        avg_30d_daily_flow_usd=avg_flow,
-                        exchange_addresses=exchange_addrs,
-                        all_wallet_directions=peer_directions,
-                        scan_hours=hours,
-                        label=w.get("label", ""),
-                    )
-
+                for scored in raw_scores.values():
                     # Apply score threshold filter
                     if threshold > 0 and scored["score"] < threshold:
                         scored_wallets.append(scored)
                         continue
 
-                    # Persist score snapshot
-                    await db.save_score(
+                    # Queue score snapshot; persisted in one batch after scoring
+                    address, s_chain, computed_at, total, net_flow_usd, direction = (
+                        _SNAPSHOT_FIELDS(scored)
+                    )
+                    score_rows.append(
                         {
-                            "address": scored["address"],
-                            "chain": scored["chain"],
-                            "computed_at": scored["computed_at"],
+                            "address": address,
+                            "chain": s_chain,
+                            "computed_at": computed_at,
                             "window_hours": hours,
-                            "total": scored["score"],
-                            "net_flow": scored["score_breakdown"]["net_flow"],
-                            "velocity": scored["score_breakdown"]["velocity"],
-                            "correlation": scored["score_breakdown"]["correlation"],
-                            "exchange_flow": scored["score_breakdown"]["exchange_flow"],
-                            "net_flow_usd": scored["net_flow_usd"],
-                            "direction": scored["direction"],
+                            "total": total,
+                            # net_flow / velocity / correlation / exchange_flow
+                            **scored["score_breakdown"],
+                            "net_flow_usd": net_flow_usd,
+                            "direction": direction,
                         }
                     )
 
                     scored_wallets.append(scored)
 
+            await db.save_scores_batch(score_rows)
+
             # Process alerts
-            alerts = await process_alerts(scored_wallets, db, config, scan_window_hours=hours)
+            try:
+                alerts = await process_alerts(scored_wallets, db, config, scan_window_hours=hours)
+            finally:
+                await close_webhook_client()
             summary = compute_scan_summary(scored_wallets, alerts)
 
             # Build scan result
@@ -462,8 +579,8 @@ def scan_command(
             }
 
     try:
-        result = asyncio.run(_run())
-        click.echo(format_output(result, fmt))
+        result = _run_async(_run())
+        _echo_result(result, fmt)
         if result.get("alerts_triggered", 0) > 0:
             sys.exit(0)
         else:
@@ -472,12 +589,30 @@ def scan_command(
         _output_error(e)
 
 
-async def _fetch_wallet_txns(wallet: dict[str, Any], hours: int, fetcher: Any) -> list:
-    """Fetch transactions for one wallet; return empty list on error."""
+def _make_shared_client(config: WhalecliConfig) -> httpx.AsyncClient:
+    """Pooled HTTP client shared by every chain fetcher for the duration of one scan."""
+    import httpx
+
+    return httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(
+            max_connections=config.api.max_connections,
+            max_keepalive_connections=config.api.max_connections,
+        ),
+    )
+
+
+# Shared read-only stand-in for "no transactions"; the scorer only iterates it
+_EMPTY_TXNS: tuple[Any, ...] = ()
+
+
+async def _fetch_wallet_txns(wallet: dict[str, Any], hours: int, fetcher: Any) -> Sequence[Any]:
+    """Fetch transactions for one wallet; return ``_EMPTY_TXNS`` on error."""
     try:
-        return await fetcher.get_transactions(wallet["address"], hours)
+        txns: Sequence[Any] = await fetcher.get_transactions(wallet["address"], hours)
     except Exception:
-        return []
+        return _EMPTY_TXNS
+    return txns
 
 
 # ── Alert commands ────────────────────────────────────────────────────────────
@@ -494,7 +629,7 @@ def alert_group() -> None:
 @click.option("--window", default="1h", help="Time window: 15m, 30m, 1h, 4h, 24h")
 @click.option("--chain", type=click.Choice(SUPPORTED_CHAINS), default=None)
 @click.option("--webhook", "webhook_url", default=None)
-@click.option("--format", "fmt", type=click.Choice(["json", "table"]), default=None)
+@click.option("--format", "fmt", type=click.Choice(_FORMATS_VIEW), default=None)
 @click.pass_context
 def alert_set(
     ctx: click.Context,
@@ -510,22 +645,12 @@ def alert_set(
     fmt = fmt or ctx.obj.get("format", "json")
 
     if threshold is None and score is None:
-        sys.stderr.write(
-            json.dumps(
-                {
-                    "error": "cli_error",
-                    "message": "Provide --threshold or --score",
-                }
-            )
-            + "\n"
-        )
-        sys.exit(1)
+        _emit_error("cli_error", "Provide --threshold or --score", 1)
 
     async def _run() -> None:
         async with _db_from_config(config) as db:
-            rule_id = await db.get_next_rule_id()
             rule: dict[str, Any] = {
-                "id": rule_id,
+                "id": None,  # assigned by save_alert_rule
                 "type": "score" if score is not None else "flow",
                 "value": float(
                     score if score is not None else (threshold if threshold is not None else 0)
@@ -536,19 +661,19 @@ def alert_set(
                 "created_at": datetime.now(tz=UTC).isoformat(),
                 "active": True,
             }
-            await db.save_alert_rule(rule)
+            rule = await db.save_alert_rule(rule)
             result = {"status": "alert_configured", "rule": rule}
-            click.echo(format_output(result, "json"))
+            _echo_result(result, "json")
 
     try:
-        asyncio.run(_run())
+        _run_async(_run())
     except WhalecliError as e:
         _output_error(e)
 
 
 @alert_group.command("list")
 @click.option("--limit", default=20, type=int)
-@click.option("--format", "fmt", type=click.Choice(["json", "table"]), default=None)
+@click.option("--format", "fmt", type=click.Choice(_FORMATS_VIEW), default=None)
 @click.pass_context
 def alert_list(ctx: click.Context, limit: int, fmt: str | None) -> None:
     """List alert rules and recent alert history."""
@@ -560,10 +685,10 @@ def alert_list(ctx: click.Context, limit: int, fmt: str | None) -> None:
             rules = await db.list_alert_rules()
             recent = await db.list_alerts(limit=limit)
             result = {"rules": rules, "recent_alerts": recent}
-            click.echo(format_output(result, fmt))
+            _echo_result(result, fmt)
 
     try:
-        asyncio.run(_run())
+        _run_async(_run())
     except WhalecliError as e:
         _output_error(e)
 
@@ -576,7 +701,7 @@ def alert_list(ctx: click.Context, limit: int, fmt: str | None) -> None:
 @click.option("--interval", default=60, type=int, show_default=True)
 @click.option("--threshold", default=70, type=click.IntRange(0, 100), show_default=True)
 @click.option("--hours", default=1, type=int, show_default=True)
-@click.option("--format", "fmt", type=click.Choice(["jsonl"]), default="jsonl")
+@click.option("--format", "fmt", type=click.Choice(_FORMATS_STREAM), default="jsonl")
 @click.pass_context
 def stream_command(
     ctx: click.Context,
@@ -608,7 +733,7 @@ def stream_command(
             )
 
     try:
-        asyncio.run(_run())
+        _run_async(_run())
         sys.exit(130)  # stream ended (normal exit via SIGINT/cancel)
     except KeyboardInterrupt:
         sys.exit(130)
@@ -627,7 +752,7 @@ def stream_command(
 @click.option(
     "--format",
     "fmt",
-    type=click.Choice(["json", "table", "csv"]),
+    type=click.Choice(_FORMATS_EXPORT),
     default=None,
 )
 @click.pass_context
@@ -644,19 +769,12 @@ def report_command(
     fmt = fmt or ctx.obj.get("format", "json")
 
     if not wallet_addr and not summary:
-        sys.stderr.write(
-            json.dumps(
-                {
-                    "error": "cli_error",
-                    "message": "Provide --wallet <address> or --summary",
-                }
-            )
-            + "\n"
-        )
-        sys.exit(1)
+        _emit_error("cli_error", "Provide --wallet <address> or --summary", 1)
 
     async def _run() -> dict[str, Any]:
-        generated_at = datetime.now(tz=UTC).isoformat()
+        # One clock read: report_id and generated_at describe the same instant
+        now = datetime.now(tz=UTC)
+        generated_at = now.isoformat()
 
         async with _db_from_config(config) as db:
             if summary:
@@ -666,11 +784,16 @@ def report_command(
                 total_alerts = 0
                 chain_counts: dict[str, int] = {}
 
+                # One grouped query for every wallet instead of a history fetch per wallet
+                aggregates = {
+                    (a["address"], a["chain"]): a
+                    for a in await db.get_summary_aggregates(days=days)
+                }
                 for w in wallets:
-                    history = await db.get_score_history(w["address"], w["chain"], days=days)
-                    net_flow = sum(h.get("net_flow_usd") or 0.0 for h in history)
-                    peak_score = max((h.get("total_score", 0) for h in history), default=0)
-                    alert_count = sum(1 for h in history if h.get("alert_triggered"))
+                    agg = aggregates.get((w["address"], w["chain"]))
+                    net_flow = agg["net_flow_usd"] if agg else 0.0
+                    peak_score = agg["peak_score"] if agg else 0
+                    alert_count = agg["alert_count"] if agg else 0
                     direction = (
                         "accumulating"
                         if net_flow > 0
@@ -699,7 +822,7 @@ def report_command(
                     "accumulating" if agg_net > 0 else "distributing" if agg_net < 0 else "neutral"
                 )
 
-                report_id = f"summary_{datetime.now(tz=UTC).strftime('%Y%m%d_%H%M%S')}"
+                report_id = _stamp_id("summary", now)
                 return {
                     "report_id": report_id,
                     "generated_at": generated_at,
@@ -752,7 +875,7 @@ def report_command(
                         }
                     )
 
-                report_id = f"report_{datetime.now(tz=UTC).strftime('%Y%m%d_%H%M%S')}"
+                report_id = _stamp_id("report", now)
                 return {
                     "report_id": report_id,
                     "generated_at": generated_at,
@@ -777,8 +900,8 @@ def report_command(
                 }
 
     try:
-        result = asyncio.run(_run())
-        click.echo(format_output(result, fmt))
+        result = _run_async(_run())
+        _echo_result(result, fmt)
     except WhalecliError as e:
         _output_error(e)
 
@@ -800,14 +923,12 @@ def config_init(ctx: click.Context, force: bool) -> None:
     config_path = Path(provided) if provided else get_default_config_path()
 
     if config_path.exists() and not force:
-        click.echo(
-            json.dumps(
-                {
-                    "status": "already_exists",
-                    "config_path": str(config_path),
-                    "hint": "Use --force to reinitialize",
-                }
-            )
+        _echo_status(
+            {
+                "status": "already_exists",
+                "config_path": str(config_path),
+                "hint": "Use --force to reinitialize",
+            }
         )
         return
 
@@ -831,7 +952,29 @@ def config_init(ctx: click.Context, force: bool) -> None:
     }
     if backup:
         result["backup"] = backup
-    click.echo(json.dumps(result))
+    _echo_status(result)
+
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in TRUTHY_VALUES:
+        return True
+    if lowered in FALSY_VALUES:
+        return False
+    raise ValueError(f"Expected a boolean (true/false, yes/no, on/off, 1/0), got {value!r}")
+
+
+# Config fields holding credentials: never echoed back unmasked
+_API_KEY_FIELDS = ("etherscan_api_key", "blockchain_info_api_key", "hyperliquid_api_key")
+_SECRET_FIELDS = frozenset({*_API_KEY_FIELDS, "webhook_secret", "api_token"})
+
+# Declared config field type → converter for `config set` values
+_CONFIG_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "bool": _parse_bool,
+    "int": int,
+    "float": float,
+    "str": str,
+}
 
 
 @config_group.command("set")
@@ -840,125 +983,62 @@ def config_init(ctx: click.Context, force: bool) -> None:
 @click.pass_context
 def config_set(ctx: click.Context, key: str, value: str) -> None:
     """Set a config value by dotted key path (e.g. api.etherscan_api_key)."""
+    from whalecli.output import mask_api_key
+
     config_path = ctx.obj.get("config_path")
     config: WhalecliConfig = ctx.obj["config"]
 
-    parts = key.split(".", 1)
-    if len(parts) != 2:
-        sys.stderr.write(
-            json.dumps(
-                {
-                    "error": "cli_error",
-                    "message": f"Key must be in form section.key, got: {key!r}",
-                }
-            )
-            + "\n"
-        )
-        sys.exit(1)
-
-    section_name, field_name = parts
-    section = getattr(config, section_name, None)
-    if section is None:
-        sys.stderr.write(
-            json.dumps(
-                {
-                    "error": "config_invalid",
-                    "message": f"Unknown config section: {section_name!r}",
-                }
-            )
-            + "\n"
-        )
-        sys.exit(5)
-
-    if not hasattr(section, field_name):
-        sys.stderr.write(
-            json.dumps(
-                {
-                    "error": "config_invalid",
-                    "message": f"Unknown config key: {key!r}",
-                }
-            )
-            + "\n"
-        )
-        sys.exit(5)
+    section_name, sep, field_name = key.partition(".")
+    if not sep or not field_name:
+        _emit_error("cli_error", f"Key must be in form section.key, got: {key!r}", 1)
+
+    field_types = SECTION_FIELD_TYPES.get(section_name)
+    if field_types is None:
+        _emit_error("config_invalid", f"Unknown config section: {section_name!r}", 5)
+    type_name = field_types.get(field_name)
+    if type_name is None:
+        _emit_error("config_invalid", f"Unknown config key: {key!r}", 5)
 
-    # Type-coerce
-    current = getattr(section, field_name)
+    # Type-coerce by declared type
+    convert = _CONFIG_CONVERTERS.get(type_name, str)
+    section = getattr(config, section_name)
     try:
-        if isinstance(current, bool):
-            typed_value: Any = value.lower() in ("1", "true", "yes")
-        elif isinstance(current, int):
-            typed_value = int(value)
-        elif isinstance(current, float):
-            typed_value = float(value)
-        else:
-            typed_value = value
+        typed_value = convert(value)
         setattr(section, field_name, typed_value)
     except (ValueError, TypeError) as e:
-        sys.stderr.write(json.dumps({"error": "config_invalid", "message": str(e)}) + "\n")
-        sys.exit(5)
+        _emit_error("config_invalid", str(e), 5)
 
     save_config(config, config_path)
 
-    # Mask API keys in response
-    display_value = (
-        mask_api_key(str(typed_value)) if "api_key" in field_name.lower() else typed_value
-    )
-    click.echo(json.dumps({"status": "updated", "key": key, "value": display_value}))
+    # Mask credentials in response
+    display_value = mask_api_key(typed_value) if field_name in _SECRET_FIELDS else typed_value
+    _echo_status({"status": "updated", "key": key, "value": display_value})
 
 
 @config_group.command("show")
-@click.option("--format", "fmt", type=click.Choice(["json", "table"]), default=None)
+@click.option("--format", "fmt", type=click.Choice(_FORMATS_VIEW), default=None)
 @click.pass_context
 def config_show(ctx: click.Context, fmt: str | None) -> None:
     """Show current configuration (API keys masked)."""
+    from whalecli.output import mask_api_key
+
     config: WhalecliConfig = ctx.obj["config"]
     config_path = get_default_config_path()
     fmt = fmt or ctx.obj.get("format", "json")
 
-    result = {
-        "config_path": str(config_path),
-        "api": {
-            "etherscan_api_key": mask_api_key(config.api.etherscan_api_key),
-            "blockchain_info_api_key": mask_api_key(config.api.blockchain_info_api_key),
-            "hyperliquid_api_key": mask_api_key(config.api.hyperliquid_api_key),
-        },
-        "alert": {
-            "score_threshold": config.alert.score_threshold,
-            "flow_threshold_usd": config.alert.flow_threshold_usd,
-            "window_minutes": config.alert.window_minutes,
-            "webhook_url": config.alert.webhook_url,
-        },
-        "database": {
-            "path": config.database.path,
-            "cache_ttl_hours": config.database.cache_ttl_hours,
-        },
-        "output": {
-            "default_format": config.output.default_format,
-            "timezone": config.output.timezone,
-            "color": config.output.color,
-        },
-        "cloud": {
-            "enabled": config.cloud.enabled,
-            "url": config.cloud.url,
-        },
-    }
+    result: dict[str, Any] = {"config_path": str(config_path), **dataclasses.asdict(config)}
+    api = result["api"]
+    for name in _API_KEY_FIELDS:
+        api[name] = mask_api_key(api[name])
+    # Secrets with no useful masked form are left out entirely
+    del result["alert"]["webhook_secret"]
+    del result["cloud"]["api_token"]
 
-    click.echo(format_output(result, "json"))
+    _echo_result(result, "table" if fmt == "table" else "json")
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 
-def _get_fetcher_safe(chain: str, config: WhalecliConfig) -> Any | None:
-    """Return fetcher for chain, or None if unavailable."""
-    try:
-        from whalecli.fetchers import get_fetcher
-
-        return get_fetcher(chain, config)
-    except (ValueError, ImportError):
-        return None
-
-
 if __name__ == "__main__":
     cli()
@@ -14,17 +14,21 @@ Usage:
 
 from __future__ import annotations
 
+import dataclasses
 import os
+import tomllib
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-
-import toml
+from typing import Any
 
 from whalecli.exceptions import ConfigInvalidError
 
 # Default config directory and file
 DEFAULT_CONFIG_DIR = Path.home() / ".whalecli"
 DEFAULT_CONFIG_PATH = DEFAULT_CONFIG_DIR / "config.toml"
+DEFAULT_DB_PATH = DEFAULT_CONFIG_DIR / "whale.db"
 
 # Environment variable → config key mapping
 # Format: (env_var_name, dotted_config_path, type_converter)
@@ -39,24 +43,38 @@ _ENV_OVERRIDES: list[tuple[str, str, type]] = [
     ("WHALECLI_CACHE_TTL_HOURS", "database.cache_ttl_hours", int),
     ("WHALECLI_OUTPUT_FORMAT", "output.default_format", str),
     ("WHALECLI_TIMEZONE", "output.timezone", str),
+    ("WHALECLI_STREAM_MAX_CONCURRENCY", "stream.max_concurrency", int),
     ("WHALECLI_CLOUD_URL", "cloud.url", str),
     ("WHALECLI_CLOUD_TOKEN", "cloud.api_token", str),
 ]
 
-VALID_FORMATS = {"json", "jsonl", "table", "csv"}
-VALID_CHAINS = {"ETH", "BTC", "HL"}
+# _ENV_OVERRIDES with each dotted path pre-split into (section, key), done once
+# at import rather than on every load_config
+_ENV_OVERRIDES_RESOLVED: tuple[tuple[str, str, str, type], ...] = tuple(
+    (env_var, section, key, converter)
+    for env_var, dotted_key, converter in _ENV_OVERRIDES
+    for section, key in (dotted_key.split(".", 1),)
+)
+
+# Accepted spellings for boolean settings given as strings (env vars, `config set`)
+TRUTHY_VALUES = frozenset({"1", "true", "yes", "on"})
+FALSY_VALUES = frozenset({"0", "false", "no", "off"})
 
+VALID_FORMATS = frozenset({"json", "jsonl", "table", "csv"})
+VALID_CHAINS = frozenset({"ETH", "BTC", "HL"})
 
-@dataclass
+
+@dataclass(slots=True)
 class APIConfig:
     """API key configuration."""
 
     etherscan_api_key: str = ""
     blockchain_info_api_key: str = ""
     hyperliquid_api_key: str = ""
+    max_connections: int = 32  # HTTP connection pool size shared by fetchers in a scan
 
 
-@dataclass
+@dataclass(slots=True)
 class AlertConfig:
     """Alert threshold and delivery configuration."""
 
@@ -67,15 +85,16 @@ class AlertConfig:
     webhook_secret: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseConfig:
     """SQLite database and caching configuration."""
 
-    path: str = str(DEFAULT_CONFIG_DIR / "whale.db")
+    path: str = str(DEFAULT_DB_PATH)
     cache_ttl_hours: int = 24
+    wal: bool = True  # WAL journal + synchronous=NORMAL; disable for network filesystems
 
 
-@dataclass
+@dataclass(slots=True)
 class OutputConfig:
     """Output formatting defaults."""
 
@@ -84,7 +103,14 @@ class OutputConfig:
     color: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
+class StreamConfig:
+    """Streaming poll loop configuration."""
+
+    max_concurrency: int = 16  # max wallets fetched in parallel per poll cycle
+
+
+@dataclass(slots=True)
 class CloudConfig:
     """Cloud backend configuration (Phase 2)."""
 
@@ -93,7 +119,7 @@ class CloudConfig:
     api_token: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class WhalecliConfig:
     """Full configuration object. Passed via Click context to all commands."""
 
@@ -101,9 +127,24 @@ class WhalecliConfig:
     alert: AlertConfig = field(default_factory=AlertConfig)
     database: DatabaseConfig = field(default_factory=DatabaseConfig)
     output: OutputConfig = field(default_factory=OutputConfig)
+    stream: StreamConfig = field(default_factory=StreamConfig)
     cloud: CloudConfig = field(default_factory=CloudConfig)
 
 
+def _section_field_types() -> dict[str, dict[str, str]]:
+    """Read section → field → declared type name from the config dataclasses."""
+    defaults = WhalecliConfig()
+    return {
+        f.name: {sf.name: str(sf.type) for sf in dataclasses.fields(getattr(defaults, f.name))}
+        for f in dataclasses.fields(defaults)
+    }
+
+
+# Section → field → declared type name ("str", "int", ...), resolved once so key
+# validation is two dict lookups
+SECTION_FIELD_TYPES = _section_field_types()
+
+
 def load_config(path: str | None = None) -> WhalecliConfig:
     """
     Load configuration from TOML file + environment variable overrides.
@@ -122,12 +163,14 @@ def load_config(path: str | None = None) -> WhalecliConfig:
     config_path = _resolve_config_path(path)
 
     raw: dict = {}
-    if config_path.exists():
-        try:
-            raw = toml.load(str(config_path))
-        except toml.TomlDecodeError as e:
-            raise ConfigInvalidError(f"Invalid TOML in {config_path}: {e}") from e
-
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
+        pass
+    else:
+        raw = _read_toml(str(config_path), st.st_mtime_ns, st.st_size)
+
+    # Always build a fresh config: callers mutate it, and env vars may change
     config = _dict_to_config(raw)
     _apply_env_overrides(config)
     _validate_config(config)
@@ -144,37 +187,24 @@ def save_config(config: WhalecliConfig, path: str | None = None) -> Path:
     config_path = _resolve_config_path(path)
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
-    data = {
-        "api": {
-            "etherscan_api_key": config.api.etherscan_api_key,
-            "blockchain_info_api_key": config.api.blockchain_info_api_key,
-            "hyperliquid_api_key": config.api.hyperliquid_api_key,
-        },
-        "alert": {
-            "score_threshold": config.alert.score_threshold,
-            "flow_threshold_usd": config.alert.flow_threshold_usd,
-            "window_minutes": config.alert.window_minutes,
-            "webhook_url": config.alert.webhook_url,
-            "webhook_secret": config.alert.webhook_secret,
-        },
-        "database": {
-            "path": config.database.path,
-            "cache_ttl_hours": config.database.cache_ttl_hours,
-        },
-        "output": {
-            "default_format": config.output.default_format,
-            "timezone": config.output.timezone,
-            "color": config.output.color,
-        },
-        "cloud": {
-            "enabled": config.cloud.enabled,
-            "url": config.cloud.url,
-            "api_token": config.cloud.api_token,
-        },
-    }
-
-    with open(config_path, "w") as f:
-        toml.dump(data, f)
+    data = dataclasses.asdict(config)
+
+    # Writer is only needed by config init/set, so keep it off the load path
+    import tomli_w
+
+    # Write the whole document to a sibling temp file in one call, then swap it in:
+    # an interrupted save leaves the previous config intact
+    payload = tomli_w.dumps(data).encode()
+    tmp_path = config_path.with_name(config_path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, config_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
     return config_path
 
@@ -198,35 +228,43 @@ def _resolve_config_path(path: str | None) -> Path:
     return DEFAULT_CONFIG_PATH
 
 
+@lru_cache(maxsize=8)
+def _read_toml(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """
+    Parse a TOML file; cached until the file's mtime or size changes.
+
+    The returned dict is shared between calls and must be treated as read-only.
+    """
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except tomllib.TOMLDecodeError as e:
+        raise ConfigInvalidError(f"Invalid TOML in {path}: {e}") from e
+
+
+# Declared type name → coercion for values read from TOML; str values pass through
+_TOML_COERCE: dict[str, Callable[[Any], Any]] = {"int": int, "float": float, "bool": bool}
+
+# SECTION_FIELD_TYPES compiled to (section, ((key, coerce | None), ...)) for loading
+_TOML_SCHEMA: tuple[tuple[str, tuple[tuple[str, Callable[[Any], Any] | None], ...]], ...] = tuple(
+    (section_name, tuple((key, _TOML_COERCE.get(type_name)) for key, type_name in fields.items()))
+    for section_name, fields in SECTION_FIELD_TYPES.items()
+)
+
+
 def _dict_to_config(raw: dict) -> WhalecliConfig:
     """Build WhalecliConfig from raw TOML dict, applying defaults for missing keys."""
-    config = WhalecliConfig()
-
-    api = raw.get("api", {})
-    config.api.etherscan_api_key = api.get("etherscan_api_key", "")
-    config.api.blockchain_info_api_key = api.get("blockchain_info_api_key", "")
-    config.api.hyperliquid_api_key = api.get("hyperliquid_api_key", "")
-
-    alert = raw.get("alert", {})
-    config.alert.score_threshold = int(alert.get("score_threshold", 70))
-    config.alert.flow_threshold_usd = float(alert.get("flow_threshold_usd", 1_000_000.0))
-    config.alert.window_minutes = int(alert.get("window_minutes", 60))
-    config.alert.webhook_url = alert.get("webhook_url", "")
-    config.alert.webhook_secret = alert.get("webhook_secret", "")
-
-    db = raw.get("database", {})
-    config.database.path = db.get("path", str(DEFAULT_CONFIG_DIR / "whale.db"))
-    config.database.cache_ttl_hours = int(db.get("cache_ttl_hours", 24))
-
-    output = raw.get("output", {})
-    config.output.default_format = output.get("default_format", "json")
-    config.output.timezone = output.get("timezone", "UTC")
-    config.output.color = bool(output.get("color", True))
-
-    cloud = raw.get("cloud", {})
-    config.cloud.enabled = bool(cloud.get("enabled", False))
-    config.cloud.url = cloud.get("url", "")
-    config.cloud.api_token = cloud.get("api_token", "")
+    config = WhalecliConfig()  # dataclass defaults cover every missing key
+
+    for section_name, fields in _TOML_SCHEMA:
+        values = raw.get(section_name)
+        if not values:
+            continue
+        section = getattr(config, section_name)
+        for key, coerce in fields:
+            if key in values:
+                value = values[key]
+                setattr(section, key, value if coerce is None else coerce(value))
 
     return config
 
@@ -236,20 +274,19 @@ def _apply_env_overrides(config: WhalecliConfig) -> None:
     # Handle WHALECLI_CLOUD_ENABLED separately (bool from string)
     cloud_enabled = os.environ.get("WHALECLI_CLOUD_ENABLED")
     if cloud_enabled is not None:
-        config.cloud.enabled = cloud_enabled.lower() in ("1", "true", "yes")
+        config.cloud.enabled = cloud_enabled.lower() in TRUTHY_VALUES
 
     # Handle WHALECLI_NO_COLOR
     if os.environ.get("WHALECLI_NO_COLOR"):
         config.output.color = False
 
-    for env_var, dotted_key, converter in _ENV_OVERRIDES:
-        val = os.environ.get(env_var)
+    environ = os.environ
+    for env_var, section, key, converter in _ENV_OVERRIDES_RESOLVED:
+        val = environ.get(env_var)
         if val is None:
             continue
-        section, key = dotted_key.split(".", 1)
-        section_obj = getattr(config, section)
         try:
-            setattr(section_obj, key, converter(val))
+            setattr(getattr(config, section), key, converter(val))
         except (ValueError, TypeError) as e:
             raise ConfigInvalidError(f"Invalid value for {env_var}={val!r}: {e}") from e
 
@@ -262,7 +299,7 @@ def _validate_config(config: WhalecliConfig) -> None:
         )
     if config.output.default_format not in VALID_FORMATS:
         raise ConfigInvalidError(
-            f"output.default_format must be one of {VALID_FORMATS}, "
+            f"output.default_format must be one of {sorted(VALID_FORMATS)}, "
             f"got {config.output.default_format!r}"
         )
     if config.alert.flow_threshold_usd < 0:
@@ -270,6 +307,14 @@ def _validate_config(config: WhalecliConfig) -> None:
             f"alert.flow_threshold_usd must be non-negative, "
             f"got {config.alert.flow_threshold_usd}"
         )
+    if config.api.max_connections < 1:
+        raise ConfigInvalidError(
+            f"api.max_connections must be >= 1, got {config.api.max_connections}"
+        )
+    if config.stream.max_concurrency < 1:
+        raise ConfigInvalidError(
+            f"stream.max_concurrency must be >= 1, got {config.stream.max_concurrency}"
+        )
 
 
 # ── Backward-compatibility aliases ────────────────────────────────────────────
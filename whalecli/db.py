@@ -1,7 +1,8 @@
 """SQLite state management for whalecli.
 
 Manages wallet registry, transaction cache, alert history, and alert rules.
-All database operations are async (aiosqlite).
+All database operations are async (aiosqlite); bulk transaction-cache writes run
+as whole batches on a blocking sqlite3 connection via asyncio.to_thread.
 
 Schema:
   - wallets: tracked whale wallet registry
@@ -14,18 +15,23 @@ Schema:
 
 from __future__ import annotations
 
-import json
+import asyncio
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable
 from datetime import UTC, datetime
+from itertools import groupby
 from pathlib import Path
 from typing import Any
 
 import aiosqlite
+import orjson
 
+from whalecli.config import DEFAULT_DB_PATH, VALID_CHAINS
 from whalecli.exceptions import DatabaseError, WalletExistsError, WalletNotFoundError
 
-DEFAULT_DB_PATH = Path.home() / ".whalecli" / "whale.db"
-
 # SQL schema — applied on connect if tables don't exist
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS schema_version (
@@ -44,6 +50,14 @@ CREATE TABLE IF NOT EXISTS wallets (
     UNIQUE(address, chain)
 );
 
+-- One row per (wallet, tag) so tag filters hit an index; wallets.tags keeps the
+-- JSON list for reads
+CREATE TABLE IF NOT EXISTS wallet_tags (
+    wallet_id    INTEGER NOT NULL REFERENCES wallets(id) ON DELETE CASCADE,
+    tag          TEXT NOT NULL,
+    PRIMARY KEY (wallet_id, tag)
+);
+
 CREATE TABLE IF NOT EXISTS transactions (
     id           INTEGER PRIMARY KEY AUTOINCREMENT,
     chain        TEXT NOT NULL,
@@ -58,6 +72,7 @@ CREATE TABLE IF NOT EXISTS transactions (
     token_symbol TEXT,
     token_addr   TEXT,
     fetched_at   TEXT NOT NULL,
+    fetched_at_epoch REAL,    -- fetched_at as unix seconds, for cutoff comparisons
     UNIQUE(chain, tx_hash)
 );
 
@@ -86,6 +101,7 @@ CREATE TABLE IF NOT EXISTS alerts (
     direction      TEXT NOT NULL,
     net_flow_usd   REAL NOT NULL DEFAULT 0,
     triggered_at   TEXT NOT NULL,
+    triggered_at_epoch REAL,  -- triggered_at as unix seconds, for window checks
     rule_id        TEXT NOT NULL DEFAULT '',
     webhook_sent   INTEGER NOT NULL DEFAULT 0,
     webhook_status INTEGER
@@ -110,14 +126,276 @@ CREATE TABLE IF NOT EXISTS api_cache (
 );
 
 CREATE INDEX IF NOT EXISTS idx_wallets_chain ON wallets(chain);
+CREATE INDEX IF NOT EXISTS idx_wallet_tags_tag ON wallet_tags(tag);
 CREATE INDEX IF NOT EXISTS idx_transactions_chain_ts ON transactions(chain, timestamp);
-CREATE INDEX IF NOT EXISTS idx_transactions_from ON transactions(from_addr);
-CREATE INDEX IF NOT EXISTS idx_transactions_to ON transactions(to_addr);
+-- Per-side (chain, address, timestamp) indexes: each branch of the cache lookup
+-- resolves equality + time range in one descent. They supersede the old
+-- single-column address indexes, dropped here on existing databases.
+CREATE INDEX IF NOT EXISTS idx_tx_chain_from_ts ON transactions(chain, from_addr, timestamp);
+CREATE INDEX IF NOT EXISTS idx_tx_chain_to_ts ON transactions(chain, to_addr, timestamp);
+DROP INDEX IF EXISTS idx_transactions_from;
+DROP INDEX IF EXISTS idx_transactions_to;
 CREATE INDEX IF NOT EXISTS idx_scores_addr ON scores(address, chain);
 CREATE INDEX IF NOT EXISTS idx_alerts_triggered ON alerts(triggered_at);
 """
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 3
+
+# Indexes on columns added by a migration; created once the columns exist
+_POST_MIGRATION_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_alerts_addr_epoch
+    ON alerts(address, chain, triggered_at_epoch);
+"""
+
+# v2 → v3: numeric (unix seconds) copies of the ISO timestamps that cutoffs
+# compare against, as (table, new column, ALTER, julianday() backfill)
+_MIGRATE_V3 = (
+    (
+        "transactions",
+        "fetched_at_epoch",
+        "ALTER TABLE transactions ADD COLUMN fetched_at_epoch REAL",
+        "UPDATE transactions SET fetched_at_epoch = (julianday(fetched_at) - 2440587.5) * 86400.0"
+        " WHERE fetched_at_epoch IS NULL",
+    ),
+    (
+        "alerts",
+        "triggered_at_epoch",
+        "ALTER TABLE alerts ADD COLUMN triggered_at_epoch REAL",
+        "UPDATE alerts SET triggered_at_epoch = (julianday(triggered_at) - 2440587.5) * 86400.0"
+        " WHERE triggered_at_epoch IS NULL",
+    ),
+)
+
+# Wallets carrying any of the given tags; resolved through idx_wallet_tags_tag
+_TAG_FILTER_SQL = "id IN (SELECT wallet_id FROM wallet_tags WHERE tag IN ({placeholders}))"
+
+# Transaction-cache read in one round trip: a freshness flag (any row for the
+# wallet fetched after the TTL cutoff) on every row of the time-range slice. The
+# (from_addr = ? OR to_addr = ?) match is split into UNION ALL branches so each
+# side uses its own (chain, addr, timestamp) index, and the to_addr branch skips
+# self-transfers already returned by the from_addr branch. The LEFT JOIN against
+# a constant row keeps one all-NULL row when the range is empty, so the flag
+# always comes back.
+_TX_CACHE_READ_SQL = """
+    SELECT
+        EXISTS (
+            SELECT 1 FROM transactions
+            WHERE chain = ? AND from_addr = ? AND fetched_at_epoch > ?
+            UNION ALL
+            SELECT 1 FROM transactions
+            WHERE chain = ? AND to_addr = ? AND fetched_at_epoch > ?
+        ) AS fresh,
+        r.id, r.chain, r.tx_hash, r.block_num, r.timestamp, r.from_addr, r.to_addr,
+        r.value_native, r.value_usd, r.gas_usd, r.token_symbol, r.token_addr, r.fetched_at
+    FROM (SELECT 1) AS one
+    LEFT JOIN (
+        SELECT * FROM transactions
+        WHERE chain = ? AND from_addr = ? AND timestamp >= ? AND timestamp <= ?
+        UNION ALL
+        SELECT * FROM transactions
+        WHERE chain = ? AND to_addr = ? AND from_addr != ? AND timestamp >= ? AND timestamp <= ?
+    ) AS r ON 1
+    ORDER BY r.timestamp DESC
+"""
+
+# One past the highest numbered rule_NNN id: unlike COUNT(*) + 1 it never hands
+# out an id that is already taken when the numbering has gaps
+_NEXT_RULE_NUM_SQL = """
+    SELECT COALESCE(MAX(CAST(substr(id, 6) AS INTEGER)), 0) + 1
+    FROM alert_rules WHERE id GLOB 'rule_[0-9]*'
+"""
+
+_INSERT_RULE_SQL = """
+    INSERT OR REPLACE INTO alert_rules
+    (id, type, value, window, chain, webhook_url, created_at, active)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Same numbering as _NEXT_RULE_NUM_SQL, evaluated inside the INSERT so the id
+# is claimed in the statement that reads it
+_INSERT_RULE_NEXT_ID_SQL = """
+    INSERT INTO alert_rules
+    (id, type, value, window, chain, webhook_url, created_at, active)
+    VALUES (
+        printf('rule_%03d', (
+            SELECT COALESCE(MAX(CAST(substr(id, 6) AS INTEGER)), 0) + 1
+            FROM alert_rules WHERE id GLOB 'rule_[0-9]*'
+        )),
+        ?, ?, ?, ?, ?, ?, ?
+    )
+    RETURNING id
+"""
+
+_IMPORT_WALLET_SQL = """
+    INSERT INTO wallets (address, chain, label, tags, added_at, active)
+    VALUES (?, ?, ?, ?, ?, 1)
+    ON CONFLICT(address, chain) DO NOTHING
+"""
+
+_INSERT_WALLET_TAG_SQL = "INSERT OR IGNORE INTO wallet_tags (wallet_id, tag) VALUES (?, ?)"
+
+# v1 → v2: fill wallet_tags from the JSON tag lists of existing wallets
+_BACKFILL_WALLET_TAGS_SQL = """
+    INSERT OR IGNORE INTO wallet_tags (wallet_id, tag)
+    SELECT w.id, j.value FROM wallets w, json_each(w.tags) j WHERE j.type = 'text'
+"""
+
+# Max addresses per `IN (...)` clause — stays under SQLite's bound-variable limit.
+_SQL_IN_CHUNK = 500
+
+# sqlite3 keeps this many compiled statements per connection, keyed by SQL text.
+# Hot-path SQL lives in the module-level *_SQL constants below so every call
+# passes the same text and reuses the prepared statement instead of recompiling.
+_STATEMENT_CACHE_SIZE = 256
+
+# Seconds a writer waits on a lock held by another process (e.g. `stream` while a
+# `scan` runs) before SQLITE_BUSY; sqlite3 maps this onto busy_timeout.
+_BUSY_TIMEOUT_S = 5.0
+
+# Fresh api_cache entries kept in memory per Database, most recently used last
+_MEM_CACHE_SIZE = 1024
+
+# Rows per commit in import_wallets — bounds the open transaction on large imports.
+_IMPORT_CHUNK = 1000
+
+_AVG_ABS_NETFLOW_SQL = """
+    SELECT address, SUM(ABS(COALESCE(net_flow_usd, 0))) / COUNT(*) AS avg_flow
+    FROM scores
+    WHERE chain = ? AND address IN ({placeholders})
+    AND computed_at >= ?
+    GROUP BY address
+"""
+
+_INSERT_SCORE_SQL = """
+INSERT INTO scores
+(address, chain, computed_at, window_hours, total_score,
+ net_flow, velocity, correlation, exchange_flow,
+ net_flow_usd, direction, alert_triggered)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_ALERT_SQL = """
+INSERT INTO alerts
+(address, chain, label, score, direction, net_flow_usd,
+ triggered_at, rule_id, webhook_sent, webhook_status, triggered_at_epoch)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, (julianday(?) - 2440587.5) * 86400.0)
+"""
+
+# Explicit column lists: rows carry only what callers read, and columns added
+# for internal use (indexes, epochs) never leak into command output
+_SELECT_WALLETS_SQL = (
+    "SELECT id, address, chain, label, tags, added_at, first_seen, active FROM wallets"
+)
+
+_SELECT_SCORES_SQL = """
+    SELECT id, address, chain, computed_at, window_hours, total_score, net_flow,
+           velocity, correlation, exchange_flow, net_flow_usd, direction, alert_triggered
+    FROM scores
+    WHERE address = ? AND chain = ? AND computed_at >= ?
+    ORDER BY computed_at DESC
+"""
+
+_SELECT_ACTIVE_RULES_SQL = """
+    SELECT id, type, value, window, chain, webhook_url, created_at, active
+    FROM alert_rules WHERE active = 1 ORDER BY created_at DESC
+"""
+
+# list_alerts selects every column but the internal triggered_at_epoch
+_LIST_ALERTS_SQL = """
+    SELECT id, address, chain, label, score, direction, net_flow_usd,
+           triggered_at, rule_id, webhook_sent, webhook_status
+    FROM alerts"""
+
+_CACHE_GET_SQL = "SELECT response, fetched_at, ttl_seconds FROM api_cache WHERE cache_key = ?"
+
+_CACHE_SET_SQL = """
+INSERT OR REPLACE INTO api_cache (cache_key, response, fetched_at, ttl_seconds)
+VALUES (?, ?, ?, ?)
+"""
+
+_UPSERT_TX_SQL = """
+INSERT OR REPLACE INTO transactions
+(chain, tx_hash, block_num, timestamp, from_addr, to_addr,
+ value_native, value_usd, gas_usd, token_symbol, token_addr, fetched_at, fetched_at_epoch)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Keys whose columns are NOT NULL; a row carrying None for any of them is skipped
+_TX_REQUIRED = ("chain", "tx_hash", "timestamp", "from_addr", "to_addr")
+
+
+def _settle(fut: asyncio.Future[None], exc: BaseException | None = None) -> None:
+    """Resolve a queued write's future unless its caller already gave up on it."""
+    if fut.done():
+        return
+    if exc is None:
+        fut.set_result(None)
+    else:
+        fut.set_exception(exc)
+
+
+def _wallet_from_row(row: aiosqlite.Row) -> dict[str, Any]:
+    """Decode a wallets row; untagged wallets (the common case) skip the JSON parse."""
+    w = dict(row)
+    tags = w.get("tags")
+    w["tags"] = orjson.loads(tags) if tags and tags != "[]" else []
+    w["active"] = bool(w["active"])
+    return w
+
+
+def _tx_params(tx: dict[str, Any], fetched_at: str, fetched_at_epoch: float) -> tuple[Any, ...]:
+    """Bind parameters for _UPSERT_TX_SQL."""
+    return (
+        tx.get("chain", ""),
+        tx.get("tx_hash", ""),
+        tx.get("block_num"),
+        tx.get("timestamp", ""),
+        tx.get("from_addr", ""),
+        tx.get("to_addr", ""),
+        str(tx.get("value_native", 0)),
+        tx.get("value_usd"),
+        tx.get("gas_usd"),
+        tx.get("token_symbol"),
+        tx.get("token_addr"),
+        fetched_at,
+        fetched_at_epoch,
+    )
+
+
+def _score_params(score_data: dict[str, Any]) -> tuple[Any, ...]:
+    """Bind parameters for _INSERT_SCORE_SQL."""
+    return (
+        score_data.get("address", ""),
+        score_data.get("chain", ""),
+        score_data.get("computed_at", ""),
+        score_data.get("window_hours", 24),
+        score_data.get("total", 0),
+        score_data.get("net_flow", 0),
+        score_data.get("velocity", 0),
+        score_data.get("correlation", 0),
+        score_data.get("exchange_flow", 0),
+        score_data.get("net_flow_usd", 0.0),
+        score_data.get("direction", "neutral"),
+        1 if score_data.get("alert_triggered") else 0,
+    )
+
+
+def _alert_params(alert_data: dict[str, Any]) -> tuple[Any, ...]:
+    """Bind parameters for _INSERT_ALERT_SQL."""
+    triggered_at = alert_data.get("triggered_at") or datetime.now(tz=UTC).isoformat()
+    return (
+        alert_data.get("address", ""),
+        alert_data.get("chain", ""),
+        alert_data.get("label", ""),
+        alert_data.get("score", 0),
+        alert_data.get("direction", "neutral"),
+        alert_data.get("net_flow_usd", 0.0),
+        triggered_at,
+        alert_data.get("rule_id", ""),
+        1 if alert_data.get("webhook_sent") else 0,
+        alert_data.get("webhook_status"),
+        triggered_at,
+    )
 
 
 class Database:
@@ -135,9 +413,26 @@ class Database:
             ...
     """
 
-    def __init__(self, db_path: str = str(DEFAULT_DB_PATH)) -> None:
+    def __init__(self, db_path: str = str(DEFAULT_DB_PATH), wal: bool = True) -> None:
         self.db_path = db_path
+        self.wal = wal
         self._conn: aiosqlite.Connection | None = None
+        # Serialises writers sharing this connection: concurrent scan/alert/cache
+        # coroutines would otherwise interleave statements inside each other's
+        # BEGIN ... COMMIT. Reads stay lock-free.
+        self._write_lock = asyncio.Lock()
+        # Single-statement writes waiting for the next group commit (see _write)
+        self._pending: list[tuple[str, tuple[Any, ...], asyncio.Future[None]]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        # In-memory front for api_cache: key → (expires_at, response), LRU-ordered,
+        # plus the SQLite read in flight per key so concurrent misses share one
+        self._mem_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._cache_loads: dict[str, asyncio.Task[tuple[float, str] | None]] = {}
+        # Blocking connection for bulk writes, run a whole batch per thread hop (file
+        # databases only: a second ":memory:" connection would be a separate DB).
+        # The thread lock outlives _write_lock when a caller is cancelled mid-batch.
+        self._sync_conn: sqlite3.Connection | None = None
+        self._sync_lock = threading.Lock()
 
     async def connect(self) -> None:
         """Open DB connection and run schema migrations."""
@@ -145,19 +440,53 @@ class Database:
             Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            self._conn = await aiosqlite.connect(self.db_path)
+            self._conn = await aiosqlite.connect(
+                self.db_path, timeout=_BUSY_TIMEOUT_S, cached_statements=_STATEMENT_CACHE_SIZE
+            )
             self._conn.row_factory = aiosqlite.Row
-            await self._conn.execute("PRAGMA journal_mode=WAL")
+            # Only takes effect on a brand-new file, so it must run before the WAL
+            # switch writes the header; existing databases keep their page size.
+            await self._conn.execute("PRAGMA page_size=8192")
+            if self.wal:
+                # WAL appends instead of rewriting pages, so readers never block the
+                # scan writer, and NORMAL drops the per-commit fsync of the main file.
+                await self._conn.execute("PRAGMA journal_mode=WAL")
+                await self._conn.execute("PRAGMA synchronous=NORMAL")
+                await self._conn.execute("PRAGMA wal_autocheckpoint=1000")
             await self._conn.execute("PRAGMA foreign_keys=ON")
+            await self._conn.execute("PRAGMA temp_store=MEMORY")
+            await self._conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+            await self._conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
             await self._apply_schema()
+            if self.db_path != ":memory:":
+                self._sync_conn = sqlite3.connect(
+                    self.db_path,
+                    timeout=_BUSY_TIMEOUT_S,
+                    isolation_level=None,
+                    check_same_thread=False,
+                )
+                # Per-connection settings; the rest live in the database file
+                self._sync_conn.execute("PRAGMA synchronous=NORMAL")
+                self._sync_conn.execute("PRAGMA foreign_keys=ON")
         except Exception as e:
+            # Close the half-open connection so its worker thread does not linger
+            await self.close()
             raise DatabaseError(f"Failed to connect to database: {e}") from e
 
     async def close(self) -> None:
-        """Close the database connection."""
-        if self._conn:
-            await self._conn.close()
-            self._conn = None
+        """Close the database connection, after any queued writes have committed."""
+        while self._flush_task is not None:
+            await self._flush_task
+        # A flush that already took its batch has cleared _flush_task but holds the
+        # write lock until it commits, so close under the lock
+        async with self._write_lock:
+            if self._conn:
+                await self._conn.close()
+                self._conn = None
+            if self._sync_conn:
+                with self._sync_lock:
+                    self._sync_conn.close()
+                self._sync_conn = None
 
     async def __aenter__(self) -> Database:
         await self.connect()
@@ -185,26 +514,33 @@ class Database:
         """
         assert self._conn is not None
         chain = chain.upper()
-        tags_json = json.dumps(tags or [])
+        tags_json = orjson.dumps(tags or []).decode()
         added_at = datetime.now(tz=UTC).isoformat()
 
-        try:
-            async with self._conn.execute(
-                """
-                INSERT INTO wallets (address, chain, label, tags, added_at, active)
-                VALUES (?, ?, ?, ?, ?, 1)
-                """,
-                (address, chain, label, tags_json, added_at),
-            ) as cursor:
-                row_id = cursor.lastrowid
-            await self._conn.commit()
-        except aiosqlite.IntegrityError as e:
-            if "UNIQUE constraint failed" in str(e):
-                raise WalletExistsError(
-                    f"Address {address[:8]}...{address[-5:]} on {chain} is already tracked",
-                    details={"address": address, "chain": chain},
-                ) from e
-            raise DatabaseError(f"Failed to add wallet: {e}") from e
+        async with self._write_lock:
+            try:
+                async with self._conn.execute(
+                    """
+                    INSERT INTO wallets (address, chain, label, tags, added_at, active)
+                    VALUES (?, ?, ?, ?, ?, 1)
+                    """,
+                    (address, chain, label, tags_json, added_at),
+                ) as cursor:
+                    row_id = cursor.lastrowid
+                if tags:
+                    await self._conn.executemany(
+                        _INSERT_WALLET_TAG_SQL, [(row_id, t) for t in tags]
+                    )
+                await self._conn.commit()
+            except aiosqlite.Error as e:
+                # Roll back under the lock so no implicit transaction outlives the error
+                await self._conn.rollback()
+                if isinstance(e, aiosqlite.IntegrityError) and "UNIQUE constraint failed" in str(e):
+                    raise WalletExistsError(
+                        f"Address {address[:8]}...{address[-5:]} on {chain} is already tracked",
+                        details={"address": address, "chain": chain},
+                    ) from e
+                raise DatabaseError(f"Failed to add wallet: {e}") from e
 
         return {
             "id": row_id,
@@ -224,9 +560,18 @@ class Database:
         active_only: bool = True,
     ) -> list[dict[str, Any]]:
         """List tracked wallets with optional filters."""
+        return [w async for w in self.iter_wallets(chain, tags, active_only)]
+
+    async def iter_wallets(
+        self,
+        chain: str | None = None,
+        tags: list[str] | None = None,
+        active_only: bool = True,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield tracked wallets one row at a time; same filters as list_wallets."""
         assert self._conn is not None
 
-        query = "SELECT * FROM wallets"
+        query = _SELECT_WALLETS_SQL
         params: list[Any] = []
         conditions: list[str] = []
 
@@ -235,24 +580,17 @@ class Database:
         if chain:
             conditions.append("chain = ?")
             params.append(chain.upper())
+        if tags:
+            conditions.append(_TAG_FILTER_SQL.format(placeholders=",".join("?" * len(tags))))
+            params.extend(tags)
 
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         query += " ORDER BY added_at DESC"
 
-        wallets = []
         async with self._conn.execute(query, params) as cursor:
             async for row in cursor:
-                w = dict(row)
-                w["tags"] = json.loads(w.get("tags") or "[]")
-                w["active"] = bool(w["active"])
-                wallets.append(w)
-
-        # Filter by tags in Python (SQLite JSON support is limited)
-        if tags:
-            wallets = [w for w in wallets if any(t in w["tags"] for t in tags)]
-
-        return wallets
+                yield _wallet_from_row(row)
 
     async def get_wallet(self, address: str, chain: str | None = None) -> dict[str, Any]:
         """
@@ -262,7 +600,7 @@ class Database:
         """
         assert self._conn is not None
 
-        query = "SELECT * FROM wallets WHERE address = ? AND active = 1"
+        query = _SELECT_WALLETS_SQL + " WHERE address = ? AND active = 1"
         params: list[Any] = [address]
         if chain:
             query += " AND chain = ?"
@@ -277,10 +615,7 @@ class Database:
                 details={"address": address, "chain": chain},
             )
 
-        w = dict(row)
-        w["tags"] = json.loads(w.get("tags") or "[]")
-        w["active"] = bool(w["active"])
-        return w
+        return _wallet_from_row(row)
 
     async def remove_wallet(self, address: str, chain: str, purge: bool = False) -> dict[str, Any]:
         """
@@ -293,25 +628,31 @@ class Database:
         # Check it exists
         await self.get_wallet(address, chain)
 
-        if purge:
-            # Delete all cached transactions for this wallet
-            async with self._conn.execute(
-                "DELETE FROM transactions WHERE (from_addr = ? OR to_addr = ?) AND chain = ?",
-                (address.lower(), address.lower(), chain.upper()),
-            ) as cursor:
-                tx_deleted = cursor.rowcount
-            await self._conn.execute(
-                "DELETE FROM wallets WHERE address = ? AND chain = ?",
-                (address, chain.upper()),
-            )
-        else:
-            tx_deleted = 0
-            await self._conn.execute(
-                "UPDATE wallets SET active = 0 WHERE address = ? AND chain = ?",
-                (address, chain.upper()),
-            )
-
-        await self._conn.commit()
+        async with self._write_lock:
+            try:
+                if purge:
+                    # Delete all cached transactions for this wallet
+                    async with self._conn.execute(
+                        "DELETE FROM transactions"
+                        " WHERE (from_addr = ? OR to_addr = ?) AND chain = ?",
+                        (address.lower(), address.lower(), chain.upper()),
+                    ) as cursor:
+                        tx_deleted = cursor.rowcount
+                    await self._conn.execute(
+                        "DELETE FROM wallets WHERE address = ? AND chain = ?",
+                        (address, chain.upper()),
+                    )
+                else:
+                    tx_deleted = 0
+                    await self._conn.execute(
+                        "UPDATE wallets SET active = 0 WHERE address = ? AND chain = ?",
+                        (address, chain.upper()),
+                    )
+
+                await self._conn.commit()
+            except aiosqlite.Error as e:
+                await self._conn.rollback()
+                raise DatabaseError(f"Failed to remove wallet: {e}") from e
         result: dict[str, Any] = {
             "status": "removed",
             "address": address,
@@ -323,50 +664,101 @@ class Database:
 
     async def update_wallet_first_seen(self, address: str, chain: str, first_seen: str) -> None:
         """Update the first_seen timestamp for a wallet."""
-        assert self._conn is not None
-        await self._conn.execute(
+        await self._write(
             "UPDATE wallets SET first_seen = ? WHERE address = ? AND chain = ?",
             (first_seen, address, chain.upper()),
         )
-        await self._conn.commit()
 
     async def import_wallets(
-        self, wallets_data: list[dict[str, Any]], dry_run: bool = False
+        self, wallets_data: Iterable[dict[str, Any]], dry_run: bool = False
     ) -> dict[str, Any]:
         """
-        Bulk import wallets from a list of dicts.
+        Bulk import wallets from an iterable of dicts.
+
+        Rows are consumed lazily, so a streaming CSV reader is never materialised,
+        and written _IMPORT_CHUNK at a time with one executemany and one commit per
+        chunk. A chunk the database rejects is rolled back on its own and reported
+        in errors; chunks before and after it still import. A dry run performs the
+        same inserts in one transaction and rolls them back, so duplicates are
+        counted exactly.
 
         Returns summary: {imported, skipped, errors, wallets}
         """
         imported = 0
         skipped = 0
         errors: list[str] = []
-        added_wallets = []
-
-        for item in wallets_data:
-            address = item.get("address", "")
-            chain = item.get("chain", "")
-            label = item.get("label", "")
-            tags_raw = item.get("tags", "")
-            tags = [t.strip() for t in str(tags_raw).split(",") if t.strip()] if tags_raw else []
-
-            if not address or not chain:
-                errors.append(f"Missing address or chain: {item}")
-                continue
-
-            if dry_run:
-                # Just count it
-                imported += 1
-                continue
+        added_wallets: list[dict[str, Any]] = []
+        batch: list[tuple[str, str, str, list[str]]] = []
 
+        async def flush() -> None:
+            nonlocal imported, skipped
+            assert self._conn is not None
+            try:
+                if not dry_run:
+                    # IMMEDIATE takes the write lock up front, so no other process can
+                    # insert between reading the highest id and the chunk's inserts
+                    await self._conn.execute("BEGIN IMMEDIATE")
+                await self._conn.execute("SAVEPOINT import_chunk")
+                added = await self._import_chunk(batch)
+                await self._conn.execute("RELEASE import_chunk")
+                if not dry_run:
+                    await self._conn.commit()
+            except aiosqlite.Error as e:
+                # Only this chunk is lost: earlier ones are committed, or still
+                # pending in the dry run's transaction
+                if dry_run:
+                    await self._conn.execute("ROLLBACK TO import_chunk")
+                else:
+                    await self._conn.rollback()
+                errors.append(
+                    f"Failed to import {len(batch)} wallets "
+                    f"({batch[0][0]} .. {batch[-1][0]}): {e}"
+                )
+            else:
+                imported += len(added)
+                skipped += len(batch) - len(added)
+                if not dry_run:
+                    added_wallets.extend(added)
+            batch.clear()
+
+        # Held for the whole import so other writers never land inside a chunk
+        async with self._write_lock:
+            assert self._conn is not None
             try:
-                w = await self.add_wallet(address, chain, label, tags)
-                imported += 1
-                added_wallets.append(w)
-            except WalletExistsError:
-                skipped += 1
-            except Exception as e:
-                errors.append(str(e))
+                if self._conn.in_transaction:
+                    # Writers hold _write_lock, so this is a stale transaction; BEGIN
+                    # IMMEDIATE must start fresh for the MAX(id) pairing to hold
+                    await self._conn.rollback()
+                if dry_run:
+                    await self._conn.execute("BEGIN IMMEDIATE")
+                for item in wallets_data:
+                    address = item.get("address", "")
+                    chain = (item.get("chain") or "").upper()
+                    tags_raw = item.get("tags", "")
+                    tags = (
+                        [t.strip() for t in str(tags_raw).split(",") if t.strip()]
+                        if tags_raw
+                        else []
+                    )
+
+                    if not address or not chain:
+                        errors.append(f"Missing address or chain: {item}")
+                        continue
+                    if chain not in VALID_CHAINS:
+                        errors.append(f"Unsupported chain {chain!r}: {item}")
+                        continue
+
+                    batch.append((address, chain, item.get("label") or "", tags))
+                    if len(batch) >= _IMPORT_CHUNK:
+                        await flush()
+                if batch:
+                    await flush()
+            except aiosqlite.Error as e:
+                raise DatabaseError(f"Failed to import wallets: {e}") from e
+            finally:
+                # Ends the dry run's transaction, or a chunk cut short by a bad row source
+                if self._conn.in_transaction:
+                    await self._conn.rollback()
 
         if dry_run:
             return {
@@ -382,50 +774,106 @@ class Database:
             "wallets": added_wallets,
         }
 
+    async def _import_chunk(
+        self, batch: list[tuple[str, str, str, list[str]]]
+    ) -> list[dict[str, Any]]:
+        """
+        Insert one import chunk, skipping existing wallets.
+
+        The caller holds a BEGIN IMMEDIATE transaction and commits. Returns the
+        wallets actually inserted, in input order.
+        """
+        assert self._conn is not None
+        async with self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM wallets") as cursor:
+            row = await cursor.fetchone()
+        assert row is not None  # aggregate query always yields a row
+        last_id = row[0]
+
+        added_at = datetime.now(tz=UTC).isoformat()
+        await self._conn.executemany(
+            _IMPORT_WALLET_SQL,
+            [
+                (address, chain, label, orjson.dumps(tags).decode(), added_at)
+                for address, chain, label, tags in batch
+            ],
+        )
+        # AUTOINCREMENT ids only grow, so everything past last_id is this chunk
+        async with self._conn.execute(
+            "SELECT id, address, chain FROM wallets WHERE id > ?", (last_id,)
+        ) as cursor:
+            new_ids = {(row["address"], row["chain"]): row["id"] async for row in cursor}
+
+        added: list[dict[str, Any]] = []
+        for address, chain, label, tags in batch:
+            # pop: a repeat of the same wallet later in the chunk was the skipped one
+            row_id = new_ids.pop((address, chain), None)
+            if row_id is None:
+                continue
+            added.append(
+                {
+                    "id": row_id,
+                    "address": address,
+                    "chain": chain,
+                    "label": label,
+                    "tags": tags,
+                    "added_at": added_at,
+                    "first_seen": None,
+                    "active": True,
+                }
+            )
+        tag_rows = [(w["id"], t) for w in added for t in w["tags"]]
+        if tag_rows:
+            await self._conn.executemany(_INSERT_WALLET_TAG_SQL, tag_rows)
+        return added
+
     # ──────────────────────────────────────────────────────────
     # Transaction cache
     # ──────────────────────────────────────────────────────────
 
     async def upsert_transactions(self, transactions: list[dict[str, Any]]) -> int:
         """
-        Insert or replace transactions in the cache.
+        Insert or replace transactions in the cache, in a single transaction.
 
-        Returns number of rows inserted/updated.
+        Rows missing a required field (chain, tx_hash, timestamp, from/to address)
+        are skipped. Returns number of rows inserted/updated.
         """
         assert self._conn is not None
-        now_iso = datetime.now(tz=UTC).isoformat()
-        count = 0
-
-        for tx in transactions:
+        now = time.time()
+        now_iso = datetime.fromtimestamp(now, tz=UTC).isoformat()
+        # Rows that would violate a NOT NULL column are dropped up front, so the
+        # rest can go through one executemany in one transaction
+        params = [
+            _tx_params(tx, now_iso, now)
+            for tx in transactions
+            if all(tx.get(k, "") is not None for k in _TX_REQUIRED)
+        ]
+        if not params:
+            return 0
+        async with self._write_lock:
             try:
-                await self._conn.execute(
-                    """
-                    INSERT OR REPLACE INTO transactions
-                    (chain, tx_hash, block_num, timestamp, from_addr, to_addr,
-                     value_native, value_usd, gas_usd, token_symbol, token_addr, fetched_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        tx.get("chain", ""),
-                        tx.get("tx_hash", ""),
-                        tx.get("block_num"),
-                        tx.get("timestamp", ""),
-                        tx.get("from_addr", ""),
-                        tx.get("to_addr", ""),
-                        str(tx.get("value_native", 0)),
-                        tx.get("value_usd"),
-                        tx.get("gas_usd"),
-                        tx.get("token_symbol"),
-                        tx.get("token_addr"),
-                        now_iso,
-                    ),
-                )
-                count += 1
-            except aiosqlite.Error:
-                pass  # Skip bad rows
-
-        await self._conn.commit()
-        return count
+                if self._sync_conn is not None:
+                    if self._conn.in_transaction:
+                        # Every writer holds _write_lock, so a transaction still open on
+                        # the async connection here is stale; left alone it would hold
+                        # the file's write lock against the blocking connection.
+                        await self._conn.rollback()
+                    await asyncio.to_thread(self._bulk_upsert_sync, params)
+                else:
+                    await self._conn.execute("BEGIN")
+                    await self._conn.executemany(_UPSERT_TX_SQL, params)
+                    await self._conn.commit()
+            except aiosqlite.Error as e:
+                if self._sync_conn is None:
+                    await self._conn.rollback()
+                raise DatabaseError(f"Failed to cache transactions: {e}") from e
+        return len(params)
+
+    def _bulk_upsert_sync(self, params: list[tuple[Any, ...]]) -> None:
+        """Run one upsert batch in a worker thread; commits, or rolls back on error."""
+        assert self._sync_conn is not None
+        with self._sync_lock, self._sync_conn:
+            self._sync_conn.execute("BEGIN")
+            self._sync_conn.executemany(_UPSERT_TX_SQL, params)
 
     async def get_cached_transactions(
         self,
@@ -443,40 +891,28 @@ class Database:
         """
         assert self._conn is not None
 
-        cutoff_fetch = datetime.now(tz=UTC).timestamp() - (ttl_hours * 3600)
-        cutoff_fetch_iso = datetime.fromtimestamp(cutoff_fetch, tz=UTC).isoformat()
-
-        # Check if we have ANY fresh records for this address+chain
-        async with self._conn.execute(
-            """
-            SELECT COUNT(*) as cnt FROM transactions
-            WHERE chain = ?
-            AND (from_addr = ? OR to_addr = ?)
-            AND fetched_at > ?
-            """,
-            (chain.upper(), address.lower(), address.lower(), cutoff_fetch_iso),
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row or row["cnt"] == 0:
-                return None  # Cache miss
+        cutoff_fetch = time.time() - ttl_hours * 3600
+        chain = chain.upper()
+        address = address.lower()
 
-        # Return fresh cached records in time range
-        rows = []
         async with self._conn.execute(
-            """
-            SELECT * FROM transactions
-            WHERE chain = ?
-            AND (from_addr = ? OR to_addr = ?)
-            AND timestamp >= ?
-            AND timestamp <= ?
-            ORDER BY timestamp DESC
-            """,
-            (chain.upper(), address.lower(), address.lower(), from_ts, to_ts),
+            _TX_CACHE_READ_SQL,
+            (
+                *(chain, address, cutoff_fetch) * 2,
+                *(chain, address, from_ts, to_ts),
+                *(chain, address, address, from_ts, to_ts),
+            ),
         ) as cursor:
-            async for row in cursor:
-                rows.append(dict(row))
+            rows = list(await cursor.fetchall())
 
-        return rows
+        if not rows[0]["fresh"]:
+            return None  # Cache miss
+        # Drop the leading fresh flag; an empty range comes back as the single
+        # all-NULL join row
+        keys = rows[0].keys()[1:]
+        return [
+            dict(zip(keys, tuple(row)[1:], strict=True)) for row in rows if row["id"] is not None
+        ]
 
     # ──────────────────────────────────────────────────────────
     # Score snapshots
@@ -484,31 +920,27 @@ class Database:
 
     async def save_score(self, score_data: dict[str, Any]) -> None:
         """Persist a whale score snapshot."""
+        await self._write(_INSERT_SCORE_SQL, _score_params(score_data))
+
+    async def save_scores_batch(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Persist several score snapshots in one transaction.
+
+        The batch is all-or-nothing: if any row is rejected, the rows already
+        inserted are rolled back rather than left for the next commit.
+        """
         assert self._conn is not None
-        await self._conn.execute(
-            """
-            INSERT INTO scores
-            (address, chain, computed_at, window_hours, total_score,
-             net_flow, velocity, correlation, exchange_flow,
-             net_flow_usd, direction, alert_triggered)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                score_data.get("address", ""),
-                score_data.get("chain", ""),
-                score_data.get("computed_at", ""),
-                score_data.get("window_hours", 24),
-                score_data.get("total", 0),
-                score_data.get("net_flow", 0),
-                score_data.get("velocity", 0),
-                score_data.get("correlation", 0),
-                score_data.get("exchange_flow", 0),
-                score_data.get("net_flow_usd", 0.0),
-                score_data.get("direction", "neutral"),
-                1 if score_data.get("alert_triggered") else 0,
-            ),
-        )
-        await self._conn.commit()
+        if not rows:
+            return
+        params = [_score_params(r) for r in rows]
+        async with self._write_lock:
+            try:
+                await self._conn.execute("BEGIN")
+                await self._conn.executemany(_INSERT_SCORE_SQL, params)
+                await self._conn.commit()
+            except aiosqlite.Error as e:
+                await self._conn.rollback()
+                raise DatabaseError(f"Failed to save scores: {e}") from e
 
     async def get_score_history(
         self,
@@ -517,6 +949,61 @@ class Database:
         days: int = 7,
     ) -> list[dict[str, Any]]:
         """Get score history for a wallet over N days."""
+        return [h async for h in self.iter_score_history(address, chain, days)]
+
+    async def iter_score_history(
+        self,
+        address: str,
+        chain: str,
+        days: int = 7,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield a wallet's score snapshots over N days, newest first."""
+        assert self._conn is not None
+        cutoff = datetime.now(tz=UTC).timestamp() - (days * 86400)
+        cutoff_iso = datetime.fromtimestamp(cutoff, tz=UTC).isoformat()
+
+        async with self._conn.execute(
+            _SELECT_SCORES_SQL, (address, chain.upper(), cutoff_iso)
+        ) as cursor:
+            async for row in cursor:
+                yield dict(row)
+
+    async def get_avg_abs_netflow(
+        self,
+        chain: str,
+        addresses: list[str],
+        days: int = 30,
+    ) -> dict[str, float]:
+        """
+        Mean of |net_flow_usd| per address over the last N days, in one query per chunk.
+
+        Addresses with no snapshots in the window are absent from the result.
+        """
+        assert self._conn is not None
+        cutoff = datetime.now(tz=UTC).timestamp() - (days * 86400)
+        cutoff_iso = datetime.fromtimestamp(cutoff, tz=UTC).isoformat()
+
+        result: dict[str, float] = {}
+        for start in range(0, len(addresses), _SQL_IN_CHUNK):
+            chunk = addresses[start : start + _SQL_IN_CHUNK]
+            # Only "?" markers are interpolated; values are always bound parameters
+            query = _AVG_ABS_NETFLOW_SQL.format(placeholders=",".join("?" * len(chunk)))
+            async with self._conn.execute(
+                query,
+                (chain.upper(), *chunk, cutoff_iso),
+            ) as cursor:
+                async for row in cursor:
+                    result[row["address"]] = row["avg_flow"]
+
+        return result
+
+    async def get_summary_aggregates(self, days: int = 7) -> list[dict[str, Any]]:
+        """
+        Per-wallet score totals over the last N days, reduced in SQL.
+
+        Returns one dict per (address, chain) with snapshots in the window:
+        {address, chain, net_flow_usd, peak_score, alert_count}.
+        """
         assert self._conn is not None
         cutoff = datetime.now(tz=UTC).timestamp() - (days * 86400)
         cutoff_iso = datetime.fromtimestamp(cutoff, tz=UTC).isoformat()
@@ -524,12 +1011,15 @@ class Database:
         rows = []
         async with self._conn.execute(
             """
-            SELECT * FROM scores
-            WHERE address = ? AND chain = ?
-            AND computed_at >= ?
-            ORDER BY computed_at DESC
+            SELECT address, chain,
+                   SUM(COALESCE(net_flow_usd, 0)) AS net_flow_usd,
+                   MAX(total_score) AS peak_score,
+                   SUM(alert_triggered != 0) AS alert_count
+            FROM scores
+            WHERE computed_at >= ?
+            GROUP BY address, chain
             """,
-            (address, chain.upper(), cutoff_iso),
+            (cutoff_iso,),
         ) as cursor:
             async for row in cursor:
                 rows.append(dict(row))
@@ -543,35 +1033,47 @@ class Database:
     async def save_alert(self, alert_data: dict[str, Any]) -> dict[str, Any]:
         """Persist an alert event. Returns alert with generated id."""
         assert self._conn is not None
-        triggered_at = alert_data.get("triggered_at", datetime.now(tz=UTC).isoformat())
-
-        async with self._conn.execute(
-            """
-            INSERT INTO alerts
-            (address, chain, label, score, direction, net_flow_usd,
-             triggered_at, rule_id, webhook_sent, webhook_status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                alert_data.get("address", ""),
-                alert_data.get("chain", ""),
-                alert_data.get("label", ""),
-                alert_data.get("score", 0),
-                alert_data.get("direction", "neutral"),
-                alert_data.get("net_flow_usd", 0.0),
-                triggered_at,
-                alert_data.get("rule_id", ""),
-                1 if alert_data.get("webhook_sent") else 0,
-                alert_data.get("webhook_status"),
-            ),
-        ) as cursor:
-            row_id = cursor.lastrowid
+        async with self._write_lock:
+            try:
+                async with self._conn.execute(
+                    _INSERT_ALERT_SQL, _alert_params(alert_data)
+                ) as cursor:
+                    row_id = cursor.lastrowid
+                await self._conn.commit()
+            except aiosqlite.Error as e:
+                await self._conn.rollback()
+                raise DatabaseError(f"Failed to save alert: {e}") from e
 
-        await self._conn.commit()
         result = dict(alert_data)
         result["id"] = row_id
         return result
 
+    async def save_alerts_batch(self, rows: list[dict[str, Any]]) -> list[int | None]:
+        """
+        Persist several alert events in one transaction.
+
+        Returns the generated ids in input order. Rows are inserted one statement
+        at a time (executemany cannot report per-row ids) but committed once; if
+        any row is rejected the whole batch is rolled back.
+        """
+        assert self._conn is not None
+        ids: list[int | None] = []
+        if not rows:
+            return ids
+        async with self._write_lock:
+            try:
+                await self._conn.execute("BEGIN")
+                for alert_data in rows:
+                    async with self._conn.execute(
+                        _INSERT_ALERT_SQL, _alert_params(alert_data)
+                    ) as cursor:
+                        ids.append(cursor.lastrowid)
+                await self._conn.commit()
+            except aiosqlite.Error as e:
+                await self._conn.rollback()
+                raise DatabaseError(f"Failed to save alerts: {e}") from e
+        return ids
+
     async def list_alerts(
         self,
         chain: str | None = None,
@@ -579,9 +1081,18 @@ class Database:
         since_hours: int | None = None,
     ) -> list[dict[str, Any]]:
         """List recent alerts with optional filters."""
+        return [a async for a in self.iter_alerts(chain, limit, since_hours)]
+
+    async def iter_alerts(
+        self,
+        chain: str | None = None,
+        limit: int = 20,
+        since_hours: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield recent alerts newest first; same filters as list_alerts."""
         assert self._conn is not None
 
-        query = "SELECT * FROM alerts"
+        query = _LIST_ALERTS_SQL
         params: list[Any] = []
         conditions: list[str] = []
 
@@ -590,10 +1101,8 @@ class Database:
             params.append(chain.upper())
 
         if since_hours:
-            cutoff = datetime.now(tz=UTC).timestamp() - (since_hours * 3600)
-            cutoff_iso = datetime.fromtimestamp(cutoff, tz=UTC).isoformat()
-            conditions.append("triggered_at >= ?")
-            params.append(cutoff_iso)
+            conditions.append("triggered_at_epoch >= ?")
+            params.append(time.time() - since_hours * 3600)
 
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
@@ -601,14 +1110,11 @@ class Database:
         query += " ORDER BY triggered_at DESC LIMIT ?"
         params.append(limit)
 
-        rows = []
         async with self._conn.execute(query, params) as cursor:
             async for row in cursor:
                 d = dict(row)
                 d["webhook_sent"] = bool(d["webhook_sent"])
-                rows.append(d)
-
-        return rows
+                yield d
 
     async def is_duplicate_alert(
         self, address: str, chain: str, window_seconds: int = 3600
@@ -617,64 +1123,69 @@ class Database:
         Check if this wallet already triggered an alert in the current window.
         """
         assert self._conn is not None
-        cutoff_ts = time.time() - window_seconds
-        cutoff_iso = datetime.fromtimestamp(cutoff_ts, tz=UTC).isoformat()
-
         async with self._conn.execute(
             """
-            SELECT COUNT(*) as cnt FROM alerts
-            WHERE address = ? AND chain = ? AND triggered_at >= ?
+            SELECT 1 FROM alerts
+            WHERE address = ? AND chain = ? AND triggered_at_epoch >= ?
+            LIMIT 1
             """,
-            (address, chain.upper(), cutoff_iso),
+            (address, chain.upper(), time.time() - window_seconds),
         ) as cursor:
-            row = await cursor.fetchone()
-            return bool(row and row["cnt"] > 0)
+            return await cursor.fetchone() is not None
 
     async def update_alert_webhook(
         self, alert_id: int, webhook_sent: bool, webhook_status: int | None
     ) -> None:
         """Update webhook delivery status for an alert."""
-        assert self._conn is not None
-        await self._conn.execute(
+        await self._write(
             "UPDATE alerts SET webhook_sent = ?, webhook_status = ? WHERE id = ?",
             (1 if webhook_sent else 0, webhook_status, alert_id),
         )
-        await self._conn.commit()
 
     # ──────────────────────────────────────────────────────────
     # Alert Rules
     # ──────────────────────────────────────────────────────────
 
     async def save_alert_rule(self, rule: dict[str, Any]) -> dict[str, Any]:
-        """Save an alert rule."""
-        assert self._conn is not None
-        await self._conn.execute(
-            """
-            INSERT OR REPLACE INTO alert_rules
-            (id, type, value, window, chain, webhook_url, created_at, active)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                rule["id"],
-                rule["type"],
-                rule["value"],
-                rule.get("window", "1h"),
-                rule.get("chain"),
-                rule.get("webhook_url"),
-                rule.get("created_at", datetime.now(tz=UTC).isoformat()),
-                1 if rule.get("active", True) else 0,
-            ),
+        """
+        Save an alert rule.
+
+        A rule without an id gets the next rule_NNN, assigned in the INSERT
+        itself so concurrent creators cannot claim the same one; the id is
+        set on the returned rule.
+        """
+        params = (
+            rule["type"],
+            rule["value"],
+            rule.get("window", "1h"),
+            rule.get("chain"),
+            rule.get("webhook_url"),
+            rule.get("created_at", datetime.now(tz=UTC).isoformat()),
+            1 if rule.get("active", True) else 0,
         )
-        await self._conn.commit()
+        if rule.get("id"):
+            await self._write(_INSERT_RULE_SQL, (rule["id"], *params))
+            return rule
+
+        assert self._conn is not None
+        async with self._write_lock:
+            try:
+                await self._conn.execute("BEGIN")
+                async with self._conn.execute(_INSERT_RULE_NEXT_ID_SQL, params) as cursor:
+                    row = await cursor.fetchone()
+                await self._conn.commit()
+            except aiosqlite.Error as e:
+                await self._conn.rollback()
+                raise DatabaseError(f"Failed to save alert rule: {e}") from e
+        assert row is not None  # RETURNING yields the inserted row
+        rule["id"] = row[0]
         return rule
 
     async def list_alert_rules(self) -> list[dict[str, Any]]:
         """List all active alert rules."""
         assert self._conn is not None
         rows = []
-        async with self._conn.execute(
-            "SELECT * FROM alert_rules WHERE active = 1 ORDER BY created_at DESC"
-        ) as cursor:
+        async with self._conn.execute(_SELECT_ACTIVE_RULES_SQL) as cursor:
             async for row in cursor:
                 d = dict(row)
                 d["active"] = bool(d["active"])
@@ -684,10 +1195,10 @@ class Database:
     async def get_next_rule_id(self) -> str:
         """Generate the next sequential rule ID."""
         assert self._conn is not None
-        async with self._conn.execute("SELECT COUNT(*) as cnt FROM alert_rules") as cursor:
+        async with self._conn.execute(_NEXT_RULE_NUM_SQL) as cursor:
             row = await cursor.fetchone()
-            n = (row["cnt"] if row else 0) + 1
-        return f"rule_{n:03d}"
+        assert row is not None  # aggregate query always yields a row
+        return f"rule_{row[0]:03d}"
 
     # ──────────────────────────────────────────────────────────
     # API Cache
@@ -696,54 +1207,150 @@ class Database:
     async def cache_get(self, cache_key: str) -> str | None:
         """
         Return cached API response if fresh, None otherwise.
-        """
-        assert self._conn is not None
-        async with self._conn.execute(
-            "SELECT response, fetched_at, ttl_seconds FROM api_cache WHERE cache_key = ?",
-            (cache_key,),
-        ) as cursor:
-            row = await cursor.fetchone()
 
-        if not row:
-            return None
+        Fresh entries are served from memory; concurrent misses for the same
+        key wait on a single SQLite read.
+        """
+        entry = self._mem_cache.get(cache_key)
+        if entry is None:
+            load = self._cache_loads.get(cache_key)
+            if load is None:
+                load = asyncio.ensure_future(self._cache_load(cache_key))
+                self._cache_loads[cache_key] = load
+                load.add_done_callback(lambda _: self._cache_loads.pop(cache_key, None))
+            # Shielded so one cancelled caller does not cancel the shared read
+            entry = await asyncio.shield(load)
+            if entry is None:
+                return None
+        else:
+            self._mem_cache.move_to_end(cache_key)
 
-        expires_at = row["fetched_at"] + row["ttl_seconds"]
+        expires_at, response = entry
         if time.time() > expires_at:
+            self._mem_cache.pop(cache_key, None)
             return None  # Expired
 
-        return row["response"]
+        return response
+
+    async def _cache_load(self, cache_key: str) -> tuple[float, str] | None:
+        """Read one api_cache row and remember it in memory if still fresh."""
+        assert self._conn is not None
+        async with self._conn.execute(_CACHE_GET_SQL, (cache_key,)) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return None
+        entry = (row["fetched_at"] + row["ttl_seconds"], row["response"])
+        # A cache_set that finished during the read already stored a newer value
+        if entry[0] >= time.time() and cache_key not in self._mem_cache:
+            self._remember(cache_key, entry)
+        return entry
+
+    def _remember(self, cache_key: str, entry: tuple[float, str]) -> None:
+        """Store an entry in the in-memory cache, evicting the least recently used."""
+        self._mem_cache[cache_key] = entry
+        self._mem_cache.move_to_end(cache_key)
+        if len(self._mem_cache) > _MEM_CACHE_SIZE:
+            self._mem_cache.popitem(last=False)
 
     async def cache_set(self, cache_key: str, response: str, ttl_seconds: int) -> None:
         """Store API response in cache."""
-        assert self._conn is not None
-        await self._conn.execute(
-            """
-            INSERT OR REPLACE INTO api_cache (cache_key, response, fetched_at, ttl_seconds)
-            VALUES (?, ?, ?, ?)
-            """,
-            (cache_key, response, time.time(), ttl_seconds),
-        )
-        await self._conn.commit()
+        now = time.time()
+        await self._write(_CACHE_SET_SQL, (cache_key, response, now, ttl_seconds))
+        self._remember(cache_key, (now + ttl_seconds, response))
 
     async def cache_prune(self) -> int:
         """Delete expired cache entries. Returns number deleted."""
         assert self._conn is not None
-        async with self._conn.execute(
-            "DELETE FROM api_cache WHERE fetched_at + ttl_seconds < ?",
-            (time.time(),),
-        ) as cursor:
-            deleted = cursor.rowcount
-        await self._conn.commit()
+        now = time.time()
+        async with self._write_lock:
+            try:
+                async with self._conn.execute(
+                    "DELETE FROM api_cache WHERE fetched_at + ttl_seconds < ?",
+                    (now,),
+                ) as cursor:
+                    deleted = cursor.rowcount
+                await self._conn.commit()
+            except aiosqlite.Error as e:
+                await self._conn.rollback()
+                raise DatabaseError(f"Failed to prune cache: {e}") from e
+        for key in [k for k, (expires_at, _) in self._mem_cache.items() if expires_at < now]:
+            del self._mem_cache[key]
         return deleted
 
     # ──────────────────────────────────────────────────────────
     # Private helpers
     # ──────────────────────────────────────────────────────────
 
+    async def _write(self, sql: str, params: tuple[Any, ...]) -> None:
+        """
+        Queue one write statement and wait for the group commit that includes it.
+
+        Writes issued while a flush is pending (e.g. a burst of score snapshots
+        from concurrent wallet scans) share one transaction instead of paying
+        a commit each.
+        """
+        assert self._conn is not None
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending.append((sql, params, fut))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_pending())
+        await fut
+
+    async def _flush_pending(self) -> None:
+        """Commit every queued write in one transaction and settle the callers."""
+        assert self._conn is not None
+        async with self._write_lock:
+            # Writes queued while waiting for the lock join this batch; later ones
+            # start the next flush.
+            batch, self._pending = self._pending, []
+            self._flush_task = None
+            try:
+                await self._conn.execute("BEGIN")
+                # Consecutive runs of the same SQL go through one executemany;
+                # grouping only adjacent runs keeps the callers' order.
+                for sql, run in groupby(batch, key=lambda op: op[0]):
+                    await self._conn.executemany(sql, [params for _, params, _ in run])
+                await self._conn.commit()
+            except aiosqlite.Error:
+                await self._conn.rollback()
+                # Replay one at a time so a bad statement fails only its caller
+                for sql, params, fut in batch:
+                    try:
+                        await self._conn.execute(sql, params)
+                        await self._conn.commit()
+                    except aiosqlite.Error as e:
+                        await self._conn.rollback()
+                        _settle(fut, e)
+                    else:
+                        _settle(fut)
+                return
+            except BaseException as e:
+                for _, _, fut in batch:
+                    _settle(fut, e)
+                raise
+        for _, _, fut in batch:
+            _settle(fut)
+
     async def _apply_schema(self) -> None:
         """Apply schema migrations idempotently."""
         assert self._conn is not None
         await self._conn.executescript(_SCHEMA)
+        async with self._conn.execute("SELECT MAX(version) FROM schema_version") as cursor:
+            row = await cursor.fetchone()
+        assert row is not None  # aggregate query always yields a row
+        version = row[0]
+        if version is not None and version < 2:
+            await self._conn.execute(_BACKFILL_WALLET_TAGS_SQL)
+        if version is not None and version < 3:
+            for table, column, alter_sql, backfill_sql in _MIGRATE_V3:
+                # CREATE TABLE IF NOT EXISTS leaves older tables as they were, so
+                # only add the column where the table predates it
+                async with self._conn.execute(f"PRAGMA table_info({table})") as cursor:
+                    columns = {row["name"] async for row in cursor}
+                if column not in columns:
+                    await self._conn.execute(alter_sql)
+                await self._conn.execute(backfill_sql)
+        await self._conn.executescript(_POST_MIGRATION_INDEXES)
         await self._conn.execute(
             "INSERT OR IGNORE INTO schema_version (version) VALUES (?)",
             (SCHEMA_VERSION,),
@@ -15,6 +15,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Protocol, runtime_checkable
 
 if TYPE_CHECKING:
+    import httpx
+
     from whalecli.config import WhalecliConfig
     from whalecli.models import Transaction
 
@@ -70,13 +72,17 @@ class BaseFetcher(Protocol):
         ...
 
 
-def get_fetcher(chain: str, config: WhalecliConfig) -> BaseFetcher:
+def get_fetcher(
+    chain: str, config: WhalecliConfig, client: httpx.AsyncClient | None = None
+) -> BaseFetcher:
     """
     Factory: return the correct fetcher for the given chain.
 
     Args:
         chain: Chain identifier ("ETH", "BTC", "HL")
         config: WhalecliConfig with API keys
+        client: Optional shared HTTP client (connection pool). When given, the
+                fetcher uses it and leaves closing it to the caller.
 
     Returns:
         Configured BaseFetcher implementation
@@ -91,16 +97,38 @@ def get_fetcher(chain: str, config: WhalecliConfig) -> BaseFetcher:
     if chain == "ETH":
         from whalecli.fetchers.eth import EtherscanClient
 
-        return EtherscanClient(api_key=config.api.etherscan_api_key)
+        return EtherscanClient(api_key=config.api.etherscan_api_key, client=client)
 
     if chain == "BTC":
         from whalecli.fetchers.btc import BTCFetcher
 
-        return BTCFetcher()
+        return BTCFetcher(client=client)
 
     if chain == "HL":
         from whalecli.fetchers.hl import HyperliquidClient
 
-        return HyperliquidClient()
+        return HyperliquidClient(client=client)
 
     raise ValueError(f"Unreachable: {chain}")  # pragma: no cover
+
+
+def validate_address(chain: str, address: str) -> bool:
+    """
+    Check an address's format for a chain without building a fetcher.
+
+    Same result as ``get_fetcher(chain, config).validate_address(address)``,
+    minus the HTTP client (and its TLS context) a fetcher would construct.
+
+    Raises:
+        ValueError: Unknown chain identifier
+    """
+    chain = chain.upper()
+    if chain == "ETH":
+        from whalecli.fetchers.eth import is_valid_address
+    elif chain == "BTC":
+        from whalecli.fetchers.btc import is_valid_address
+    elif chain == "HL":
+        from whalecli.fetchers.hl import is_valid_address
+    else:
+        raise ValueError(f"Unsupported chain: {chain!r}. Supported: {sorted(SUPPORTED_CHAINS)}")
+    return is_valid_address(address)
@@ -40,6 +40,11 @@ _P2SH_RE = re.compile(r"^3[a-km-zA-HJ-NP-Z1-9]{25,34}$")
 _BECH32_RE = re.compile(r"^bc1[a-z0-9]{6,87}$")
 
 
+def is_valid_address(address: str) -> bool:
+    """BTC address format check: legacy P2PKH (1…), P2SH (3…) or bech32 SegWit (bc1…)."""
+    return bool(_P2PKH_RE.match(address) or _P2SH_RE.match(address) or _BECH32_RE.match(address))
+
+
 class BTCFetcher:
     """
     Async Bitcoin transaction fetcher.
@@ -48,8 +53,10 @@ class BTCFetcher:
     No API keys required.
     """
 
-    def __init__(self) -> None:
-        self._client = httpx.AsyncClient(timeout=30.0)
+    def __init__(self, client: httpx.AsyncClient | None = None) -> None:
+        # A caller-supplied client is shared across fetchers and closed by its owner.
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=30.0)
 
     async def get_transactions(self, address: str, hours: int) -> list[Transaction]:
         """
@@ -115,12 +122,11 @@ class BTCFetcher:
         - P2SH: starts with 3 (base58)
         - Bech32 SegWit: starts with bc1
         """
-        return bool(
-            _P2PKH_RE.match(address) or _P2SH_RE.match(address) or _BECH32_RE.match(address)
-        )
+        return is_valid_address(address)
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
     # ──────────────────────────────────────────────────────────────
     # Private helpers
@@ -40,6 +40,12 @@ ETHERSCAN_BASE = "https://api.etherscan.io/api"
 # ETH address regex (0x + 40 hex chars)
 ETH_ADDRESS_RE = re.compile(r"^0x[0-9a-fA-F]{40}$")
 
+
+def is_valid_address(address: str) -> bool:
+    """0x-prefixed, 40 hex chars."""
+    return bool(ETH_ADDRESS_RE.match(address))
+
+
 # Page size for Etherscan pagination (max 10000)
 PAGE_SIZE = 10_000
 
@@ -83,9 +89,11 @@ class EtherscanClient:
     Rate-limited to 5 calls/sec (free tier).
     """
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, client: httpx.AsyncClient | None = None) -> None:
         self._api_key = api_key
-        self._client = httpx.AsyncClient(timeout=30.0)
+        # A caller-supplied client is shared across fetchers and closed by its owner.
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=30.0)
         self._rate_limiter = _TokenBucket(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
 
     async def get_transactions(self, address: str, hours: int) -> list[Transaction]:
@@ -158,10 +166,11 @@ class EtherscanClient:
 
     async def validate_address(self, address: str) -> bool:
         """Validate ETH address format. No API call required."""
-        return bool(ETH_ADDRESS_RE.match(address))
+        return is_valid_address(address)
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
     # ──────────────────────────────────────────────────────────────
     # Private helpers
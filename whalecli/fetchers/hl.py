@@ -30,6 +30,11 @@ HL_API_URL = "https://api.hyperliquid.xyz/info"
 ETH_ADDRESS_RE = re.compile(r"^0x[0-9a-fA-F]{40}$")
 
 
+def is_valid_address(address: str) -> bool:
+    """0x-prefixed, 40 hex chars."""
+    return bool(ETH_ADDRESS_RE.match(address))
+
+
 class HyperliquidClient:
     """
     Async Hyperliquid perp API client.
@@ -37,8 +42,10 @@ class HyperliquidClient:
     No API key required. Rate limits: undocumented, ~10 req/sec observed.
     """
 
-    def __init__(self) -> None:
-        self._client = httpx.AsyncClient(timeout=30.0)
+    def __init__(self, client: httpx.AsyncClient | None = None) -> None:
+        # A caller-supplied client is shared across fetchers and closed by its owner.
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=30.0)
 
     async def get_transactions(self, address: str, hours: int) -> list[Transaction]:
         """
@@ -144,10 +151,11 @@ class HyperliquidClient:
 
     async def validate_address(self, address: str) -> bool:
         """HL uses ETH-compatible 0x addresses."""
-        return bool(ETH_ADDRESS_RE.match(address))
+        return is_valid_address(address)
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
     # ──────────────────────────────────────────────────────────────
     # Private helpers
@@ -133,9 +133,13 @@ class ScoreBreakdown:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AlertEvent:
-    """A triggered alert event."""
+    """A triggered alert event.
+
+    Slotted: scans can materialise many of these. Not frozen, since the webhook
+    fields are filled in after delivery.
+    """
 
     id: str  # "alert_YYYYMMDD_HHMMSS_NNN"
     rule_id: str
@@ -8,7 +8,8 @@ Design rules:
 - Table: Rich-formatted, green=accumulating, red=distributing
 - CSV: RFC 4180, header row always present
 
-All functions return strings. The caller writes to stdout.
+All format_* functions return strings. The caller writes to stdout;
+iter_jsonl yields the same JSONL lines one at a time for incremental writes.
 """
 
 from __future__ import annotations
@@ -16,14 +17,18 @@ from __future__ import annotations
 import csv
 import io
 import json
+from collections.abc import Iterator
 from decimal import Decimal
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from rich.console import Console
-from rich.table import Table
-from rich.text import Text
+import orjson
 
-VALID_FORMATS = {"json", "jsonl", "table", "csv"}
+from whalecli.config import VALID_FORMATS
+
+# rich dominates CLI start-up and only table output needs it, so it is imported
+# on first use.
+if TYPE_CHECKING:
+    from rich.console import Console
 
 
 class DecimalEncoder(json.JSONEncoder):
@@ -35,6 +40,38 @@ class DecimalEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def _orjson_default(obj: Any) -> Any:
+    """orjson ``default`` hook: serialise Decimal as float, reject everything else."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_JSONL_OPTS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def _jsonl_line(obj: Any) -> bytes:
+    """Serialise one JSONL record, newline included, in a single orjson call."""
+    return orjson.dumps(obj, default=_orjson_default, option=_JSONL_OPTS)
+
+
+def _json_value(value: Any) -> bytes:
+    """Serialise a single JSON value (for splicing into a prebuilt frame template)."""
+    return orjson.dumps(value, default=_orjson_default)
+
+
+# Fixed-shape scan frames: only the values vary, so the keys are pre-rendered and
+# each field is spliced in. Byte-for-byte identical to orjson-dumping the dict.
+_SCAN_START_FRAME = (
+    b'{"type":"scan_start","scan_id":%b,"timestamp":%b,"chain":%b,"window_hours":%b}\n'
+)
+_SCAN_END_FRAME = (
+    b'{"type":"scan_end","scan_id":%b,"wallets_scanned":%b,'
+    b'"alerts_triggered":%b,"timestamp":%b}\n'
+)
+
+
 def format_output(data: Any, fmt: str) -> str:
     """
     Format data for stdout output.
@@ -70,7 +107,14 @@ def format_output(data: Any, fmt: str) -> str:
 
 def format_json(data: Any) -> str:
     """Pretty-print data as JSON (2-space indent)."""
-    return json.dumps(data, indent=2, cls=DecimalEncoder, ensure_ascii=False)
+    return orjson.dumps(data, default=_orjson_default, option=_JSON_OPTS).decode()
+
+
+def format_json_bytes(data: Any) -> bytes:
+    """``format_json`` as newline-terminated UTF-8 bytes, for writing straight to stdout."""
+    return orjson.dumps(
+        data, default=_orjson_default, option=_JSON_OPTS | orjson.OPT_APPEND_NEWLINE
+    )
 
 
 # ── JSONL ────────────────────────────────────────────────────────────────────
@@ -85,67 +129,58 @@ def format_jsonl(data: Any) -> str:
 
     Otherwise falls back to a single-line JSON serialisation.
     """
-    lines: list[str] = []
+    # Lines are newline-terminated; drop the final one (the caller adds its own).
+    return b"".join(iter_jsonl(data))[:-1].decode()
+
+
+def iter_jsonl(data: Any) -> Iterator[bytes]:
+    """
+    Yield the JSONL records of ``format_jsonl`` one newline-terminated line at a time.
 
+    Lets callers write each record to stdout as it is serialised instead of
+    holding the whole document in memory.
+    """
     if isinstance(data, dict) and "wallets" in data:
         # Scan result → event sequence
-        scan_id = data.get("scan_id", "")
         scan_time = data.get("scan_time", "")
-        chain = data.get("chain", "all")
-        window_hours = data.get("window_hours", 24)
-
-        lines.append(
-            json.dumps(
-                {
-                    "type": "scan_start",
-                    "scan_id": scan_id,
-                    "timestamp": scan_time,
-                    "chain": chain,
-                    "window_hours": window_hours,
-                },
-                cls=DecimalEncoder,
-            )
+        scan_id_json = _json_value(data.get("scan_id", ""))
+        scan_time_json = _json_value(scan_time)
+
+        yield _SCAN_START_FRAME % (
+            scan_id_json,
+            scan_time_json,
+            _json_value(data.get("chain", "all")),
+            _json_value(data.get("window_hours", 24)),
         )
 
         for wallet in data.get("wallets", []):
-            lines.append(
-                json.dumps(
-                    {
-                        "type": "wallet_result",
-                        "address": wallet.get("address", ""),
-                        "chain": wallet.get("chain", ""),
-                        "label": wallet.get("label", ""),
-                        "score": wallet.get("score", 0),
-                        "direction": wallet.get("direction", "neutral"),
-                        "net_flow_usd": wallet.get("net_flow_usd", 0.0),
-                        "alert_triggered": wallet.get("alert_triggered", False),
-                        "timestamp": wallet.get("computed_at", scan_time),
-                    },
-                    cls=DecimalEncoder,
-                )
-            )
-
-        lines.append(
-            json.dumps(
+            yield _jsonl_line(
                 {
-                    "type": "scan_end",
-                    "scan_id": scan_id,
-                    "wallets_scanned": data.get("wallets_scanned", 0),
-                    "alerts_triggered": data.get("alerts_triggered", 0),
-                    "timestamp": scan_time,
-                },
-                cls=DecimalEncoder,
+                    "type": "wallet_result",
+                    "address": wallet.get("address", ""),
+                    "chain": wallet.get("chain", ""),
+                    "label": wallet.get("label", ""),
+                    "score": wallet.get("score", 0),
+                    "direction": wallet.get("direction", "neutral"),
+                    "net_flow_usd": wallet.get("net_flow_usd", 0.0),
+                    "alert_triggered": wallet.get("alert_triggered", False),
+                    "timestamp": wallet.get("computed_at", scan_time),
+                }
             )
+
+        yield _SCAN_END_FRAME % (
+            scan_id_json,
+            _json_value(data.get("wallets_scanned", 0)),
+            _json_value(data.get("alerts_triggered", 0)),
+            scan_time_json,
         )
 
     elif isinstance(data, list):
         for item in data:
-            lines.append(json.dumps(item, cls=DecimalEncoder))
+            yield _jsonl_line(item)
 
     else:
-        lines.append(json.dumps(data, cls=DecimalEncoder))
-
-    return "\n".join(lines)
+        yield _jsonl_line(data)
 
 
 # ── Table ────────────────────────────────────────────────────────────────────
@@ -162,6 +197,8 @@ def format_table(data: Any) -> str:
     - Alert rules (dict with 'rules')
     - Generic dict fallback
     """
+    from rich.console import Console
+
     buf = io.StringIO()
     console = Console(file=buf, highlight=False, markup=True, width=120)
 
@@ -204,6 +241,9 @@ def _score_color(score: int) -> str:
 
 
 def _render_scan_table(console: Console, data: dict[str, Any]) -> None:
+    from rich.table import Table
+    from rich.text import Text
+
     table = Table(
         title=(
             f"Whale Scan — {data.get('chain', 'all').upper()}"
@@ -252,6 +292,8 @@ def _render_scan_table(console: Console, data: dict[str, Any]) -> None:
 
 
 def _render_wallet_list_table(console: Console, data: dict[str, Any]) -> None:
+    from rich.table import Table
+
     table = Table(
         title="Tracked Whale Wallets",
         show_header=True,
@@ -281,6 +323,8 @@ def _render_wallet_list_table(console: Console, data: dict[str, Any]) -> None:
 
 
 def _render_alerts_table(console: Console, data: dict[str, Any]) -> None:
+    from rich.table import Table
+
     # Rules table
     if data.get("rules"):
         rules_table = Table(title="Active Rules", header_style="bold blue")
@@ -324,6 +368,8 @@ def _render_alerts_table(console: Console, data: dict[str, Any]) -> None:
 
 
 def _render_rules_table(console: Console, data: dict[str, Any]) -> None:
+    from rich.table import Table
+
     table = Table(title="Alert Rules", header_style="bold blue")
     table.add_column("ID")
     table.add_column("Type")
@@ -388,18 +434,29 @@ def format_csv(data: Any) -> str:
 
 
 def _flatten_dict(d: dict[str, Any], prefix: str = "") -> dict[str, Any]:
-    """Flatten a nested dict for CSV output."""
+    """
+    Flatten a nested dict for CSV output.
+
+    Iterative (explicit stack of item iterators, no recursion); keys keep the
+    depth-first order a recursive walk would give, so CSV columns are stable.
+    """
     result: dict[str, Any] = {}
-    for k, v in d.items():
-        full_key = f"{prefix}{k}" if not prefix else f"{prefix}.{k}"
-        if isinstance(v, dict):
-            result.update(_flatten_dict(v, full_key))
-        elif isinstance(v, (list, tuple)):
-            result[full_key] = json.dumps(v)
-        elif isinstance(v, Decimal):
-            result[full_key] = float(v)
+    stack: list[tuple[str, Iterator[tuple[Any, Any]]]] = [(prefix, iter(d.items()))]
+    while stack:
+        pfx, items = stack[-1]
+        for k, v in items:
+            full_key = f"{pfx}{k}" if not pfx else f"{pfx}.{k}"
+            if isinstance(v, dict):
+                stack.append((full_key, iter(v.items())))
+                break  # descend; resume this level's iterator afterwards
+            elif isinstance(v, (list, tuple)):
+                result[full_key] = json.dumps(v)
+            elif isinstance(v, Decimal):
+                result[full_key] = float(v)
+            else:
+                result[full_key] = v
         else:
-            result[full_key] = v
+            stack.pop()
     return result
 
 
@@ -14,9 +14,12 @@ References:
 
 from __future__ import annotations
 
+import bisect
 import json
 import math
+from collections.abc import Sequence
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -25,36 +28,35 @@ from whalecli.models import Transaction
 # ── Data files ────────────────────────────────────────────────────────────────
 _DATA_DIR = Path(__file__).parent / "data"
 
-# Cache for exchange addresses loaded from JSON
-_exchange_addr_cache: dict[str, set[str]] = {}
 
-
-def load_exchange_addresses(chain: str) -> set[str]:
+def load_exchange_addresses(chain: str) -> frozenset[str]:
     """
     Load exchange addresses for a chain from the bundled JSON registry.
 
-    Returns a set of lowercase address strings.
+    Returns a frozenset of lowercase address strings. The registry is read
+    once per chain per process; the result is shared, hence immutable.
     """
-    chain_upper = chain.upper()
+    return _load_exchange_addresses(chain.upper())
+
 
-    if chain_upper in _exchange_addr_cache:
-        return _exchange_addr_cache[chain_upper]
+@lru_cache(maxsize=8)
+def _load_exchange_addresses(chain_upper: str) -> frozenset[str]:
+    chain_data = _load_exchange_registry().get(chain_upper, {})
+    return frozenset(
+        addr.lower() for exchange_addrs in chain_data.values() for addr in exchange_addrs
+    )
 
+
+@lru_cache(maxsize=1)
+def _load_exchange_registry() -> dict[str, Any]:
+    """Parse the bundled registry once; every chain's set is built from this copy."""
     json_path = _DATA_DIR / "exchange_addresses.json"
     if not json_path.exists():
-        return set()
+        return {}
 
     with open(json_path) as f:
         data: dict[str, Any] = json.load(f)
-
-    chain_data = data.get(chain_upper, {})
-    addrs: set[str] = set()
-    for exchange_addrs in chain_data.values():
-        for addr in exchange_addrs:
-            addrs.add(addr.lower())
-
-    _exchange_addr_cache[chain_upper] = addrs
-    return addrs
+    return data
 
 
 # ── Scale factors (calibrated so $10M flow in 24h ≈ 35 pts) ─────────────────
@@ -68,7 +70,7 @@ _VELOCITY_SCALE = 8.3  # log2(20x) = 4.32 → 4.32 * 8.3 ≈ 35.8, capped at 25
 
 
 def compute_net_flow_score(
-    transactions: list[Transaction],
+    transactions: Sequence[Transaction],
     wallet_address: str,
     wallet_age_days: int,
 ) -> tuple[int, str, float, float, float]:
@@ -134,7 +136,7 @@ _VELOCITY_BASELINE_USD = 50_000.0  # fallback if no 30d history
 
 
 def compute_velocity_score(
-    transactions: list[Transaction],
+    transactions: Sequence[Transaction],
     avg_30d_daily_flow_usd: float,
     scan_hours: int,
 ) -> int:
@@ -174,12 +176,13 @@ def compute_velocity_score(
 
 # ── Component 3: Correlation Score ────────────────────────────────────────────
 
-_CORRELATION_MIN_PEERS = 2  # Need at least 2 peers for correlation to be meaningful
+CORRELATION_MIN_PEERS = 2  # Need at least 2 peers for correlation to be meaningful
 
 
 def compute_correlation_score(
     wallet_direction: str,
     all_wallet_directions: dict[str, str],
+    exclude: str | None = None,
 ) -> int:
     """
     Compute correlation sub-score (0–20 pts).
@@ -189,6 +192,8 @@ def compute_correlation_score(
     Args:
         wallet_direction: "accumulating" | "distributing" | "neutral"
         all_wallet_directions: {address: direction} for ALL other tracked wallets.
+        exclude: Address to skip — lets callers pass one shared map that still
+                 contains the wallet being scored, instead of a copy without it.
 
     Returns:
         Score 0–20.
@@ -196,15 +201,19 @@ def compute_correlation_score(
     if wallet_direction == "neutral":
         return 0
 
-    # Count active peers (non-neutral)
-    active_peers = {addr: d for addr, d in all_wallet_directions.items() if d != "neutral"}
-    total_active = len(active_peers)
-
-    if total_active < _CORRELATION_MIN_PEERS:
+    # Count active (non-neutral) peers and those moving our way, in one pass
+    total_active = 0
+    same_direction_count = 0
+    for addr, d in all_wallet_directions.items():
+        if d == "neutral" or addr == exclude:
+            continue
+        total_active += 1
+        if d == wallet_direction:
+            same_direction_count += 1
+
+    if total_active < CORRELATION_MIN_PEERS:
         return 0
 
-    same_direction_count = sum(1 for d in active_peers.values() if d == wallet_direction)
-
     correlation_ratio = same_direction_count / total_active
     return max(0, min(20, round(correlation_ratio * 20)))
 
@@ -213,9 +222,9 @@ def compute_correlation_score(
 
 
 def compute_exchange_flow_score(
-    transactions: list[Transaction],
+    transactions: Sequence[Transaction],
     wallet_address: str,
-    exchange_addresses: set[str],
+    exchange_addresses: frozenset[str] | set[str],
     net_flow_usd: float,
 ) -> tuple[int, float]:
     """
@@ -243,8 +252,11 @@ def compute_exchange_flow_score(
         from_lower = tx.from_addr.lower()
         to_lower = tx.to_addr.lower()
 
-        if from_lower in exchange_addresses and to_lower == addr_lower:
-            exchange_inflow += usd  # From exchange → wallet = accumulating signal
+        # Compare against the wallet first: a string equality check is cheaper than
+        # hashing into the exchange set, and most txns fail one side or the other.
+        if to_lower == addr_lower:
+            if from_lower in exchange_addresses:
+                exchange_inflow += usd  # From exchange → wallet = accumulating signal
         elif from_lower == addr_lower and to_lower in exchange_addresses:
             exchange_outflow += usd  # From wallet → exchange = distributing signal
 
@@ -271,13 +283,14 @@ def compute_exchange_flow_score(
 def score_wallet(
     address: str,
     chain: str,
-    transactions: list[Transaction],
+    transactions: Sequence[Transaction],
     wallet_age_days: int,
     avg_30d_daily_flow_usd: float,
-    exchange_addresses: set[str],
+    exchange_addresses: frozenset[str] | set[str],
     all_wallet_directions: dict[str, str],
     scan_hours: int = 24,
     label: str = "",
+    exclude: str | None = None,
 ) -> dict[str, Any]:
     """
     Compute full whale score for a wallet.
@@ -292,6 +305,7 @@ def score_wallet(
         all_wallet_directions: Other wallets' directions (for correlation)
         scan_hours: Scan window in hours
         label: Optional human-readable wallet label
+        exclude: Address in all_wallet_directions to ignore (normally this wallet)
 
     Returns:
         Dict matching the scan result wallet schema from docs/API.md
@@ -307,7 +321,7 @@ def score_wallet(
     vel_score = compute_velocity_score(transactions, avg_30d_daily_flow_usd, scan_hours)
 
     # Component 3: Correlation
-    corr_score = compute_correlation_score(direction, all_wallet_directions)
+    corr_score = compute_correlation_score(direction, all_wallet_directions, exclude)
 
     # Component 4: Exchange Flow
     exch_score, exchange_flow_fraction = compute_exchange_flow_score(
@@ -341,6 +355,32 @@ def score_wallet(
     }
 
 
+def apply_correlation(
+    scored: dict[str, Any],
+    all_wallet_directions: dict[str, str],
+    exclude: str | None = None,
+) -> dict[str, Any]:
+    """
+    Fill in the correlation component of a score computed without peers.
+
+    Gives the same result as calling score_wallet again with
+    all_wallet_directions (and exclude), but only re-derives the correlation term: the other
+    components don't depend on peers, so their per-transaction work is reused.
+    Updates ``scored`` in place and returns it.
+    """
+    breakdown = scored["score_breakdown"]
+    breakdown["correlation"] = compute_correlation_score(
+        scored["direction"], all_wallet_directions, exclude
+    )
+    scored["score"] = max(0, min(100, sum(breakdown.values())))
+    return scored
+
+
+# Severity bands: lower bounds and the label for each band (index 0 = below all).
+_SEVERITY_THRESHOLDS = (70, 80, 90)
+_SEVERITY_LABELS: tuple[str | None, ...] = (None, "info", "warning", "critical")
+
+
 def score_to_severity(score: int) -> str | None:
     """
     Map score to severity label.
@@ -348,10 +388,4 @@ def score_to_severity(score: int) -> str | None:
     Returns:
         "info" (70–79), "warning" (80–89), "critical" (90+), or None (<70)
     """
-    if score >= 90:
-        return "critical"
-    elif score >= 80:
-        return "warning"
-    elif score >= 70:
-        return "info"
-    return None
+    return _SEVERITY_LABELS[bisect.bisect_right(_SEVERITY_THRESHOLDS, score)]
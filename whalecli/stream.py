@@ -17,13 +17,15 @@ stdout is flushed after each write (critical for pipe consumers).
 from __future__ import annotations
 
 import asyncio
-import json
+import signal
 import sys
 from datetime import UTC, datetime
 from decimal import Decimal
 from typing import Any
 
-from whalecli.alert import process_alerts
+import orjson
+
+from whalecli.alert import close_webhook_client, process_alerts
 from whalecli.config import WhalecliConfig
 from whalecli.db import Database
 from whalecli.exceptions import NetworkError, WhalecliError
@@ -32,21 +34,26 @@ from whalecli.models import Transaction
 from whalecli.scorer import load_exchange_addresses, score_wallet
 
 
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj: Any) -> Any:
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
+def _decimal_default(obj: Any) -> Any:
+    """orjson ``default`` hook: serialise Decimal as float."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_EVENT_OPTS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
 
 
 def emit_event(event: dict[str, Any]) -> None:
     """
     Write a single JSONL event to stdout and flush.
 
-    Never use print() — buffered output breaks pipe consumers.
+    Never use print() — buffered output breaks pipe consumers. orjson returns
+    bytes, so the line goes straight to the binary buffer without re-encoding.
     """
-    sys.stdout.write(json.dumps(event, cls=DecimalEncoder) + "\n")
-    sys.stdout.flush()
+    out = sys.stdout.buffer
+    out.write(orjson.dumps(event, default=_decimal_default, option=_EVENT_OPTS))
+    out.flush()
 
 
 def _now_iso() -> str:
@@ -62,7 +69,7 @@ async def run_stream(
     hours: int = 1,
 ) -> None:
     """
-    Main stream loop. Runs until cancelled (KeyboardInterrupt → exit 130).
+    Main stream loop. Runs until SIGINT/SIGTERM or cancellation (→ exit 130).
 
     On each poll cycle:
     1. Fetch tracked wallets for each chain
@@ -80,6 +87,13 @@ async def run_stream(
         db: Open Database connection
         hours: Look-back window per poll (default 1h)
     """
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    signals = _install_stop_handlers(loop, stop_event)
+    # One long-lived waiter: between cycles the loop blocks until either the
+    # interval elapses or a stop signal arrives, with no sleep/re-poll ticks.
+    stop_wait = asyncio.ensure_future(stop_event.wait())
+
     chain_display = ",".join(chains) if chains else "all"
     cycle = 0
     total_alerts = 0
@@ -95,7 +109,7 @@ async def run_stream(
     )
 
     try:
-        while True:
+        while not stop_event.is_set():
             cycle += 1
             wallets_checked = 0
 
@@ -103,16 +117,14 @@ async def run_stream(
                 scored_wallets = await _poll_cycle(chains, hours, config, db)
                 wallets_checked = len(scored_wallets)
 
-                # First pass: compute all directions for correlation
-                {w["address"]: w.get("direction", "neutral") for w in scored_wallets}
-
+                cycle_ts = _now_iso()  # shared by every wallet event in this cycle
                 for wallet in scored_wallets:
                     score = wallet.get("score", 0)
                     event_type = "whale_alert" if score >= threshold else "whale_activity"
                     emit_event(
                         {
                             "type": event_type,
-                            "timestamp": _now_iso(),
+                            "timestamp": cycle_ts,
                             "address": wallet.get("address", ""),
                             "chain": wallet.get("chain", ""),
                             "label": wallet.get("label", ""),
@@ -153,9 +165,14 @@ async def run_stream(
                 }
             )
 
-            await asyncio.sleep(interval_seconds)
+            await asyncio.wait({stop_wait}, timeout=interval_seconds)
 
     except (KeyboardInterrupt, asyncio.CancelledError):
+        pass  # Caller (CLI) is responsible for sys.exit(130)
+    finally:
+        stop_wait.cancel()
+        for sig in signals:
+            loop.remove_signal_handler(sig)
         emit_event(
             {
                 "type": "stream_end",
@@ -164,7 +181,26 @@ async def run_stream(
                 "total_alerts": total_alerts,
             }
         )
-        return  # Caller (CLI) is responsible for sys.exit(130)
+        await close_webhook_client()
+
+
+def _install_stop_handlers(
+    loop: asyncio.AbstractEventLoop, stop_event: asyncio.Event
+) -> list[signal.Signals]:
+    """
+    Route SIGINT/SIGTERM to ``stop_event`` so the stream ends between cycles.
+
+    Returns the signals that were installed. Platforms or threads without
+    loop signal support (Windows, non-main threads) fall back to cancellation.
+    """
+    installed: list[signal.Signals] = []
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError, ValueError):
+            continue
+        installed.append(sig)
+    return installed
 
 
 async def _poll_cycle(
@@ -185,6 +221,14 @@ async def _poll_cycle(
         query_chains = [c.upper() for c in chains]
 
     scored: list[dict[str, Any]] = []
+    # Cap in-flight fetches so large watchlists don't trip API rate limits.
+    sem = asyncio.Semaphore(config.stream.max_concurrency)
+
+    async def _bounded(
+        wallet: dict[str, Any], fetcher: Any, exchange_addrs: frozenset[str]
+    ) -> dict[str, Any] | None:
+        async with sem:
+            return await _fetch_and_score(wallet, hours, fetcher, exchange_addrs, db)
 
     for chain in query_chains:
         wallets = await db.list_wallets(chain=chain)
@@ -195,7 +239,7 @@ async def _poll_cycle(
         exchange_addrs = load_exchange_addresses(chain)
 
         # Fetch transactions concurrently for all wallets
-        tasks = [_fetch_and_score(wallet, hours, fetcher, exchange_addrs, db) for wallet in wallets]
+        tasks = [_bounded(wallet, fetcher, exchange_addrs) for wallet in wallets]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         for result in results:
@@ -211,16 +255,15 @@ async def _fetch_and_score(
     wallet: dict[str, Any],
     hours: int,
     fetcher: Any,
-    exchange_addrs: set[str],
+    exchange_addrs: frozenset[str],
     db: Database,
 ) -> dict[str, Any] | None:
-    """Fetch transactions for a single wallet and compute its score."""
-    from datetime import timedelta
-
-    now = datetime.now(tz=UTC)
-    int((now - timedelta(hours=hours)).timestamp())
-    int(now.timestamp())
+    """
+    Fetch transactions for a single wallet and compute its score.
 
+    ``exchange_addrs`` is the chain's shared registry, loaded once per poll cycle
+    by the caller; it is passed through by reference, never reloaded per wallet.
+    """
     try:
         raw_txns: list[Transaction] = await fetcher.get_transactions(wallet["address"], hours)
     except Exception:
@@ -247,8 +290,9 @@ async def _fetch_and_score(
 
 async def _get_30d_avg(wallet: dict[str, Any], db: Database) -> float:
     """Get 30-day average daily flow for velocity baseline."""
-    history = await db.get_score_history(wallet["address"], wallet["chain"], days=30)
-    if not history:
-        return 0.0
-    flows = [abs(h.get("net_flow_usd") or 0.0) for h in history]
-    return sum(flows) / len(flows) if flows else 0.0
+    total = 0.0
+    count = 0
+    async for h in db.iter_score_history(wallet["address"], wallet["chain"], days=30):
+        total += abs(h.get("net_flow_usd") or 0.0)
+        count += 1
+    return total / count if count else 0.0